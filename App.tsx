@@ -3,19 +3,12 @@ import { Search, ChevronDown, Layout, MessageSquare, AlertCircle, RefreshCcw, Lo
 import * as dataService from './services/dataService';
 import { Team, System, RoleBundle, ChatMessage, Menu } from './types';
 import { analyzeIntent } from './services/geminiService';
+import { cleanValue, compareTreeItems, compareTreeLabels, hasKorean, menuOrderInOrder, menuTreeInOrder, menuTreeLevels, sortMenusKoreanFirst } from './services/menuTree';
 
 const LOGO_PATH = `${import.meta.env.BASE_URL}ci/AJ_networks_logo.png`;
 
 // --- 유틸리티 및 데이터 전처리 함수 ---
 const normalize = (text: string) => (text || '').toLowerCase().replace(/\s+/g, '').trim();
-const hasKorean = (text: string) => /[ㄱ-ㅎ|ㅏ-ㅣ|가-힣]/.test(text || '');
-const cleanValue = (val: any): string => {
-  if (val === null || val === undefined) return '기타';
-  const str = String(val).trim();
-  const lower = str.toLowerCase();
-  if (lower === 'nan' || lower === 'null' || str === '') return '기타';
-  return str;
-};
 
 const escapeRegExp = (s: string) => s.replace(/[.*+?^${}()|[\]\\]/g, "\\$&");
 
@@ -125,71 +118,10 @@ interface RoleWithMenus {
   matchedMenus?: Menu[]; // ✅ Menu 객체로 변경
   allMenus?: Menu[];     // ✅ Menu 객체로 변경
   totalMenus?: number; // ✅ 추가
+  allMenusOrder?: number[]; // 전처리 menu_order (allMenus 위치, 한글 우선 정렬 순서)
 
 }
 
-const splitPathParts = (path: string) =>
-  String(path || '')
-    .split('>')
-    .map(p => cleanValue(p))
-    .map(p => (p === '기타' ? '' : p)); // '기타'는 빈 값 취급
-
-const isNullishPart = (p: string) => !p || /^null$/i.test(p);
-
-const menuSortKey = (m: Menu) => {
-  const parts = splitPathParts(m.path);
-
-  // 채워진 레벨 수(많을수록 우선)
-  const filledCount = parts.filter(p => !isNullishPart(p)).length;
-
-  // 앞에서부터 연속으로 채워진 레벨 수(“마감 > 금융리스 > ...” 같은 정합한 경로 우선)
-  let prefixFilled = 0;
-  for (let i = 0; i < parts.length; i++) {
-    if (isNullishPart(parts[i])) break;
-    prefixFilled++;
-  }
-
-  // 완전 빈/깨진(> > ...) 여부: 앞부분부터 비어 있으면 뒤로
-  const leadingNull = isNullishPart(parts[0]) ? 1 : 0;
-
-  // 언어 우선
-  const keyText = `${cleanValue(m.path)} ${cleanValue(m.menu_id)}`;
-  const isKor = hasKorean(keyText) ? 0 : 1; // 0=한글, 1=영문
-
-  const pathForCompare = cleanValue(m.path);
-
-  return { isKor, leadingNull, prefixFilled, filledCount, pathForCompare };
-};
-
-// ✅ 요구 정렬: 한글 → (선두 null 아님) → prefixFilled desc → filledCount desc → localeCompare
-const sortMenusKoreanFirst = (menus: Menu[]) => {
-  const uniq = new Map<string, Menu>();
-  menus.forEach(m => {
-    const id = cleanValue(m.menu_id);
-    if (!id) return;
-    if (!uniq.has(id)) uniq.set(id, m);
-  });
-
-  const arr = Array.from(uniq.values());
-
-  arr.sort((a, b) => {
-    const A = menuSortKey(a);
-    const B = menuSortKey(b);
-
-    if (A.isKor !== B.isKor) return A.isKor - B.isKor;
-    if (A.leadingNull !== B.leadingNull) return A.leadingNull - B.leadingNull; // null 앞은 뒤로
-    if (A.prefixFilled !== B.prefixFilled) return B.prefixFilled - A.prefixFilled;
-    if (A.filledCount !== B.filledCount) return B.filledCount - A.filledCount;
-
-    // 같은 그룹 내 정렬
-    const locale = A.isKor === 0 ? 'ko' : 'en';
-    return A.pathForCompare.localeCompare(B.pathForCompare, locale);
-  });
-
-  return arr;
-};
-
-
   // “더 보여줘” 페이지네이션 상태
   type MenuPagingState = {
     role_key: string;
@@ -705,22 +637,22 @@ const isSapSystemSelected = useMemo(() => /sap/i.test(selectedSystemName), [sele
     [unifiedRoles, selectedRoleGroupKey]
   );
 
-  const processedMenus = useMemo(() => {
+  const targetBundles = useMemo(() => {
     if (!selectedRoleGroupKey) return [];
-    const targetBundles = fullBundle.filter(b => {
+    return fullBundle.filter(b => {
       if (selectedSystem && b.sys_code !== selectedSystem) return false;
       const { groupKey } = parseAuthLevels(b.auth_name);
       return groupKey === selectedRoleGroupKey;
     });
+  }, [selectedRoleGroupKey, selectedSystem, fullBundle]);
+
+  const processedMenus = useMemo(() => {
     const allMenus = targetBundles.flatMap(b => b.menus);
     const filterNorm = normalize(menuFilter);
     const seen = new Set<string>();
     const result: (Menu & { l1: string, l2: string, l3: string })[] = [];
     allMenus.forEach(m => {
-      const parts = m.path.split('>').map(p => cleanValue(p));
-      const l1 = parts[0] || '기타';
-      const l2 = parts[1] || '기타';
-      const l3 = parts[2] || parts[parts.length - 1] || '기타';
+      const { l1, l2, l3 } = menuTreeLevels(m);
       const pathNorm = normalize(`${l1}|${l2}|${l3}`);
       if (seen.has(pathNorm)) return;
       if (!hasKorean(l3)) return;
@@ -729,54 +661,67 @@ const isSapSystemSelected = useMemo(() => /sap/i.test(selectedSystemName), [sele
       result.push({ ...m, l1, l2, l3 });
     });
     return result;
-  }, [selectedRoleGroupKey, selectedSystem, fullBundle, menuFilter]);
+  }, [targetBundles, menuFilter]);
 
+  // ✅ L1 탭 / L2 카드 / L3 메뉴 모두 정렬된 상태로 보관 (렌더링은 순서대로 그리기만)
+  // - 권한 번들 하나이고 전처리가 menu_tree를 넣어 줬으면 정렬 없이 위치만 따라감
+  //   (메뉴 필터가 없고, menu_tree 순서가 이 브라우저의 compareTreeLabels 결과와 같을 때만)
+  // - 여러 번들이 묶였거나(시스템 미선택 등) menu_tree가 없거나 위 조건이 아니면 여기서 1회 정렬
   const nestedMenus = useMemo(() => {
-    const tree: Record<string, Record<string, typeof processedMenus>> = {};
+    type TreeMenu = (typeof processedMenus)[number];
+    const tree: Record<string, Record<string, TreeMenu[]>> = {};
     const l1LabelMap: Record<string, string> = {};
-    const l2LabelMap: Record<string, string> = {};
+    const l2LabelMap: Record<string, string> = {}; // `${l1Norm}|${l2Norm}` -> 표시명
+    const l1Order: string[] = [];
+    const l2Order: Record<string, string[]> = {};
+
+    const single = targetBundles.length === 1 ? targetBundles[0] : null;
+    const menus = single?.menus || [];
+    if (single && Array.isArray(single.menu_tree) && !normalize(menuFilter) && menuTreeInOrder(single.menu_tree, menus)) {
+      single.menu_tree.forEach(([l1, l2Nodes]) => {
+        const l1Norm = normalize(l1);
+        l1Order.push(l1Norm);
+        l1LabelMap[l1Norm] = l1;
+        tree[l1Norm] = {};
+        l2Order[l1Norm] = [];
+        l2Nodes.forEach(([l2, positions]) => {
+          const l2Norm = normalize(l2);
+          l2Order[l1Norm].push(l2Norm);
+          l2LabelMap[`${l1Norm}|${l2Norm}`] = l2;
+          tree[l1Norm][l2Norm] = positions
+            .filter(i => menus[i])
+            .map(i => ({ ...menus[i], ...menuTreeLevels(menus[i]) }));
+        });
+      });
+      return { tree, l1LabelMap, l2LabelMap, l1Order, l2Order };
+    }
+
     processedMenus.forEach(m => {
       const l1Norm = normalize(m.l1);
       const l2Norm = normalize(m.l2);
       if (!tree[l1Norm]) {
         tree[l1Norm] = {};
         l1LabelMap[l1Norm] = m.l1;
+        l2Order[l1Norm] = [];
       }
       if (!tree[l1Norm][l2Norm]) {
         tree[l1Norm][l2Norm] = [];
-        l2LabelMap[l2Norm] = m.l2;
+        l2LabelMap[`${l1Norm}|${l2Norm}`] = m.l2;
+        l2Order[l1Norm].push(l2Norm);
       }
       tree[l1Norm][l2Norm].push(m);
     });
-    return { tree, l1LabelMap, l2LabelMap };
-  }, [processedMenus]);
-
-  const sortLabelWithKoreanEtcEnglish = (label: string) => {
-    const v = cleanValue(label);
-    const isEtc = v === '기타';
-
-    // 기타는 최후순위
-    const etcRank = isEtc ? 2 : 0;
-
-    // 한글 우선(0), 영어/기타 외(1)
-    const langRank = hasKorean(v) ? 0 : 1;
-
-    // etcRank가 최우선: 기타는 무조건 맨 뒤
-    return { etcRank, langRank, text: v };
-  };
+    l1Order.push(...Object.keys(tree).sort((a, b) => compareTreeLabels(l1LabelMap[a], l1LabelMap[b])));
+    l1Order.forEach(l1Norm => {
+      l2Order[l1Norm].sort((a, b) => compareTreeLabels(l2LabelMap[`${l1Norm}|${a}`], l2LabelMap[`${l1Norm}|${b}`]));
+      Object.values(tree[l1Norm]).forEach(items =>
+        items.sort((a, b) => compareTreeItems(a.l3, b.l3))
+      );
+    });
+    return { tree, l1LabelMap, l2LabelMap, l1Order, l2Order };
+  }, [targetBundles, processedMenus, menuFilter]);
 
-  const sortedL1NormKeys = useMemo(() =>
-    Object.keys(nestedMenus.tree).sort((a, b) => {
-      const A = sortLabelWithKoreanEtcEnglish(nestedMenus.l1LabelMap[a]);
-      const B = sortLabelWithKoreanEtcEnglish(nestedMenus.l1LabelMap[b]);
-
-      if (A.etcRank !== B.etcRank) return A.etcRank - B.etcRank; // 기타 맨 뒤
-      if (A.langRank !== B.langRank) return A.langRank - B.langRank; // 한글 먼저
-      const locale = A.langRank === 0 ? 'ko' : 'en';
-      return A.text.localeCompare(B.text, locale);
-    }),
-    [nestedMenus]
-  );
+  const sortedL1NormKeys = nestedMenus.l1Order;
 
   useEffect(() => {
     if (!selectedRoleGroupKey) return;
@@ -1082,6 +1027,7 @@ const isSapSystemSelected = useMemo(() => /sap/i.test(selectedSystemName), [sele
             const displayDesc = ias ? roleNameRaw : roleDescRaw;
 
             const all = (b.menus || []);
+            const includeAll = isAllMode || forcedType === "ROLE_TO_MENU" || isMatch;
 
             resultsMap.set(roleKey, {
               role_key: roleKey,
@@ -1090,8 +1036,9 @@ const isSapSystemSelected = useMemo(() => /sap/i.test(selectedSystemName), [sele
               auth_code: cleanValue(b.auth_code),
               auth_desc: displayDesc,
               matchedMenus: isAllMode ? [] : matchedMenus,
-              allMenus: (isAllMode || forcedType === "ROLE_TO_MENU" || isMatch) ? all : [],
+              allMenus: includeAll ? all : [],
               totalMenus: all.length, // ✅ 추가
+              allMenusOrder: includeAll ? b.menu_order : undefined,
             });
 
             return; // ✅ 여기서 forEach(b) 한 바퀴 종료
@@ -1126,6 +1073,11 @@ const isSapSystemSelected = useMemo(() => /sap/i.test(selectedSystemName), [sele
       }
       if (empty) {
         responseContent = `죄송합니다. ${teamName} 팀${selectedSystem ? `의 ${sysName} 시스템` : ""} 내에서 관련 정보를 찾지 못했습니다.`;
+        // ✅ 서버 오타 교정 후보가 있으면 다시 물어볼 이름을 제안
+        const suggested = (analysis.suggestions || []).slice(0, 3).map(s => `'${s.text}'`);
+        if (suggested.length > 0) {
+          responseContent += ` 혹시 ${suggested.join(", ")}을(를) 찾으셨나요?`;
+        }
       }
 
       // ✅ ROLE_TO_MENU + wantsAllMenus(=우리팀 접근 가능 메뉴)면 권한별 20개씩 + pagingMap 저장
@@ -1134,7 +1086,10 @@ const isSapSystemSelected = useMemo(() => /sap/i.test(selectedSystemName), [sele
 
         finalData = finalData.map(role => {
           const base = role.allMenus || [];
-          const sortedAll = sortMenusKoreanFirst(base);
+          // 전처리가 정렬 순서(menu_order)를 넣어 줬고 이 브라우저의 정렬 결과와 같으면 위치만 따라감
+          const sortedAll = role.allMenusOrder && menuOrderInOrder(role.allMenusOrder, base)
+            ? role.allMenusOrder.map(i => base[i])
+            : sortMenusKoreanFirst(base);
           const firstPage = sortedAll.slice(0, 20);
           role.allMenus = firstPage;
           role.totalMenus = sortedAll.length;
@@ -1480,18 +1435,10 @@ const isSapSystemSelected = useMemo(() => /sap/i.test(selectedSystemName), [sele
                                   {/* 선택된 1레벨의 2/3레벨만 표시 */}
                                   {activeL1Norm && nestedMenus.tree[activeL1Norm] ? (
                                     <div className="space-y-5">
-                                      {Object.keys(nestedMenus.tree[activeL1Norm])
-                                        .sort((a, b) => {
-                                          const A = sortLabelWithKoreanEtcEnglish(nestedMenus.l2LabelMap[a]);
-                                          const B = sortLabelWithKoreanEtcEnglish(nestedMenus.l2LabelMap[b]);
-                                          if (A.etcRank !== B.etcRank) return A.etcRank - B.etcRank;
-                                          if (A.langRank !== B.langRank) return A.langRank - B.langRank;
-                                          const locale = A.langRank === 0 ? 'ko' : 'en';
-                                          return A.text.localeCompare(B.text, locale);
-                                        })
+                                      {(nestedMenus.l2Order[activeL1Norm] || [])
                                         .map((l2Norm) => {
                                           const items = nestedMenus.tree[activeL1Norm][l2Norm];
-                                          const l2Label = nestedMenus.l2LabelMap[l2Norm];
+                                          const l2Label = nestedMenus.l2LabelMap[`${activeL1Norm}|${l2Norm}`];
 
                                           return (
                                             <div key={l2Norm} className="bg-white rounded-2xl border border-slate-100 overflow-hidden">
@@ -1502,8 +1449,6 @@ const isSapSystemSelected = useMemo(() => /sap/i.test(selectedSystemName), [sele
                                               <div className="px-4 py-3">
                                                 <div className="flex flex-wrap gap-2">
                                                   {items
-                                                    .slice()
-                                                    .sort((a, b) => cleanValue(a.l3).localeCompare(cleanValue(b.l3), 'ko'))
                                                     .map((m, i) => (
                                                       <span
                                                         key={`${cleanValue(m.menu_id) || i}`}
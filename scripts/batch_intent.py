@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+"""
+일괄 의도 분석 CLI (분석 / 프롬프트 변경 회귀 테스트용)
+
+- 입력: JSONL, 한 줄에 {"id"?, "query", "team"?, "system"?} (currentTeam/currentSystem 도 허용). "-" 이면 stdin
+- 같은 (정규화 질의 + 팀 + 시스템)은 한 번만 분류하고 결과를 해당 줄 모두에 공유
+- 동시 실행 수 제한(--concurrency): 실행 중인 분류는 최대 concurrency 개
+- 출력: 끝난 순서대로 JSONL 스트리밍 (POST /api/analyze-intent/batch 와 같은 줄 형식)
+    {"line", "id", "query", "team", "system", "result", "tier"} 또는 {..., "error"}
+    tier: 결과를 만든 단계 (rules / cache / gemini / none / custom)
+- 분류기 (--classifier)
+    rules            : intent_engine.classify (산출물 어휘만 있으면 오프라인 동작, 기본값)
+    http             : 실행 중인 API 서버의 POST /api/analyze-intent (--url, Gemini 경로)
+                       회귀 테스트 기본값: 캐시 안 씀(nocache) + 규칙 엔진 지름길 건너뜀(force_llm)
+                       서비스와 같은 경로로 보려면 --use-cache --allow-rules
+    모듈:함수        : 직접 만든 분류기. fn(query, team, system) -> dict
+
+사용:
+  python scripts/batch_intent.py queries.jsonl [--out results.jsonl] [--classifier rules] [--concurrency 4]
+  python scripts/batch_intent.py queries.jsonl --classifier http --url http://127.0.0.1:3001
+"""
+
+import argparse
+import importlib
+import json
+import sys
+import time
+import urllib.request
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Callable, Dict, IO, Iterable, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from search_index import search_normalize  # noqa: E402
+
+Classifier = Callable[[str, str, str], Dict]
+# (결과, tier) 를 돌려주는 내부 분류기
+TieredClassifier = Callable[[str, str, str], Tuple[Dict, str]]
+
+_TRAILING_PUNCT = "?？!.。~"
+
+
+def batch_key(query: str, team: str, system: str) -> str:
+    """services/intentCache.ts intentCacheKey 와 같은 정규화 (소문자 + 공백 제거 + 끝 문장부호 제거)"""
+    return f"{search_normalize(query).rstrip(_TRAILING_PUNCT)}|{team.strip()}|{system.strip()}"
+
+
+def read_batch_lines(lines: Iterable[str]) -> Tuple[List[Dict], List[Dict]]:
+    items: List[Dict] = []
+    errors: List[Dict] = []
+    for i, raw in enumerate(lines, 1):
+        if not raw.strip():
+            continue
+        try:
+            o = json.loads(raw)
+        except json.JSONDecodeError:
+            errors.append({"line": i, "error": "invalid JSON"})
+            continue
+        items.append({
+            "line": i,
+            "id": o.get("id"),
+            "query": o.get("query") if isinstance(o.get("query"), str) else "",
+            "team": str(o.get("team", o.get("currentTeam")) or ""),
+            "system": str(o.get("system", o.get("currentSystem")) or ""),
+        })
+    return items, errors
+
+
+def group_items(items: List[Dict]) -> List[List[Dict]]:
+    """중복 제거: 키별 줄 묶음 (첫 등장 순서)"""
+    groups: Dict[str, List[Dict]] = {}
+    for it in items:
+        groups.setdefault(batch_key(it["query"], it["team"], it["system"]), []).append(it)
+    return list(groups.values())
+
+
+# =========================
+# 분류기
+# =========================
+def rules_classifier(out_base: Path, threshold: float) -> TieredClassifier:
+    from intent_engine import build_intent_vocab, classify
+    from permission_query import load_query_store
+
+    vocab = build_intent_vocab(load_query_store(out_base))
+
+    def fn(query: str, team: str, system: str) -> Tuple[Dict, str]:
+        return classify(vocab, query, team, system, threshold), "rules"
+
+    return fn
+
+
+def http_classifier(url: str, timeout: float, nocache: bool, force_llm: bool) -> TieredClassifier:
+    """tier 는 서버의 X-Intent-Tier 응답 헤더 (없으면 "unknown")"""
+    endpoint = url.rstrip("/") + "/api/analyze-intent"
+
+    def fn(query: str, team: str, system: str) -> Tuple[Dict, str]:
+        body = json.dumps({
+            "query": query, "currentTeam": team, "currentSystem": system,
+            "nocache": nocache, "force_llm": force_llm,
+        }).encode("utf-8")
+        req = urllib.request.Request(endpoint, data=body, headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            return json.loads(resp.read().decode("utf-8")), resp.headers.get("X-Intent-Tier") or "unknown"
+
+    return fn
+
+
+def load_classifier(args: argparse.Namespace) -> TieredClassifier:
+    if args.classifier == "rules":
+        return rules_classifier(Path(args.out_base), args.threshold)
+    if args.classifier == "http":
+        return http_classifier(args.url, args.timeout, nocache=not args.use_cache, force_llm=not args.allow_rules)
+    module, _, attr = args.classifier.partition(":")
+    if not attr:
+        raise SystemExit(f"--classifier 는 rules | http | 모듈:함수 중 하나여야 합니다: {args.classifier!r}")
+    custom: Classifier = getattr(importlib.import_module(module), attr)
+    return lambda query, team, system: (custom(query, team, system), "custom")
+
+
+# =========================
+# 실행
+# =========================
+def run_batch(
+    groups: List[List[Dict]], classify_fn: TieredClassifier, concurrency: int, out: IO[str]
+) -> Tuple[Counter, Counter]:
+    """묶음별로 1회 분류, 끝나는 대로 해당 줄들을 out에 쓴다. 반환: (유형별 줄 수 (+ "ERROR"), tier별 줄 수)"""
+    counts: Counter = Counter()
+    tiers: Counter = Counter()
+    pending = iter(groups)
+    with ThreadPoolExecutor(max_workers=concurrency) as ex:
+        running = {}
+
+        def submit_next() -> bool:
+            group = next(pending, None)
+            if group is None:
+                return False
+            first = group[0]
+            running[ex.submit(classify_fn, first["query"], first["team"], first["system"])] = group
+            return True
+
+        for _ in range(concurrency):
+            if not submit_next():
+                break
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in done:
+                group = running.pop(fut)
+                try:
+                    result, tier = fut.result()
+                    payload = {"result": result, "tier": tier}
+                    kind = result.get("type", "UNKNOWN")
+                    tiers[tier] += len(group)
+                except Exception as e:  # 한 질의 실패가 배치 전체를 멈추지 않게
+                    payload = {"error": str(e)}
+                    kind = "ERROR"
+                for it in group:
+                    out.write(json.dumps({**it, **payload}, ensure_ascii=False) + "\n")
+                counts[kind] += len(group)
+                submit_next()
+            out.flush()
+    return counts, tiers
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="일괄 의도 분석 (JSONL 입력 -> JSONL 출력)")
+    ap.add_argument("input", help="질의 JSONL 경로 (- 이면 stdin)")
+    ap.add_argument("--out", default="-", help="결과 JSONL 경로 (기본 stdout)")
+    ap.add_argument("--classifier", default="rules", help="rules | http | 모듈:함수")
+    ap.add_argument("--concurrency", type=int, default=4)
+    ap.add_argument("--out-base", default=str(Path(__file__).resolve().parent.parent / "public" / "data"),
+                    help="rules 분류기 어휘를 만들 산출물 경로")
+    ap.add_argument("--threshold", type=float, default=0.7, help="rules 분류기 escalate 기준")
+    ap.add_argument("--url", default="http://127.0.0.1:3001", help="http 분류기 API 서버 주소")
+    ap.add_argument("--timeout", type=float, default=30.0, help="http 분류기 요청 타임아웃(초)")
+    ap.add_argument("--use-cache", action="store_true",
+                    help="http 분류기: 서버 의도 캐시 사용 (기본: nocache, 항상 새로 분류)")
+    ap.add_argument("--allow-rules", action="store_true",
+                    help="http 분류기: 규칙 엔진 지름길 허용 (기본: force_llm, 항상 Gemini)")
+    args = ap.parse_args()
+
+    src = sys.stdin if args.input == "-" else open(args.input, "r", encoding="utf-8")
+    with src:
+        items, errors = read_batch_lines(src)
+    groups = group_items(items)
+    opts = f" nocache={int(not args.use_cache)} force_llm={int(not args.allow_rules)}" if args.classifier == "http" else ""
+    print(f"[BATCH] lines={len(items)} unique={len(groups)} invalid={len(errors)} "
+          f"classifier={args.classifier}{opts} concurrency={args.concurrency}", file=sys.stderr)
+
+    t0 = time.perf_counter()
+    classify_fn = load_classifier(args)
+    t_load = time.perf_counter() - t0
+
+    out = sys.stdout if args.out == "-" else open(args.out, "w", encoding="utf-8")
+    try:
+        for e in errors:
+            out.write(json.dumps(e, ensure_ascii=False) + "\n")
+        t0 = time.perf_counter()
+        counts, tiers = run_batch(groups, classify_fn, max(1, args.concurrency), out)
+        elapsed = time.perf_counter() - t0
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    rate = len(groups) / elapsed if elapsed > 0 else 0.0
+    print(f"[BATCH] done: {elapsed:.2f}s (classifier load {t_load:.2f}s, {rate:.0f} unique/s) "
+          + " ".join(f"{k}={v}" for k, v in sorted(counts.items()))
+          + " | tier " + " ".join(f"{k}={v}" for k, v in sorted(tiers.items())), file=sys.stderr)
+    return 1 if counts.get("ERROR") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
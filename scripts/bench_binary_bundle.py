@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+"""
+바이너리 번들(mmap) vs by_team jsonl(json.loads) 조회 벤치마크
+
+- out_base의 by_team 산출물로 permissions.bin을 만들고(임시 폴더) 팀별 내용이 jsonl과 같은지 확인
+- 같은 (팀, 시스템, 권한) 질의를 두 방식으로 반복
+  - jsonl : 팀 파일 읽기 + 줄마다 json.loads + 필터 (요청마다 파싱하는 서버를 가정)
+  - binary: 한 번 연 BinaryBundle에서 조회 (열기 비용은 따로 표시)
+            menus()는 dict 목록까지 만든 값, menu_refs()는 복사 없는 u32 뷰만
+- 내용이 다르면 exit 1
+
+사용: python scripts/bench_binary_bundle.py [out_base] [질의 수]
+"""
+
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import preprocess_permissions_v2 as v2  # noqa: E402
+from binary_bundle import BINARY_BUNDLE_FILE, BinaryBundle, build_from_out_base  # noqa: E402
+
+ROLE_FIELDS = ["team_name", "sys_code", "sys_name", "auth_code", "auth_name", "auth_desc", "menus"]
+
+
+def role_key(row: Dict) -> Tuple[str, str]:
+    return (row.get("sys_code", ""), row.get("auth_code", ""))
+
+
+def check_same(out_base: Path, bb: BinaryBundle) -> int:
+    catalog = v2.load_menu_catalog(out_base)
+    files = v2.list_old_team_files(out_base / "by_team")
+    failed = 0
+    for tc in sorted(files):
+        rows = v2.sorted_team_rows(v2.load_team_bundles(tc, files[tc], out_base / v2.BY_ROLE_DIR, catalog))
+        want = {role_key(r): [r.get(k, "" if k != "menus" else []) for k in ROLE_FIELDS] for r in rows}
+        got = {role_key(r): [r[k] for k in ROLE_FIELDS] for r in bb.team_bundles(tc)}
+        if want != got:
+            diff = [k for k in set(want) | set(got) if want.get(k) != got.get(k)]
+            print(f"[FAIL] team={tc!r}: {len(diff)} roles differ, e.g. {diff[:3]}")
+            failed += 1
+    print(f"[CHECK] teams={len(files)} failed={failed}")
+    return failed
+
+
+def jsonl_lookup(path: Path, sys_code: str, auth_code: str, by_role: Path, catalog_menus: List[Dict]) -> List[Dict]:
+    """요청마다 팀 jsonl을 파싱하는 방식 (shared면 by_role/<ref>.json, catalog면 메모리의 카탈로그로 복원)"""
+    with path.open("r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            b = json.loads(line)
+            if b.get("sys_code") == sys_code and b.get("auth_code") == auth_code:
+                if b.get("role_ref"):
+                    b = json.loads((by_role / f"{b['role_ref']}.json").read_text(encoding="utf-8"))
+                if "menu_refs" in b:
+                    return [{"path": catalog_menus[i]["path"], "menu_id": catalog_menus[i]["menu_id"]} for i in b["menu_refs"]]
+                return b.get("menus", [])
+    return []
+
+
+def percentile(xs: List[float], p: float) -> float:
+    xs = sorted(xs)
+    return xs[min(len(xs) - 1, int(len(xs) * p))]
+
+
+def main() -> int:
+    out_base = Path(sys.argv[1]) if len(sys.argv) > 1 else Path(__file__).resolve().parent.parent / "public" / "data"
+    n_queries = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+
+    t0 = time.perf_counter()
+    data, n_teams = build_from_out_base(out_base)
+    t_build = time.perf_counter() - t0
+    jsonl_bytes = sum(p.stat().st_size for p in (out_base / "by_team").glob("role_bundle_team_*.jsonl"))
+    print(f"[BENCH] build={t_build:.2f}s bin={len(data) / 1024:.1f}KB jsonl={jsonl_bytes / 1024:.1f}KB teams={n_teams}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        bin_path = Path(tmp) / BINARY_BUNDLE_FILE
+        bin_path.write_bytes(data)
+
+        t0 = time.perf_counter()
+        bb = BinaryBundle(bin_path)
+        t_open = time.perf_counter() - t0
+        try:
+            failed = check_same(out_base, bb)
+
+            files = v2.list_old_team_files(out_base / "by_team")
+            queries = []
+            for tc in sorted(files):
+                for r in bb.roles(tc):
+                    queries.append((tc, files[tc][0], r["sys_code"], r["auth_code"]))
+            rng = random.Random(0)
+            queries = [rng.choice(queries) for _ in range(n_queries)] if queries else []
+
+            by_role = out_base / v2.BY_ROLE_DIR
+            catalog_menus = v2.load_menu_catalog(out_base)["menus"]
+            timings: Dict[str, List[float]] = {"jsonl json.loads": [], "binary menus()": [], "binary menu_refs()": []}
+            for tc, path, sc, ac in queries:
+                t0 = time.perf_counter()
+                jsonl_lookup(path, sc, ac, by_role, catalog_menus)
+                t1 = time.perf_counter()
+                bb.menus(tc, sc, ac)
+                t2 = time.perf_counter()
+                bb.menu_refs(tc, sc, ac)
+                t3 = time.perf_counter()
+                timings["jsonl json.loads"].append(t1 - t0)
+                timings["binary menus()"].append(t2 - t1)
+                timings["binary menu_refs()"].append(t3 - t2)
+        finally:
+            bb.close()
+
+    print(f"[BENCH] binary open (mmap)={t_open * 1e6:.0f}us")
+    if queries:
+        for name, ts in timings.items():
+            print(
+                f"[BENCH] {name:<20} team->sys->role->menus: "
+                f"p50={percentile(ts, 0.5) * 1e6:>9.1f}us p99={percentile(ts, 0.99) * 1e6:>9.1f}us "
+                f"total={sum(ts):.3f}s (n={len(ts)})"
+            )
+        base = percentile(timings["jsonl json.loads"], 0.5)
+        print(
+            f"[BENCH] speedup (p50): menus() x{base / max(percentile(timings['binary menus()'], 0.5), 1e-9):.0f}, "
+            f"menu_refs() x{base / max(percentile(timings['binary menu_refs()'], 0.5), 1e-9):.0f}"
+        )
+
+    if failed:
+        print("❌ 내용 불일치")
+        return 1
+    print("✅ 내용 동일")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
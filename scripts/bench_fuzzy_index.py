@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+"""
+오타 교정 인덱스 벤치마크: SymSpell(자모 삭제 사전) vs 선형 Levenshtein 스캔
+
+- 어휘: out_base/fuzzy/fuzzy_index.json (없으면 산출물 번들로 같은 인덱스를 만듦)
+- 질의: 실제 이름에 오타를 넣어 생성 (음절 치환 / 음절 삭제 / 띄어쓰기 추가 / 글자 추가 / 자모 하나 바꾸기)
+- 제한 없는 SymSpell(max_checks=0)과 선형 스캔의 top-k가 하나라도 다르면 exit 1 (후보 수집이 놓친 이름이 없는지 확인)
+- 지연은 --max-checks(기본 MAX_CHECKS = 0, 제한 없음)로 측정. 상한을 주면 제한 없는 결과와 top-k가 다른 질의 수
+  (정확도 비용)와 예시를 출력 -> 상한을 고를 때 지연과 같이 봄
+- SymSpell p99가 --p99-target-us(기본 1000us, 0이면 끔)를 넘으면 exit 1
+- 어휘가 하나도 없으면(fuzzy_index.json / 번들 없음 등) 경로를 적은 오류로 중단
+- 결과는 [FUZZY] 줄로 출력, --json 경로를 주면 같은 숫자를 파일로도 저장
+
+사용: python scripts/bench_fuzzy_index.py [out_base] [--n 3000] [--k 5] [--max-checks 0] [--p99-target-us 1000] [--json 결과.json]
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from fuzzy_index import (  # noqa: E402
+    FUZZY_DIR,
+    FUZZY_INDEX_FILE,
+    MAX_CHECKS,
+    add_fuzzy_terms,
+    fuzzy_index_doc,
+    fuzzy_lookup,
+    linear_lookup,
+    new_fuzzy_index,
+    prepare_fuzzy_index,
+    row_fuzzy_terms,
+)
+from permission_query import iter_team_bundles  # noqa: E402
+
+_SYLLABLES = "가나다라마바사아자차카타파하목록관리조회등록결재"
+_TYPO_KINDS = ("substitute", "delete", "space", "insert", "jamo")
+
+
+def load_doc(out_base: Path) -> Dict:
+    path = out_base / FUZZY_DIR / FUZZY_INDEX_FILE
+    if path.exists():
+        doc = json.loads(path.read_text(encoding="utf-8"))
+        source = path
+    else:
+        index = new_fuzzy_index()
+        for _, rows in iter_team_bundles(out_base):
+            for row in rows:
+                add_fuzzy_terms(index, row_fuzzy_terms(row))
+        doc = fuzzy_index_doc(index)
+        source = out_base
+    if not doc["terms"]:
+        raise ValueError(f"오타 교정 어휘가 없습니다: {source} (out_base 경로 / 번들 / {FUZZY_DIR}/{FUZZY_INDEX_FILE} 확인)")
+    return doc
+
+
+def make_typo(rng: random.Random, text: str, kind: str) -> str:
+    s = list(text)
+    i = rng.randrange(len(s))
+    if kind == "substitute":
+        s[i] = rng.choice(_SYLLABLES)
+    elif kind == "delete" and len(s) > 3:
+        del s[i]
+    elif kind == "space":
+        s.insert(i, " ")
+    elif kind == "insert":
+        s.insert(i, rng.choice(_SYLLABLES + "abc"))
+    elif kind == "jamo" and "가" <= s[i] <= "힣":
+        # 종성만 바꾸거나 붙임 (몽록 / 목록 같은 받침 오타)
+        code = ord(s[i]) - 0xAC00
+        s[i] = chr(0xAC00 + code - code % 28 + rng.randrange(28))
+    return "".join(s)
+
+
+def make_queries(doc: Dict, n: int, seed: int = 0) -> List[Dict]:
+    if not doc["terms"]:
+        raise ValueError("질의를 만들 어휘가 없습니다 (doc['terms'] 비어 있음)")
+    rng = random.Random(seed)
+    out = []
+    for i in range(n):
+        text = rng.choice(doc["terms"])[0]
+        kind = _TYPO_KINDS[i % len(_TYPO_KINDS)]
+        out.append({"kind": kind, "source": text, "query": make_typo(rng, text, kind)})
+    return out
+
+
+def percentiles(ts: List[float]) -> Dict[str, float]:
+    ts = sorted(ts)
+
+    def p(q: float) -> float:
+        return ts[min(len(ts) - 1, int(len(ts) * q))] * 1e6
+
+    return {"n": len(ts), "p50_us": round(p(0.50), 1), "p99_us": round(p(0.99), 1), "max_us": round(ts[-1] * 1e6, 1)}
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="오타 교정 인덱스 벤치마크")
+    ap.add_argument("out_base", nargs="?", default=str(Path(__file__).resolve().parent.parent / "public" / "data"))
+    ap.add_argument("--n", type=int, default=3000)
+    ap.add_argument("--k", type=int, default=5)
+    ap.add_argument("--max-checks", type=int, default=MAX_CHECKS, help="지연 측정에 쓸 편집 거리 계산 상한. 0이면 제한 없음")
+    ap.add_argument("--p99-target-us", type=float, default=1000.0, help="SymSpell p99 목표(us), 넘으면 exit 1. 0이면 끔")
+    ap.add_argument("--json", default="", help="결과 저장 경로")
+    args = ap.parse_args()
+
+    t0 = time.perf_counter()
+    try:
+        raw = load_doc(Path(args.out_base))
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+    doc = prepare_fuzzy_index(raw)
+    t_load = time.perf_counter() - t0
+    print(f"[FUZZY] terms={len(raw['terms'])} deletes={len(raw['deletes'])} max_distance={raw['max_distance']} "
+          f"prefix_length={raw['prefix_length']} load={t_load:.2f}s")
+
+    queries = make_queries(raw, args.n)
+    t_sym, t_lin = [], []
+    same = same_capped = found_source = 0
+    for q in queries:
+        t0 = time.perf_counter()
+        got = fuzzy_lookup(doc, q["query"], args.k, max_checks=args.max_checks)
+        t_sym.append(time.perf_counter() - t0)
+        t0 = time.perf_counter()
+        want = linear_lookup(raw, q["query"], args.k)
+        t_lin.append(time.perf_counter() - t0)
+        exact = fuzzy_lookup(doc, q["query"], args.k, max_checks=0)
+        if exact == want:
+            same += 1
+        elif len(t_sym) - same <= 3:  # 처음 3건만 출력
+            print(f"[FAIL] {q['query']!r}: symspell={[g['text'] for g in exact]} linear={[w['text'] for w in want]}")
+        if got == exact:
+            same_capped += 1
+        elif len(t_sym) - same_capped <= 3:
+            print(f"[DIFF] max_checks={args.max_checks} {q['query']!r}: capped={[g['text'] for g in got]} "
+                  f"unbounded={[e['text'] for e in exact]}")
+        found_source += int(any(g["text"] == q["source"] for g in got))
+
+    report = {
+        "terms": len(raw["terms"]),
+        "load_s": round(t_load, 3),
+        "symspell": percentiles(t_sym),
+        "linear": percentiles(t_lin),
+        "same_topk": same,
+        "max_checks": args.max_checks,
+        "same_topk_capped": same_capped,
+        "diff_topk_capped": len(queries) - same_capped,
+        "p99_target_us": args.p99_target_us,
+        "queries": len(queries),
+        "source_in_topk": round(found_source / len(queries), 3),
+    }
+    for name in ("symspell", "linear"):
+        r = report[name]
+        print(f"[FUZZY] {name:<9} n={r['n']:<6} p50={r['p50_us']:>9.1f}us p99={r['p99_us']:>9.1f}us max={r['max_us']:>9.1f}us")
+    speedup = report["linear"]["p50_us"] / max(report["symspell"]["p50_us"], 1e-9)
+    print(f"[FUZZY] same top-{args.k}: {same}/{len(queries)}  original name in top-{args.k}: "
+          f"{report['source_in_topk']:.1%}  p50 speedup x{speedup:.1f}")
+    if args.max_checks:
+        print(f"[FUZZY] max_checks={args.max_checks}: same top-{args.k} as unbounded {same_capped}/{len(queries)} "
+              f"(다른 질의 {len(queries) - same_capped}건 = 상한의 정확도 비용)")
+    else:
+        print(f"[FUZZY] max_checks=0: 제한 없음 (top-{args.k} 정확)")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"[FUZZY] saved: {args.json}")
+    if same != len(queries):
+        print("❌ SymSpell / 선형 스캔 결과 불일치")
+        return 1
+    if args.p99_target_us and report["symspell"]["p99_us"] > args.p99_target_us:
+        print(f"❌ SymSpell p99 {report['symspell']['p99_us']:.1f}us > 목표 {args.p99_target_us:.0f}us")
+        return 1
+    print("✅ 완료")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,516 @@
+# -*- coding: utf-8 -*-
+"""
+전처리 파이프라인 벤치마크 (합성 조직/권한 엑셀 A/B 생성 -> v2 단계별 시간 + v1 to_outputs/merge_outputs)
+
+- 합성 엑셀: CONFIG["sheets_a"] / cols_a_user / cols_a_sap_tcode / cols_a_role_menu / sheets_b / cols_b 의
+  첫 번째 후보 이름 그대로 생성 (실제 파일과 같은 시트/컬럼 구조)
+  팀 코드 변형(앞자리 0, 숫자형, 0RULE_x), 빈 설명 / 줄바꿈 섞인 설명, 메뉴명 빈 T코드 행 포함
+- 규모: --scale 사용자행:팀수 (k/M 접미사, 예: 1k:100, 100k:1000, 5M:10k), 여러 번 지정 가능
+  사용자 행은 5개 권한별 임직원 시트에 나눠 담음 (시트당 엑셀 최대 1,048,575행 -> 5M 근처가 상한)
+- v2: preprocess_permissions_v2 를 별도 프로세스로 실행 (빈 out_base / 빈 cache_dir, --no-excel)
+  -> build_report.json 의 단계별 wall/cpu/rss 를 그대로 기록
+- v1: 같은 합성 모델을 v1 평면 스키마(IAS / SAP)로 펼쳐 normalize_df / to_outputs / merge_outputs 시간 측정
+  (v1 은 groupby 루프라 --v1-max-rows 까지만 사용)
+- 결과: 이력 JSON(--history)에 실행마다 한 건 추가, 같은 규모의 직전 기록과 단계별 비교
+  --fail-regression PCT 를 주면 PCT% 넘게 느려진 단계가 있을 때 exit 1
+
+사용: python scripts/bench_pipeline.py [--scale 1k:100 ...] [--history 경로] [--fail-regression 20] [--skip-v1]
+"""
+
+import argparse
+import json
+import platform
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import preprocess_permissions as v1  # noqa: E402
+import preprocess_permissions_v2 as v2  # noqa: E402
+from stage_profiler import BUILD_REPORT_FILE, peak_rss_mb  # noqa: E402
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+V2_SCRIPT = Path(__file__).resolve().parent / "preprocess_permissions_v2.py"
+DEFAULT_WORK_DIR = REPO_DIR / ".build_cache" / "bench"
+DEFAULT_HISTORY = REPO_DIR / ".build_cache" / "bench_history.json"
+DEFAULT_SCALES = ["1k:100", "10k:300", "100k:1000"]
+
+BENCH_HISTORY_VERSION = 1
+XLSX_MAX_ROWS = 1_048_575  # 헤더 1행 제외
+REGRESSION_MIN_S = 0.05  # 이보다 짧은 단계는 비교 제외 (잡음)
+TEAM_ROLE_SPAN = 12  # 팀 하나가 시스템별로 쓰는 역할 수 상한
+
+# 사용자 행 배분 (권한별 임직원 시트 -> 비율, 시스템명, 역할 종류)
+USER_SHEETS = [
+    ("sap_users", 0.40, "SAP", "sap"),
+    ("ias_users", 0.40, "IAS", "ias"),
+    ("mro_users", 0.08, "MRO", "other"),
+    ("srm_users", 0.06, "SRM", "other"),
+    ("eaccount_users", 0.06, "eAccount", "other"),
+]
+
+
+def first(cands: List[str]) -> str:
+    return cands[0]
+
+
+def parse_count(text: str) -> int:
+    text = text.strip()
+    mult = {"k": 1_000, "m": 1_000_000}.get(text[-1:].lower(), 1)
+    return int(float(text[:-1] if mult > 1 else text) * mult)
+
+
+def parse_scale(text: str) -> Tuple[int, int]:
+    users, _, teams = text.partition(":")
+    if not teams:
+        raise ValueError(f"규모 형식은 사용자행:팀수 입니다 (예: 100k:1000): {text}")
+    return parse_count(users), parse_count(teams)
+
+
+def scale_label(users: int, teams: int) -> str:
+    def fmt(n: int) -> str:
+        for suffix, unit in (("M", 1_000_000), ("k", 1_000)):
+            if n >= unit and n % unit == 0:
+                return f"{n // unit}{suffix}"
+        return str(n)
+
+    return f"{fmt(users)}:{fmt(teams)}"
+
+
+# =========================
+# 합성 조직/권한 모델
+# =========================
+def make_model(n_teams: int, seed: int) -> Dict:
+    """팀 / 메뉴 / 역할 / 역할-메뉴 (사용자 배정은 write_workbooks 에서 시트별로)"""
+    rng = np.random.default_rng(seed)
+
+    # 팀 코드: 문자열 / 숫자형 / 앞자리 0 / 0RULE_x 섞음 (norm_code 경로 전부 지나가게)
+    codes: List = []
+    for i in range(n_teams):
+        if i % 50 == 49:
+            codes.append(f"0RULE_{i}")
+        elif i % 7 == 0:
+            codes.append(f"0{30000 + i}")
+        elif i % 3 == 0:
+            codes.append(30000 + i)
+        else:
+            codes.append(str(30000 + i))
+    teams = {"name": np.array([f"합성팀{i:05d}" for i in range(n_teams)], dtype=object),
+             "code": np.array(codes, dtype=object)}
+
+    l1s = np.array(["영업", "정산", "마감", "구매", "ADMIN", "Board"], dtype=object)
+    l3s = np.array(["견적", "비즈니스파트너목록", "계약", "청구", "Approval", "조회"], dtype=object)
+    n_ias_menus = int(min(max(200, n_teams // 2), 20_000))
+    l1 = l1s[rng.integers(0, len(l1s), n_ias_menus)]
+    ias_menus = pd.DataFrame({
+        "menu_id": [f"pjt.m{i}" for i in range(n_ias_menus)],
+        "1level": l1,
+        "2level": [f"{a}관리{i % 9}" for i, a in enumerate(l1)],
+        "3level": [f"{b}{i}" for i, b in enumerate(l3s[rng.integers(0, len(l3s), n_ias_menus)])],
+    })
+    n_sap_menus = int(min(max(120, n_teams // 4), 10_000))
+    sap_l3s = np.array(["전표입력", "자재조회", "원가", "Vendor"], dtype=object)
+    sap_menus = pd.DataFrame({
+        "menu_id": [f"T{i:05d}" for i in range(n_sap_menus)],
+        "1level": "FI",
+        "2level": "재무",
+        "3level": [f"{b}{i}" for i, b in enumerate(sap_l3s[rng.integers(0, len(sap_l3s), n_sap_menus)])],
+    })
+
+    n_ias_roles = int(max(25, n_teams // 4))
+    n_sap_roles = int(max(20, n_teams // 5))
+    n_other_roles = 12
+    desc_pool = np.array(["채권 대시보드 역할", "", None, "영업 관리\r\n역할 "], dtype=object)
+    roles = {
+        "ias": pd.DataFrame({"name": [f"ROLE_R{i}" for i in range(n_ias_roles)],
+                             "code": np.arange(100, 100 + n_ias_roles),
+                             "desc": desc_pool[rng.integers(0, len(desc_pool), n_ias_roles)]}),
+        "sap": pd.DataFrame({"name": [f"ZC_FI_{i}" for i in range(n_sap_roles)],
+                             "code": [f"Z{i:04d}" for i in range(n_sap_roles)],
+                             "desc": None}),
+        "other": pd.DataFrame({"name": [f"MRO_{i}" for i in range(n_other_roles)],
+                               "code": np.arange(500, 500 + n_other_roles).astype(float),
+                               "desc": "MRO 권한"}),
+    }
+
+    # 역할 -> 메뉴 (IAS 3~40개, SAP 2~20개, 기타 1개)
+    def role_menu(kind: str, menus: pd.DataFrame, lo: int, hi: int) -> pd.DataFrame:
+        r = roles[kind]
+        k = rng.integers(lo, hi + 1, len(r))
+        role_idx = np.repeat(np.arange(len(r)), k)
+        menu_idx = rng.integers(0, len(menus), len(role_idx))
+        out = pd.DataFrame({"role": role_idx, "menu": menu_idx}).drop_duplicates()
+        return out.reset_index(drop=True)
+
+    rm = {"ias": role_menu("ias", ias_menus, 3, 40), "sap": role_menu("sap", sap_menus, 2, 20)}
+    return {"teams": teams, "ias_menus": ias_menus, "sap_menus": sap_menus, "roles": roles, "role_menu": rm,
+            "rng": rng}
+
+
+def allocate_users(n_users: int) -> Dict[str, int]:
+    """시트별 사용자 행 수 (시트 상한을 넘는 몫은 남은 시트에 나눔)"""
+    if n_users > XLSX_MAX_ROWS * len(USER_SHEETS):
+        raise ValueError(f"사용자 행 {n_users:,} > 엑셀 시트 {len(USER_SHEETS)}개 한도 {XLSX_MAX_ROWS * len(USER_SHEETS):,}")
+    want = {key: int(n_users * ratio) for key, ratio, _, _ in USER_SHEETS}
+    want[USER_SHEETS[0][0]] += n_users - sum(want.values())
+    out = {key: min(n, XLSX_MAX_ROWS) for key, n in want.items()}
+    rest = n_users - sum(out.values())
+    for key, _, _, _ in USER_SHEETS:
+        add = min(rest, XLSX_MAX_ROWS - out[key])
+        out[key] += add
+        rest -= add
+    return out
+
+
+def user_frame(model: Dict, sys_name: str, kind: str, n: int) -> Tuple[pd.DataFrame, np.ndarray, np.ndarray]:
+    """(권한별 임직원 시트, 팀 위치, 역할 위치)"""
+    rng = model["rng"]
+    teams = model["teams"]
+    r = model["roles"][kind]
+    team_idx = rng.integers(0, len(teams["name"]), n)
+    # 팀마다 쓰는 역할은 일부 (팀별 시작 위치에서 TEAM_ROLE_SPAN 개 안에서 고름)
+    span = min(TEAM_ROLE_SPAN, len(r))
+    role_idx = (team_idx * 7919 + rng.integers(0, span, n)) % len(r)
+    c = v2.CONFIG["cols_a_user"]
+    start = pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 300, n), unit="D")
+    df = pd.DataFrame({
+        first(c["name"]): [f"u{k}" for k in range(n)],
+        first(c["empno"]): np.arange(10000, 10000 + n),
+        first(c["sys_name"]): sys_name,
+        first(c["role_name"]): r["name"].to_numpy()[role_idx],
+        first(c["role_code"]): r["code"].to_numpy()[role_idx],
+        first(c["desc"]): r["desc"].to_numpy()[role_idx],
+        first(c["start_date"]): start,
+        first(c["end_date"]): pd.Timestamp("2099-12-31"),
+        first(c["dept_name"]): teams["name"][team_idx],
+        first(c["dept_code"]): teams["code"][team_idx],
+    })
+    return df, team_idx, role_idx
+
+
+def role_menu_sheet(model: Dict) -> pd.DataFrame:
+    """A.역할별 메뉴 (IAS/SAP 역할은 모델의 역할-메뉴, 기타 역할은 메뉴 1개)"""
+    rm_c = v2.CONFIG["cols_a_role_menu"]
+    rm_rows = []
+    for kind, menus in (("ias", model["ias_menus"]), ("sap", model["sap_menus"])):
+        r = model["roles"][kind]
+        pairs = model["role_menu"][kind]
+        m = menus.iloc[pairs["menu"].to_numpy()]
+        rm_rows.append(pd.DataFrame({
+            first(rm_c["role_id"]): r["code"].to_numpy()[pairs["role"].to_numpy()],
+            first(rm_c["role_name"]): r["name"].to_numpy()[pairs["role"].to_numpy()],
+            first(rm_c["menu_id"]): m["menu_id"].to_numpy(),
+            first(rm_c["menu_name"]): m["3level"].to_numpy(),
+            first(rm_c["url"]): [f"/x/{x}" for x in m["menu_id"]] if kind == "ias" else "",
+        }))
+    other = model["roles"]["other"]
+    rm_rows.append(pd.DataFrame({
+        first(rm_c["role_id"]): other["code"], first(rm_c["role_name"]): other["name"],
+        first(rm_c["menu_id"]): [f"mro{int(c)}" for c in other["code"]],
+        first(rm_c["menu_name"]): "구매", first(rm_c["url"]): "",
+    }))
+    return pd.concat(rm_rows, ignore_index=True)
+
+
+def tcode_sheet(model: Dict) -> pd.DataFrame:
+    """A.SAP 역할별 TCODE (메뉴명이 빈 행 섞음 -> 역할명 대체 경로)"""
+    rng = model["rng"]
+    tc_c = v2.CONFIG["cols_a_sap_tcode"]
+    sap_pairs = model["role_menu"]["sap"].sample(frac=0.3, random_state=int(rng.integers(1 << 31)))
+    sap_roles = model["roles"]["sap"]
+    tc_menu = model["sap_menus"].iloc[sap_pairs["menu"].to_numpy()]
+    tc_names = tc_menu["3level"].to_numpy().copy()
+    tc_names[rng.random(len(tc_names)) < 0.2] = ""
+    return pd.DataFrame({
+        first(tc_c["role_name"]): sap_roles["name"].to_numpy()[sap_pairs["role"].to_numpy()],
+        first(tc_c["role_code"]): sap_roles["code"].to_numpy()[sap_pairs["role"].to_numpy()],
+        first(tc_c["menu_name"]): tc_names,
+        first(tc_c["menu_code"]): tc_menu["menu_id"].to_numpy(),
+    })
+
+
+def level_sheets(model: Dict) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """B.IAS_Sales / B.SAP"""
+    cb = v2.CONFIG["cols_b"]
+    ias = model["ias_menus"]
+    sap = model["sap_menus"]
+    b_ias = pd.DataFrame({
+        first(cb["ias_menu_name"]): ias["3level"], first(cb["ias_menu_id"]): ias["menu_id"],
+        first(cb["ias_1"]): ias["1level"], first(cb["ias_2"]): ias["2level"], first(cb["ias_3"]): ias["3level"],
+    })
+    b_sap = pd.DataFrame({
+        first(cb["sap_menu_id"]): sap["menu_id"],
+        first(cb["sap_1"]): sap["1level"], first(cb["sap_2"]): sap["2level"], first(cb["sap_3"]): sap["3level"],
+    })
+    return b_ias, b_sap
+
+
+def write_workbooks(model: Dict, n_users: int, path_a: Path, path_b: Path,
+                    write: bool = True) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+    """
+    엑셀 A/B 기록. 반환: 종류(ias/sap) -> (팀 위치, 역할 위치) (v1 평면 데이터용)
+    write=False: 난수 소비 순서는 같게 시트만 만들고 기록 생략 (이미 만든 엑셀 재사용)
+    """
+    sa, sb = v2.CONFIG["sheets_a"], v2.CONFIG["sheets_b"]
+    assigned: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+    counts = allocate_users(n_users)
+    df_role_menu = role_menu_sheet(model)
+    df_tcode = tcode_sheet(model)
+
+    if not write:
+        for key, _, sys_name, kind in USER_SHEETS:
+            _, team_idx, role_idx = user_frame(model, sys_name, kind, counts[key])
+            if kind in ("ias", "sap"):
+                assigned[kind] = (team_idx, role_idx)
+        return assigned
+
+    path_a.parent.mkdir(parents=True, exist_ok=True)
+    with pd.ExcelWriter(path_a) as w:
+        for key, _, sys_name, kind in USER_SHEETS:
+            df, team_idx, role_idx = user_frame(model, sys_name, kind, counts[key])
+            if kind in ("ias", "sap"):
+                assigned[kind] = (team_idx, role_idx)
+            df.to_excel(w, sheet_name=first(sa[key]), index=False)
+            del df
+        pd.DataFrame({"팀명": model["teams"]["name"]}).to_excel(w, sheet_name=first(sa["team_target"]), index=False)
+        df_tcode.to_excel(w, sheet_name=first(sa["sap_role_tcode"]), index=False)
+        df_role_menu.to_excel(w, sheet_name=first(sa["role_menu"]), index=False)
+
+    b_ias, b_sap = level_sheets(model)
+    with pd.ExcelWriter(path_b) as w:
+        b_ias.to_excel(w, sheet_name=first(sb["ias_sales"]), index=False)
+        b_sap.to_excel(w, sheet_name=first(sb["sap"]), index=False)
+    return assigned
+
+
+# =========================
+# v2 (별도 프로세스)
+# =========================
+def run_v2(path_a: Path, path_b: Path, work: Path, extra_args: List[str]) -> Dict:
+    out_base = work / "out"
+    cache_dir = work / "cache"
+    report_path = work / BUILD_REPORT_FILE
+    for p in (out_base, cache_dir):
+        if p.exists():
+            shutil.rmtree(p)
+    report_path.unlink(missing_ok=True)
+    cmd = [sys.executable, str(V2_SCRIPT), "--excel-a", str(path_a), "--excel-b", str(path_b),
+           "--out-base", str(out_base), "--out-xlsx", str(work / "out.xlsx"), "--cache-dir", str(cache_dir),
+           "--report", str(report_path), "--no-excel", *extra_args]
+    t0 = time.perf_counter()
+    proc = subprocess.run(cmd, capture_output=True, text=True, encoding="utf-8", errors="replace")
+    wall = time.perf_counter() - t0
+    if proc.returncode != 0 or not report_path.exists():
+        tail = (proc.stdout + proc.stderr).strip().splitlines()[-5:]
+        return {"ok": False, "returncode": proc.returncode, "wall_s": round(wall, 3), "error": "\n".join(tail)}
+    report = json.loads(report_path.read_text(encoding="utf-8"))
+    return {
+        "ok": True,
+        "wall_s": round(wall, 3),
+        "total_wall_s": report["total_wall_s"],
+        "max_rss_mb": report["max_rss_mb"],
+        "stages": {s["name"]: {k: s.get(k) for k in ("wall_s", "cpu_s", "rows_in", "rows_out", "rss_peak_mb")}
+                   for s in report["stages"]},
+    }
+
+
+# =========================
+# v1 (평면 스키마, 같은 프로세스)
+# =========================
+def v1_frame(model: Dict, kind: str, team_idx: np.ndarray, role_idx: np.ndarray, max_rows: int) -> pd.DataFrame:
+    """사용자 x 역할 메뉴 평면 행 (v1 시트 구조). max_rows 를 넘지 않게 사용자 앞부분만"""
+    pairs = model["role_menu"][kind]
+    menus = model["ias_menus"] if kind == "ias" else model["sap_menus"]
+    roles = model["roles"][kind]
+    per_role = np.bincount(pairs["role"].to_numpy(), minlength=len(roles))
+    n_use = int(np.searchsorted(np.cumsum(per_role[role_idx]), max_rows, side="right"))
+    users = pd.DataFrame({"team": team_idx[:n_use], "role": role_idx[:n_use]})
+    df = users.merge(pairs, on="role", how="inner")
+    m = menus.iloc[df["menu"].to_numpy()]
+    r = roles.iloc[df["role"].to_numpy()]
+    return pd.DataFrame({
+        "team_name": model["teams"]["name"][df["team"].to_numpy()],
+        "team_code": model["teams"]["code"][df["team"].to_numpy()],
+        "sys_code": "IAS" if kind == "ias" else "SAP",
+        "sys_name": "IAS" if kind == "ias" else "SAP",
+        "auth_code": r["code"].to_numpy(),
+        "auth_name": r["name"].to_numpy(),
+        "auth_desc": r["desc"].to_numpy(),
+        "menu_id": m["menu_id"].to_numpy(),
+        "1level": m["1level"].to_numpy(),
+        "2level": m["2level"].to_numpy(),
+        "3level": m["3level"].to_numpy(),
+    })
+
+
+def run_v1(model: Dict, assigned: Dict[str, Tuple[np.ndarray, np.ndarray]], max_rows: int) -> Dict:
+    res: Dict = {"stages": {}}
+    outs = {}
+    for kind in ("ias", "sap"):
+        df = v1_frame(model, kind, *assigned[kind], max_rows=max_rows // 2)
+        t0 = time.perf_counter()
+        df = v1.normalize_df(df, is_ias=kind == "ias", is_sap=kind == "sap")
+        t1 = time.perf_counter()
+        outs[kind] = v1.to_outputs(df, is_sap=kind == "sap")
+        t2 = time.perf_counter()
+        res["stages"][f"normalize_df_{kind}"] = {"wall_s": round(t1 - t0, 3), "rows_in": len(df)}
+        res["stages"][f"to_outputs_{kind}"] = {"wall_s": round(t2 - t1, 3), "rows_in": len(df)}
+    t0 = time.perf_counter()
+    merged = v1.merge_outputs(outs["ias"], outs["sap"])
+    res["stages"]["merge_outputs"] = {"wall_s": round(time.perf_counter() - t0, 3),
+                                      "rows_out": sum(len(b) for b in merged["bundles_by_team"].values())}
+    res["max_rss_mb"] = None if peak_rss_mb() is None else round(peak_rss_mb(), 1)
+    return res
+
+
+# =========================
+# 이력 / 회귀 비교
+# =========================
+def git_commit() -> str:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR, capture_output=True, text=True)
+        return out.stdout.strip()
+    except OSError:
+        return ""
+
+
+def load_history(path: Path) -> Dict:
+    if path.exists():
+        return json.loads(path.read_text(encoding="utf-8"))
+    return {"version": BENCH_HISTORY_VERSION, "runs": []}
+
+
+def previous_run(history: Dict, scale: str, seed: int, v2_args: List[str]) -> Optional[Dict]:
+    for run in reversed(history["runs"]):
+        if run["scale"] == scale and run["seed"] == seed and run.get("v2_args", []) == v2_args:
+            return run
+    return None
+
+
+def regressions(prev: Optional[Dict], cur: Dict, pct: float) -> List[Dict]:
+    """직전 기록 대비 wall_s 가 pct% 넘게 늘어난 단계 (둘 다 REGRESSION_MIN_S 미만이면 제외)"""
+    out = []
+    if prev is None:
+        return out
+    for part in ("v2", "v1"):
+        before = ((prev.get(part) or {}).get("stages")) or {}
+        after = ((cur.get(part) or {}).get("stages")) or {}
+        for name, rec in after.items():
+            old = (before.get(name) or {}).get("wall_s")
+            new = rec.get("wall_s")
+            if old is None or new is None or max(old, new) < REGRESSION_MIN_S:
+                continue
+            change = (new - old) / max(old, 1e-9) * 100
+            if change > pct:
+                out.append({"part": part, "stage": name, "before_s": old, "after_s": new, "change_pct": round(change, 1)})
+    return out
+
+
+def print_run(run: Dict):
+    print(f"[BENCH] {run['scale']} teams={run['teams']:,} users={run['users']:,} gen={run['generate_s']:.1f}s"
+          + (f" v2_args={' '.join(run['v2_args'])}" if run.get("v2_args") else ""))
+    for part in ("v2", "v1"):
+        res = run.get(part)
+        if not res:
+            continue
+        if not res.get("ok", True):
+            print(f"[BENCH]   {part} ❌ 실패: {res.get('error', '')}")
+            continue
+        for name, s in res["stages"].items():
+            rows = s.get("rows_in")
+            print(f"[BENCH]   {part} {name:<20} {s['wall_s']:>8.2f}s" + (f"  rows_in={rows:,}" if rows is not None else ""))
+        print(f"[BENCH]   {part} {'max_rss_mb':<20} {res.get('max_rss_mb')}")
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="전처리 파이프라인 벤치마크 (합성 엑셀 A/B)")
+    ap.add_argument("--scale", action="append", default=[], metavar="USERS:TEAMS",
+                    help=f"사용자행:팀수 (k/M 접미사), 여러 번 지정 가능 (기본 {' '.join(DEFAULT_SCALES)})")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--work-dir", default=str(DEFAULT_WORK_DIR), help="합성 엑셀 / v2 산출물 폴더")
+    ap.add_argument("--history", default=str(DEFAULT_HISTORY), help="결과 이력 JSON")
+    ap.add_argument("--regen", action="store_true", help="이미 만든 합성 엑셀이 있어도 다시 생성")
+    ap.add_argument("--skip-v1", action="store_true", help="v1 to_outputs/merge_outputs 측정 생략")
+    ap.add_argument("--v1-max-rows", type=int, default=500_000, help="v1 평면 행 상한 (IAS/SAP 합)")
+    ap.add_argument("--v2-arg", action="append", default=[], metavar="ARG",
+                    help="v2 실행에 덧붙일 인자 (예: --v2-arg=--no-category). 같은 인자 조합끼리만 비교")
+    ap.add_argument("--fail-regression", type=float, default=None, metavar="PCT",
+                    help="직전 기록 대비 PCT%% 넘게 느려진 단계가 있으면 exit 1")
+    args = ap.parse_args()
+
+    scales = [parse_scale(s) for s in (args.scale or DEFAULT_SCALES)]
+    history_path = Path(args.history)
+    history = load_history(history_path)
+    failed = False
+    found: List[Dict] = []
+
+    for n_users, n_teams in scales:
+        label = scale_label(n_users, n_teams)
+        work = Path(args.work_dir) / f"{label.replace(':', '_')}_s{args.seed}"
+        path_a, path_b = work / "A.xlsx", work / "B.xlsx"
+        run: Dict = {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "commit": git_commit(),
+            "scale": label,
+            "users": n_users,
+            "teams": n_teams,
+            "seed": args.seed,
+            "v2_args": args.v2_arg,
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+        }
+
+        # 모델은 항상 다시 만듦 (seed 고정 -> 같은 모델). 엑셀 기록만 재사용
+        t0 = time.perf_counter()
+        try:
+            model = make_model(n_teams, args.seed)
+            write = args.regen or not (path_a.exists() and path_b.exists())
+            assigned = write_workbooks(model, n_users, path_a, path_b, write=write)
+        except (MemoryError, ValueError) as e:
+            print(f"[BENCH] {label} ❌ 생성 실패: {type(e).__name__}: {e}")
+            failed = True
+            continue
+        run["generate_s"] = round(time.perf_counter() - t0, 3)
+
+        print(f"[BENCH] {label} v2 실행 ...")
+        run["v2"] = run_v2(path_a, path_b, work, args.v2_arg)
+        failed |= not run["v2"]["ok"]
+
+        if not args.skip_v1:
+            print(f"[BENCH] {label} v1 실행 ...")
+            try:
+                run["v1"] = run_v1(model, assigned, args.v1_max_rows)
+            except MemoryError:
+                run["v1"] = {"ok": False, "error": "MemoryError"}
+                failed = True
+        del model, assigned
+
+        print_run(run)
+        if args.fail_regression is not None:
+            regs = regressions(previous_run(history, label, args.seed, args.v2_arg), run, args.fail_regression)
+            for r in regs:
+                print(f"[REGRESSION] ❌ {label} {r['part']}.{r['stage']}: {r['before_s']}s -> {r['after_s']}s ({r['change_pct']:+}%)")
+            run["regressions"] = regs
+            found.extend(regs)
+        history["runs"].append(run)
+
+    history_path.parent.mkdir(parents=True, exist_ok=True)
+    history_path.write_text(json.dumps(history, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"[BENCH] 이력 저장: {history_path} (총 {len(history['runs'])}건)")
+
+    if failed or found:
+        print("❌ 실패 또는 성능 회귀")
+        return 1
+    print("✅ 완료")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
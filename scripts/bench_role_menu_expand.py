@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""
+역할->메뉴 확장 벤치마크: 사용자 행 x 메뉴 직접 확장(기존) vs 고유 권한 행 + 역할->메뉴 조회표(현재)
+
+- 합성 조직(bench_pipeline 모델, 엑셀 기록 없이 메모리에서)으로 df_team_all 을 만든 뒤 두 방식을 실행
+- 비교: 확장 결과 행 수 / 프레임 메모리(deep) / 단계 중 RSS 증가분 / 시간
+- 두 방식의 to_outputs 결과(teams/systems/roles/bundles)와 결과 엑셀의 메뉴매핑 / 로그 시트가
+  완전히 같은지 확인, 다르면 exit 1
+
+사용: python scripts/bench_role_menu_expand.py [--users 200k] [--teams 2000] [--seed 0]
+"""
+
+import argparse
+import gc
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Tuple
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import preprocess_permissions_v2 as v2  # noqa: E402
+from bench_pipeline import (  # noqa: E402
+    USER_SHEETS,
+    allocate_users,
+    level_sheets,
+    make_model,
+    parse_count,
+    role_menu_sheet,
+    user_frame,
+)
+from normalize_vec import carry_canonical, concat_canonical  # noqa: E402
+from stage_profiler import new_stage_profiler, stage  # noqa: E402
+
+
+def make_team_all(model: Dict, n_users: int) -> pd.DataFrame:
+    """권한별 임직원 시트 5개 -> to_team_priv_format -> union (main 의 convert/union 과 같은 형태)"""
+    c = v2.CONFIG["cols_a_user"]
+    counts = allocate_users(n_users)
+    frames = []
+    for key, _, sys_name, kind in USER_SHEETS:
+        df, _, _ = user_frame(model, sys_name, kind, counts[key])
+        frames.append(v2.to_team_priv_format(
+            df, key, sys_name, c["dept_name"][0], c["dept_code"][0], c["role_code"][0], c["role_name"][0],
+            c["desc"][0], c["start_date"][0], c["end_date"][0],
+        ))
+    return concat_canonical(frames, ignore_index=True)
+
+
+def legacy_expand(df_team: pd.DataFrame, df_role_menu: pd.DataFrame, b_ias: pd.DataFrame, b_sap: pd.DataFrame) -> pd.DataFrame:
+    """(기준선) 사용자 행 그대로 역할별 메뉴와 1:N merge -> 레벨 매핑"""
+    rm2 = v2.normalize_role_menu_sheet(df_role_menu)
+    out = carry_canonical(df_team.merge(rm2, how="left", on="auth_name"), df_team)
+    out, _ = v2.apply_level_mapping(out, b_ias, b_sap)
+    return out
+
+
+def lookup_expand(df_team: pd.DataFrame, df_role_menu: pd.DataFrame, b_ias: pd.DataFrame, b_sap: pd.DataFrame) -> pd.DataFrame:
+    roles, lookup, _, _ = v2.expand_role_menu_mapping(df_team, df_role_menu)
+    lookup, _ = v2.apply_level_mapping(lookup, b_ias, b_sap)
+    return v2.materialize_role_menus(roles, lookup)
+
+
+def legacy_sheets(df_team: pd.DataFrame, df_role_menu: pd.DataFrame, b_ias: pd.DataFrame, b_sap: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """(기준선) 결과 엑셀의 메뉴매핑 시트 / 로그 시트"""
+    rm2 = v2.normalize_role_menu_sheet(df_role_menu)
+    out = carry_canonical(df_team.merge(rm2, how="left", on="auth_name"), df_team)
+    fail = out.loc[v2.norm_text_series(out["menu_id"]).eq(""), ["sys_code", "team_code", "team_name", "auth_code", "auth_name"]].copy()
+    fail["issue"] = "role_menu mapping fail (auth_name not found)"
+    out, fail_level = v2.apply_level_mapping(out, b_ias, b_sap)
+    return out, pd.concat([fail, fail_level], ignore_index=True)
+
+
+def lookup_sheets(df_team: pd.DataFrame, df_role_menu: pd.DataFrame, b_ias: pd.DataFrame, b_sap: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """main 과 같은 순서: 조회표 -> 레벨 매핑 -> 사용자 행에 다시 붙임"""
+    _, lookup, user_refs, fail = v2.expand_role_menu_mapping(df_team, df_role_menu)
+    lookup, _ = v2.apply_level_mapping(lookup, b_ias, b_sap)
+    fail_level = v2.user_level_fail(df_team, user_refs, lookup)
+    return v2.user_role_menus(df_team, user_refs, lookup), pd.concat([fail, fail_level], ignore_index=True)
+
+
+def same_sheet(a: pd.DataFrame, b: pd.DataFrame) -> bool:
+    """엑셀에 쓰이는 값 기준 비교 (category / object 차이는 무시)"""
+    if list(a.columns) != list(b.columns) or a.shape != b.shape:
+        return False
+    return bool((a.astype(object).astype(str).to_numpy() == b.astype(object).astype(str).to_numpy()).all())
+
+
+def outputs_of(df: pd.DataFrame) -> Dict:
+    """main 의 to_outputs 단계와 같은 분할 (IAS-like / SAP / 기타) + merge"""
+    ias_like = ["IAS", "LEGO", v2.CONFIG["constants"]["IAS_SYS_NAME_FORCED"]]
+    out = v2.to_outputs(df[df["sys_code"].isin(ias_like)].copy(), is_sap=False)
+    out = v2.merge_outputs_append_only(out, v2.to_outputs(df[df["sys_code"] == "SAP"].copy(), is_sap=True))
+    df_other = df[~df["sys_code"].isin(ias_like + ["SAP"])].copy()
+    if len(df_other) > 0:
+        out = v2.merge_outputs_append_only(out, v2.to_outputs(df_other, is_sap=False))
+    return out
+
+
+def run(name: str, fn, df_team: pd.DataFrame, sheets: Tuple) -> Tuple[Dict, str]:
+    prof = new_stage_profiler()
+    with stage(prof, "expand", rows_in=len(df_team)) as st:
+        df = fn(df_team, *sheets)
+        st["rows_out"] = len(df)
+    frame_mb = df.memory_usage(deep=True).sum() / (1024 * 1024)
+    with stage(prof, "to_outputs", rows_in=len(df)):
+        outputs = outputs_of(df)
+    del df
+    gc.collect()
+    ex, to = prof["stages"]
+    res = {
+        "rows": ex["rows_out"],
+        "frame_mb": round(frame_mb, 1),
+        "expand_s": ex["wall_s"],
+        "expand_rss_mb": round(ex["rss_peak_mb"] - ex["rss_start_mb"], 1) if ex["rss_peak_mb"] is not None else None,
+        "to_outputs_s": to["wall_s"],
+        "bundles": sum(len(v) for v in outputs["bundles_by_team"].values()),
+    }
+    print(f"[EXPAND] {name:<7} rows={res['rows']:>11,} frame={res['frame_mb']:>9.1f}MB rss+={res['expand_rss_mb']}MB "
+          f"expand={res['expand_s']:.2f}s to_outputs={res['to_outputs_s']:.2f}s bundles={res['bundles']:,}")
+    return res, json.dumps(outputs, ensure_ascii=False, sort_keys=True)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="역할->메뉴 확장 방식 비교 (행 수 / 메모리)")
+    ap.add_argument("--users", default="200k", help="사용자 행 수 (k/M 접미사)")
+    ap.add_argument("--teams", default="2000", help="팀 수 (k/M 접미사)")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    n_users, n_teams = parse_count(args.users), parse_count(args.teams)
+    t0 = time.perf_counter()
+    model = make_model(n_teams, args.seed)
+    sheets = (role_menu_sheet(model), *level_sheets(model))
+    df_team = make_team_all(model, n_users)
+    print(f"[EXPAND] synthetic org users={n_users:,} teams={n_teams:,} team_all rows={len(df_team):,} "
+          f"role_menu rows={len(sheets[0]):,} ({time.perf_counter() - t0:.1f}s)")
+
+    # 조회표 방식을 먼저 (기준선의 큰 프레임이 RSS 기준점을 올리지 않게)
+    new, new_json = run("lookup", lookup_expand, df_team, sheets)
+    old, old_json = run("legacy", legacy_expand, df_team, sheets)
+
+    print(f"[EXPAND] rows x{old['rows'] / max(new['rows'], 1):.1f} fewer, frame x{old['frame_mb'] / max(new['frame_mb'], 1e-9):.1f} smaller, "
+          f"expand+to_outputs {old['expand_s'] + old['to_outputs_s']:.2f}s -> {new['expand_s'] + new['to_outputs_s']:.2f}s")
+    if new_json != old_json:
+        print("❌ to_outputs 결과 불일치")
+        return 1
+
+    new_sheet, new_log = lookup_sheets(df_team, *sheets)
+    old_sheet, old_log = legacy_sheets(df_team, *sheets)
+    print(f"[EXPAND] sheet2 rows={len(new_sheet):,} cols={new_sheet.shape[1]} log rows={len(new_log):,}")
+    if not (same_sheet(new_sheet, old_sheet) and same_sheet(new_log, old_log)):
+        print(f"❌ 결과 엑셀 시트 불일치 (sheet2 {old_sheet.shape} vs {new_sheet.shape}, log {old_log.shape} vs {new_log.shape})")
+        return 1
+    print("✅ 완료 (to_outputs / 메뉴매핑 / 로그 시트 동일)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""
+SAP 역할설명(auth_desc) 생성 벤치마크: 기존 행 단위 apply vs 조인 기반
+
+- 합성 SAP 시트(기본 1,000,000행)로 두 구현의 실행 시간 비교
+- v2 fill_sap_auth_desc_from_tcode / v1 normalize_df(is_sap=True) 결과가
+  기존 구현(groupby.apply + df.apply(axis=1))과 완전히 같은지 확인, 다르면 exit 1
+
+사용: python scripts/bench_sap_desc.py [행 수]
+"""
+
+import sys
+import time
+from pathlib import Path
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import preprocess_permissions as v1  # noqa: E402
+import preprocess_permissions_v2 as v2  # noqa: E402
+
+TOPN = 3
+
+
+# =========================
+# 합성 데이터
+# =========================
+def make_sheets(rows: int, seed: int = 0) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """(SAP 사용자 권한 행, 역할-T코드 행)"""
+    rng = np.random.default_rng(seed)
+    n_roles = max(rows // 50, 1)
+    n_menus = 5000
+    roles = np.array([f"ZC_ROLE_{i:06d}" for i in range(n_roles)], dtype=object)
+    menus = np.array([f"메뉴 {i} " if i % 7 else f"메뉴 {i}\r\n" for i in range(n_menus)], dtype=object)
+
+    tc_role = roles[rng.integers(0, n_roles, rows)]
+    tc_menu = menus[rng.integers(0, n_menus, rows)]
+    tc_menu[rng.random(rows) < 0.05] = np.nan  # 메뉴명이 빈 행 -> 역할명으로 대체
+    df_tcode = pd.DataFrame({
+        "역할": tc_role,
+        "역할명": [f"역할 {r[-6:]}" for r in tc_role],
+        "T코드명": tc_menu,
+    })
+
+    team_rows = rows // 5
+    auth = roles[rng.integers(0, n_roles + n_roles // 10, team_rows) % n_roles]
+    desc = np.where(rng.random(team_rows) < 0.3, "기존 설명", "")
+    df_team = pd.DataFrame({
+        "team_code": [f"{i % 300:05d}" for i in range(team_rows)],
+        "sys_code": "SAP",
+        "auth_code": auth,
+        "auth_desc": desc.astype(object),
+    })
+    return df_team, df_tcode
+
+
+# =========================
+# 기존 구현 (비교 기준)
+# =========================
+def legacy_fill_v2(df_team: pd.DataFrame, df_tcode: pd.DataFrame) -> pd.DataFrame:
+    t = df_tcode.copy()
+    t["auth_code"] = t["역할"].map(v2.norm_code)
+    t["role_name"] = t["역할명"].map(v2.norm_text)
+    t["menu_name"] = t["T코드명"].map(v2.norm_text)
+    t.loc[t["menu_name"] == "", "menu_name"] = t.loc[t["menu_name"] == "", "role_name"]
+    role_desc_map = (
+        t.groupby("auth_code")["menu_name"]
+         .apply(lambda s: v2.build_sap_role_desc(s.tolist(), topn=TOPN))
+         .to_dict()
+    )
+    df = df_team.copy()
+
+    def _fill(row):
+        cur = v2.norm_text(row.get("auth_desc", ""))
+        if cur:
+            return cur
+        return role_desc_map.get(v2.norm_code(row.get("auth_code", "")), "")
+
+    df["auth_desc"] = df.apply(_fill, axis=1)
+    return df
+
+
+def legacy_fill_v1(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.copy()
+    sap_desc_map = (
+        df.groupby(["team_code", "sys_code", "auth_code"])["3level"]
+          .apply(lambda s: v1.build_sap_auth_desc(s.tolist(), topn=TOPN))
+          .to_dict()
+    )
+
+    def fill_sap_desc(row):
+        if row["auth_desc"].strip():
+            return row["auth_desc"]
+        return sap_desc_map.get((row["team_code"], row["sys_code"], row["auth_code"]), "")
+
+    df["auth_desc"] = df.apply(fill_sap_desc, axis=1)
+    return df
+
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    out = fn(*args)
+    return out, time.perf_counter() - t0
+
+
+def main() -> int:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    df_team, df_tcode = make_sheets(rows)
+    print(f"[BENCH] SAP tcode rows={len(df_tcode):,} team rows={len(df_team):,}")
+    failed = 0
+
+    # v2: 역할-T코드 시트 -> 팀 권한 행 auth_desc
+    old, t_old = timed(legacy_fill_v2, df_team, df_tcode)
+    (new, _), t_new = timed(v2.fill_sap_auth_desc_from_tcode, df_team, df_tcode, "역할", "역할명", "T코드명", TOPN)
+    ok = new["auth_desc"].tolist() == old["auth_desc"].tolist()
+    failed += not ok
+    print(f"[BENCH] v2 fill_sap_auth_desc_from_tcode: apply={t_old:.2f}s join={t_new:.2f}s (x{t_old / max(t_new, 1e-9):.1f}) same={ok}")
+
+    # v1: 정규화된 SAP 시트(팀/시스템/권한별 3level)
+    df1 = pd.DataFrame({
+        "team_code": np.resize(df_team["team_code"].to_numpy(), rows),
+        "sys_code": "SAP",
+        "auth_code": df_tcode["역할"].to_numpy(),
+        "auth_desc": np.where(np.arange(rows) % 4 == 0, "기존 설명", "").astype(object),
+        "3level": df_tcode["T코드명"].map(v1.norm_text).to_numpy(),
+    })
+    old1, t_old1 = timed(legacy_fill_v1, df1)
+
+    def _new_v1(df):
+        df = df.copy()
+        df["auth_desc"] = v1.fill_sap_auth_desc(df)
+        return df
+
+    new1, t_new1 = timed(_new_v1, df1)
+    ok1 = new1["auth_desc"].tolist() == old1["auth_desc"].tolist()
+    failed += not ok1
+    print(f"[BENCH] v1 normalize_df SAP desc:         apply={t_old1:.2f}s join={t_new1:.2f}s (x{t_old1 / max(t_new1, 1e-9):.1f}) same={ok1}")
+
+    if failed:
+        print("❌ 결과 불일치")
+        return 1
+    print("✅ 결과 동일")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,338 @@
+# -*- coding: utf-8 -*-
+"""
+서버 측 조회용 바이너리 번들 (columnar, mmap 읽기)
+
+- by_team/*.jsonl 과 같은 내용(팀 -> 시스템 -> 권한 -> 메뉴)을 고정폭 u32 테이블 + 문자열 풀로 기록
+- 리더는 파일을 mmap 하고 테이블을 memoryview.cast("I") 로 그대로 봄 -> 열 때 파싱/복사 없음
+  조회 시에는 필요한 문자열만 풀에서 잘라 decode
+- 팀 테이블은 team_code(UTF-8 바이트) 오름차순 -> 이진 탐색
+
+파일 구조 (little-endian, 섹션은 8바이트 정렬)
+- header : magic "PRMB", version(u32), 개수 6개(u32: strings, teams, systems, roles, menus, refs),
+           섹션 오프셋 7개(u64: str_offsets, str_blob, teams, systems, roles, menus, refs)
+- str_offsets : u32[strings + 1]  (i번째 문자열 = blob[off[i]:off[i+1]])
+- teams   : u32[teams * 4]   (team_code, team_name, sys_start, sys_count)
+- systems : u32[systems * 4] (sys_code, sys_name, role_start, role_count)
+- roles   : u32[roles * 7]   (auth_code, auth_name, auth_desc, team_name, sys_name, ref_start, ref_count)
+            (같은 팀/시스템이라도 번들마다 team_name/sys_name이 다를 수 있어 권한 단위로도 보관)
+- menus   : u32[menus * 2]   (path, menu_id)   ((path, menu_id) 중복 제거)
+- refs    : u32[refs]        (권한별 메뉴 번호, 번들 menus 순서 그대로)
+
+사용: python scripts/binary_bundle.py <out_base> [출력 파일]   (기존 산출물에서 바로 생성)
+"""
+
+import mmap
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+BINARY_BUNDLE_FILE = "permissions.bin"
+BINARY_MAGIC = b"PRMB"
+BINARY_VERSION = 1
+
+_HEADER = struct.Struct("<4sI6I7Q")
+_TEAM_W, _SYS_W, _ROLE_W, _MENU_W = 4, 4, 7, 2
+
+
+# =========================
+# 쓰기 (new -> add -> bytes)
+# =========================
+def new_binary_bundle() -> Dict:
+    return {
+        "strings": {},  # str -> id (삽입 순서 = id)
+        "teams": [],    # (team_code, team_code_id, team_name_id, sys_start, sys_count)
+        "systems": array("I"),
+        "roles": array("I"),
+        "menus": {},    # (path_id, menu_id_id) -> 메뉴 번호
+        "refs": array("I"),
+    }
+
+
+def _sid(state: Dict, s) -> int:
+    s = "" if s is None else str(s)
+    strings = state["strings"]
+    i = strings.get(s)
+    if i is None:
+        i = strings[s] = len(strings)
+    return i
+
+
+def add_binary_team(state: Dict, team_code: str, team_name: str, rows: Iterable[Dict]):
+    """
+    팀 하나분 번들(rows: menus 복원 상태, by_team jsonl 순서)을 추가.
+    시스템은 rows에서 처음 나온 순서, 권한은 rows 순서 그대로
+    """
+    by_sys: Dict[str, List[Dict]] = {}
+    for row in rows:
+        by_sys.setdefault(str(row.get("sys_code", "") or ""), []).append(row)
+
+    sys_start = len(state["systems"]) // _SYS_W
+    for sys_code, sys_rows in by_sys.items():
+        role_start = len(state["roles"]) // _ROLE_W
+        for row in sys_rows:
+            ref_start = len(state["refs"])
+            for m in row.get("menus", []) or []:
+                key = (_sid(state, m.get("path", "")), _sid(state, m.get("menu_id", "")))
+                state["refs"].append(state["menus"].setdefault(key, len(state["menus"])))
+            state["roles"].extend((
+                _sid(state, row.get("auth_code", "")),
+                _sid(state, row.get("auth_name", "")),
+                _sid(state, row.get("auth_desc", "")),
+                _sid(state, row.get("team_name", "")),
+                _sid(state, row.get("sys_name", "")),
+                ref_start,
+                len(state["refs"]) - ref_start,
+            ))
+        sys_name = next((r.get("sys_name") for r in sys_rows if r.get("sys_name")), "")
+        state["systems"].extend((_sid(state, sys_code), _sid(state, sys_name), role_start, len(sys_rows)))
+    state["teams"].append((str(team_code), _sid(state, team_code), _sid(state, team_name), sys_start, len(by_sys)))
+
+
+def _pad8(buf: bytearray):
+    buf.extend(b"\0" * (-len(buf) % 8))
+
+
+def binary_bundle_bytes(state: Dict) -> bytes:
+    # 팀 범위(sys_start/sys_count)는 팀마다 독립 -> 팀 테이블만 정렬해도 됨
+    teams = array("I")
+    for team in sorted(state["teams"], key=lambda t: t[0].encode("utf-8")):
+        teams.extend(team[1:])
+
+    blob = bytearray()
+    offsets = array("I", [0])
+    for s in state["strings"]:
+        blob += s.encode("utf-8")
+        offsets.append(len(blob))
+    menus = array("I")
+    for path_id, menu_id in state["menus"]:  # dict 삽입 순서 = 메뉴 번호
+        menus.extend((path_id, menu_id))
+
+    sections = [offsets, bytes(blob), teams, state["systems"], state["roles"], menus, state["refs"]]
+    if sys.byteorder != "little":
+        for sec in sections:
+            if isinstance(sec, array):
+                sec.byteswap()
+
+    out = bytearray(_HEADER.size)
+    _pad8(out)
+    section_offsets = []
+    for sec in sections:
+        section_offsets.append(len(out))
+        out += sec.tobytes() if isinstance(sec, array) else sec
+        _pad8(out)
+    _HEADER.pack_into(
+        out, 0, BINARY_MAGIC, BINARY_VERSION,
+        len(offsets) - 1, len(teams) // _TEAM_W, len(state["systems"]) // _SYS_W,
+        len(state["roles"]) // _ROLE_W, len(menus) // _MENU_W, len(state["refs"]),
+        *section_offsets,
+    )
+    return bytes(out)
+
+
+# =========================
+# 읽기 (mmap)
+# =========================
+class BinaryBundle:
+    """
+    with BinaryBundle(path) as bb:
+        bb.systems("00123") / bb.roles("00123", "SAP") / bb.menus("00123", "SAP", "ZC_FI_01")
+    """
+
+    def __init__(self, path: Path):
+        if sys.byteorder != "little":
+            raise ValueError("BinaryBundle: little-endian 환경에서만 mmap 직접 읽기 가능")
+        self.path = Path(path)
+        self._f = self.path.open("rb")
+        self._mm = mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._buf = memoryview(self._mm)
+
+        magic, version, *rest = _HEADER.unpack_from(self._buf, 0)
+        if magic != BINARY_MAGIC or version != BINARY_VERSION:
+            self.close()
+            raise ValueError(f"BinaryBundle: 형식이 다름 ({self.path}, magic={magic!r}, version={version})")
+        n_str, n_team, n_sys, n_role, n_menu, n_ref = rest[:6]
+        o_off, o_blob, o_team, o_sys, o_role, o_menu, o_ref = rest[6:]
+        self.counts = {"strings": n_str, "teams": n_team, "systems": n_sys, "roles": n_role, "menus": n_menu, "refs": n_ref}
+
+        def u32(offset: int, n: int) -> memoryview:
+            return self._buf[offset:offset + 4 * n].cast("I")
+
+        self._str_off = u32(o_off, n_str + 1)
+        self._blob = self._buf[o_blob:o_blob + self._str_off[n_str]]
+        self._teams = u32(o_team, n_team * _TEAM_W)
+        self._sys = u32(o_sys, n_sys * _SYS_W)
+        self._roles = u32(o_role, n_role * _ROLE_W)
+        self._menus = u32(o_menu, n_menu * _MENU_W)
+        self._refs = u32(o_ref, n_ref)
+
+    # --- 자원 정리 (memoryview를 먼저 놓아야 mmap을 닫을 수 있음)
+    def close(self):
+        for name in ("_refs", "_menus", "_roles", "_sys", "_teams", "_blob", "_str_off", "_buf"):
+            view = self.__dict__.pop(name, None)
+            if view is not None:
+                view.release()
+        if getattr(self, "_mm", None) is not None:
+            self._mm.close()
+            self._mm = None
+        if getattr(self, "_f", None) is not None:
+            self._f.close()
+            self._f = None
+
+    def __enter__(self) -> "BinaryBundle":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # --- 문자열 풀
+    def _raw(self, i: int) -> memoryview:
+        return self._blob[self._str_off[i]:self._str_off[i + 1]]
+
+    def string(self, i: int) -> str:
+        return str(self._raw(i), "utf-8")
+
+    # --- 팀
+    def team_count(self) -> int:
+        return self.counts["teams"]
+
+    def team_codes(self) -> List[str]:
+        return [self.string(self._teams[t * _TEAM_W]) for t in range(self.counts["teams"])]
+
+    def _team(self, team_code: str) -> Optional[int]:
+        key = str(team_code).encode("utf-8")
+        lo, hi = 0, self.counts["teams"]
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if bytes(self._raw(self._teams[mid * _TEAM_W])) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.counts["teams"] and self._raw(self._teams[lo * _TEAM_W]) == key:
+            return lo
+        return None
+
+    def team_name(self, team_code: str) -> Optional[str]:
+        t = self._team(team_code)
+        return None if t is None else self.string(self._teams[t * _TEAM_W + 1])
+
+    # --- 시스템 / 권한 / 메뉴
+    def _sys_range(self, team_code: str) -> range:
+        t = self._team(team_code)
+        if t is None:
+            return range(0)
+        start, count = self._teams[t * _TEAM_W + 2], self._teams[t * _TEAM_W + 3]
+        return range(start, start + count)
+
+    def _find_sys(self, team_code: str, sys_code: str) -> Optional[int]:
+        key = str(sys_code).encode("utf-8")
+        for s in self._sys_range(team_code):
+            if self._raw(self._sys[s * _SYS_W]) == key:
+                return s
+        return None
+
+    def _role_range(self, s: int) -> range:
+        start, count = self._sys[s * _SYS_W + 2], self._sys[s * _SYS_W + 3]
+        return range(start, start + count)
+
+    def systems(self, team_code: str) -> List[Dict[str, str]]:
+        return [
+            {"sys_code": self.string(self._sys[s * _SYS_W]), "sys_name": self.string(self._sys[s * _SYS_W + 1])}
+            for s in self._sys_range(team_code)
+        ]
+
+    def _role_dict(self, r: int) -> Dict[str, str]:
+        base = r * _ROLE_W
+        return {
+            "auth_code": self.string(self._roles[base]),
+            "auth_name": self.string(self._roles[base + 1]),
+            "auth_desc": self.string(self._roles[base + 2]),
+        }
+
+    def roles(self, team_code: str, sys_code: Optional[str] = None) -> List[Dict[str, str]]:
+        """sys_code=None이면 팀 전체 권한(각 항목에 sys_code 포함)"""
+        if sys_code is not None:
+            s = self._find_sys(team_code, sys_code)
+            return [] if s is None else [self._role_dict(r) for r in self._role_range(s)]
+        out = []
+        for s in self._sys_range(team_code):
+            sc = self.string(self._sys[s * _SYS_W])
+            out.extend(dict(self._role_dict(r), sys_code=sc) for r in self._role_range(s))
+        return out
+
+    def _menus_of(self, r: int) -> List[Dict[str, str]]:
+        start, count = self._roles[r * _ROLE_W + 5], self._roles[r * _ROLE_W + 6]
+        return [self.menu(i) for i in self._refs[start:start + count]]
+
+    def _find_role(self, team_code: str, sys_code: str, auth_code: str) -> Optional[int]:
+        s = self._find_sys(team_code, sys_code)
+        if s is None:
+            return None
+        key = str(auth_code).encode("utf-8")
+        for r in self._role_range(s):
+            if self._raw(self._roles[r * _ROLE_W]) == key:
+                return r
+        return None
+
+    def menu_refs(self, team_code: str, sys_code: str, auth_code: str) -> memoryview:
+        """권한의 메뉴 번호 u32 뷰(복사 없음). menu(i)로 필요한 것만 꺼냄"""
+        r = self._find_role(team_code, sys_code, auth_code)
+        if r is None:
+            return self._refs[0:0]
+        start, count = self._roles[r * _ROLE_W + 5], self._roles[r * _ROLE_W + 6]
+        return self._refs[start:start + count]
+
+    def menu(self, i: int) -> Dict[str, str]:
+        return {"path": self.string(self._menus[i * _MENU_W]), "menu_id": self.string(self._menus[i * _MENU_W + 1])}
+
+    def menus(self, team_code: str, sys_code: str, auth_code: str) -> List[Dict[str, str]]:
+        r = self._find_role(team_code, sys_code, auth_code)
+        return [] if r is None else self._menus_of(r)
+
+    def team_bundles(self, team_code: str) -> List[Dict]:
+        """by_team jsonl 한 파일과 같은 번들 목록 (검증/벤치마크용)"""
+        out = []
+        for s in self._sys_range(team_code):
+            sys_code = self.string(self._sys[s * _SYS_W])
+            for r in self._role_range(s):
+                out.append(dict(
+                    {"team_code": team_code, "team_name": self.string(self._roles[r * _ROLE_W + 3]),
+                     "sys_code": sys_code, "sys_name": self.string(self._roles[r * _ROLE_W + 4])},
+                    **self._role_dict(r), menus=self._menus_of(r),
+                ))
+        return out
+
+
+# =========================
+# 기존 산출물 -> 바이너리 번들
+# =========================
+def build_from_out_base(out_base: Path) -> Tuple[bytes, int]:
+    """by_team(+ menu_catalog / by_role 형식 포함) -> (바이너리, 팀 수)"""
+    import preprocess_permissions_v2 as v2  # 파이프라인 없이 리더만 쓸 때는 pandas를 올리지 않음
+
+    out_base = Path(out_base)
+    catalog = v2.load_menu_catalog(out_base)
+    state = new_binary_bundle()
+    files = v2.list_old_team_files(out_base / "by_team")
+    for tc in sorted(files):
+        rows = v2.sorted_team_rows(v2.load_team_bundles(tc, files[tc], out_base / v2.BY_ROLE_DIR, catalog))
+        add_binary_team(state, tc, next((r.get("team_name") for r in rows if r.get("team_name")), ""), rows)
+    return binary_bundle_bytes(state), len(files)
+
+
+def main() -> int:
+    if len(sys.argv) < 2:
+        print("사용: python scripts/binary_bundle.py <out_base> [출력 파일]")
+        return 2
+    out_base = Path(sys.argv[1])
+    dst = Path(sys.argv[2]) if len(sys.argv) > 2 else out_base / BINARY_BUNDLE_FILE
+    data, n_teams = build_from_out_base(out_base)
+    dst.write_bytes(data)
+    with BinaryBundle(dst) as bb:
+        print(f"[BIN] {dst} ({len(data) / 1024:.1f}KB) teams={n_teams} " + " ".join(f"{k}={v}" for k, v in bb.counts.items()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""
+menu_tree / menu_order 정렬(파이썬 localeCompare 근사) == services/menuTree.ts 정렬 규칙 검증용 fixture
+
+- 기호 / 숫자 / 영문 대소문자 / 악센트 / 한글 / '기타'(빈 값, null) 이 섞인 이름으로
+  label_sort_key(L1/L2) 와 collate_key(L3 메뉴) 순서를 만들고, build_menu_tree 결과가 같은 순서인지 확인
+- 같은 방식으로 메뉴 목록(path, menu_id)의 build_menu_order 순서 (menu_id 목록)
+- 그 순서를 services/menuTree.fixture.json 과 비교 -> services/menuTree.test.ts 가 같은 fixture를
+  브라우저 규칙(localeCompare)으로 정렬해 비교 (npm test)
+- 다르면 exit 1. 규칙을 바꿨으면 --write 로 fixture 갱신 후 npm test 로 브라우저 쪽도 확인
+
+사용: python scripts/check_menu_tree_order.py [--write]
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from menu_tree import build_menu_order, build_menu_tree, collate_key, label_sort_key, ui_clean, ui_normalize  # noqa: E402
+
+FIXTURE = Path(__file__).resolve().parent.parent / "services" / "menuTree.fixture.json"
+
+LABELS = [
+    "기타", "", "null", "가격관리", "가 격", "(구)정산", "[공통]코드", "_임시", "-대기", "1차 결재", "10차 결재", "2차 결재",
+    "A/S 관리", "a/s 관리", "관리자", "관리 자", "관리(신규)", "관리-신규", "관리_신규", "관리2", "관리10", "관리A", "관리a",
+    "#태그", "@멘션", "※참고", "ㄱ목록", "가나다", "나다라", "하", "힣", "+추가", "~물결", "*별", "&앰퍼", "%퍼센트", "$달러",
+    "ABC", "abc", "Abc", "B2B 주문", "b2c", "z-test", "Z_test", "Zeta", "éclair", "eclair", "Admin", "admin_", "admin-",
+    "admin.", "admin 1", "3D", "3d", "ERP", "erp", "ERP2", "ERP 10", "Report(old)", "Report-old", "Report_old", "report",
+]
+
+# L3 메뉴명 (트리에는 한글이 있는 메뉴만 들어감)
+ITEMS = [
+    "목록", "목록 조회", "목록(엑셀)", "목록_엑셀", "목록-엑셀", "1월 목록", "12월 목록", "2월 목록", "A목록", "a목록", "B2B 목록",
+    "[공통] 목록", "(구) 목록", "※ 목록", "결재", "결재함", "결재 2", "결재 10", "Admin 관리", "admin 관리", "éclair 관리",
+]
+
+# menu_order 용 메뉴 [path, menu_id] (빈 레벨 / null / 영문 / 숫자 / 중복 menu_id / 같은 path 포함)
+MENUS = [
+    ["영업 > 견적 > 견적 등록", "S01"], ["영업 > 견적 > 견적 조회", "S02"], ["영업 > 견적", "S03"],
+    ["영업 > > 견적 현황", "S04"], ["null > 영업 > 주문", "S05"], [" > 영업 > 출고", "S06"],
+    ["영업 > 견적 > 견적 등록", "S07"], ["영업 > 견적 > 견적 조회(구)", "S02"], ["관리 > 10차 > 결재", "A10"],
+    ["관리 > 2차 > 결재", "A02"], ["관리 > A/S > 접수", "A20"], ["Report > Sales > Daily", "R01"],
+    ["report > sales > daily", "R02"], ["Report > Sales", "R03"], ["Admin > User > List", "ADM"],
+    ["éclair > Menu > List", "E01"], ["eclair > Menu > List", "E02"], ["SAP > ZC_FI_01", "조회"],
+    ["", "X01"], ["null", "X02"], ["영업 > 견적 > 견적 등록", ""], ["기타 > 기타 > 견적", "X03"],
+]
+
+
+def expected_orders() -> Dict[str, List[str]]:
+    menus = [{"path": p, "menu_id": m} for p, m in MENUS]
+    return {
+        "label_order": sorted(LABELS, key=label_sort_key),
+        "item_order": sorted(ITEMS, key=lambda s: collate_key(ui_clean(s))),
+        "menu_order": [ui_clean(menus[i]["menu_id"]) for i in build_menu_order(menus)],
+    }
+
+
+def tree_errors() -> List[str]:
+    """build_menu_tree 의 L1 / L2 / L3 순서가 label_sort_key / collate_key 와 같은지"""
+    errors = []
+    l1_menus = [{"menu_id": f"l1.{i}", "path": f"{label} > 공통 > 메뉴"} for i, label in enumerate(LABELS)]
+    l1 = [node[0] for node in build_menu_tree(l1_menus)]
+    if l1 != sorted(l1, key=label_sort_key):
+        errors.append(f"L1 순서: {l1}")
+
+    l2_menus = [{"menu_id": f"l2.{i}", "path": f"공통 > {label} > 메뉴"} for i, label in enumerate(LABELS)]
+    l2 = [node[0] for node in build_menu_tree(l2_menus)[0][1]]
+    if l2 != sorted(l2, key=label_sort_key):
+        errors.append(f"L2 순서: {l2}")
+
+    l3_menus = [{"menu_id": f"l3.{i}", "path": f"공통 > 공통 > {item}"} for i, item in enumerate(ITEMS)]
+    positions = build_menu_tree(l3_menus)[0][1][0][1]
+    l3 = [ITEMS[i] for i in positions]
+    # 정규화(소문자 + 공백 제거) 기준 중복은 트리에서 첫 항목만 남음
+    first = {}
+    for item in ITEMS:
+        first.setdefault(ui_normalize(item), item)
+    if l3 != sorted(first.values(), key=lambda s: collate_key(ui_clean(s))):
+        errors.append(f"L3 순서: {l3}")
+    return errors
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="menu_tree / menu_order 정렬 fixture 검증 / 갱신")
+    ap.add_argument("--write", action="store_true", help=f"fixture 다시 쓰기 ({FIXTURE.name})")
+    args = ap.parse_args()
+
+    errors = tree_errors()
+    for e in errors:
+        print(f"[FAIL] build_menu_tree {e}")
+
+    doc = {"labels": LABELS, "items": ITEMS, "menus": MENUS, **expected_orders()}
+    if args.write:
+        FIXTURE.write_text(json.dumps(doc, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+        print(f"[MENU_TREE] fixture written: {FIXTURE}")
+    else:
+        try:
+            current = json.loads(FIXTURE.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            current = None
+        if current != doc:
+            errors.append("fixture")
+            print(f"[FAIL] {FIXTURE.name} 가 현재 규칙과 다름 (--write 로 갱신 후 npm test 로 브라우저 순서 확인)")
+
+    print(f"[MENU_TREE] labels={len(LABELS)} items={len(ITEMS)} menus={len(MENUS)}")
+    if errors:
+        print("❌ menu_tree 정렬 검증 실패")
+        return 1
+    print("✅ 완료")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""
+normalize_vec(벡터화) == preprocess_permissions_v2(스칼라) 동등성 검증
+
+- 입력: public/data 의 실제 값(팀/시스템/권한/메뉴 코드·이름·설명·경로)
+        + 엑셀에서 들어올 수 있는 타입 경계값(float .0, 선행0, NaN/NaT, bool, 개행 등)
+- 각 값을 object / 원래 dtype 컬럼으로 만들어 Series.map(norm_*) 결과와 비교
+- 하나라도 다르면 exit 1
+
+사용: python scripts/check_normalize_equivalence.py [public/data 경로]
+"""
+
+import json
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from preprocess_permissions_v2 import canon_team_code, norm_code, norm_text  # noqa: E402
+from normalize_vec import canon_team_code_series, norm_code_series, norm_text_series  # noqa: E402
+
+PAIRS = [
+    ("norm_text", norm_text, norm_text_series),
+    ("norm_code", norm_code, norm_code_series),
+    ("canon_team_code", canon_team_code, canon_team_code_series),
+]
+
+EDGE_VALUES = [
+    None, np.nan, pd.NaT, pd.NA, "", " ", "\t", "nan", "None",
+    1, 0, -5, 100440, True, False, np.int64(7), np.bool_(True),
+    1.0, 0.0, -0.0, 0.5, 3.14, 1e16, 1e20, -3.0, float("inf"), np.float64(2.0), np.float32(2.0),
+    "1.0", "001.0", "-12.0", "12.00", "0100440", "0100440.0", "000", "0", "0RULE_01", "0RULE_01.0",
+    " 3040101 ", "abc.0", "١٢٣", "١٢٣.0", "ROLE_RM_DASH", "ZC_FI_01",
+    "a\r\nb", "a \t\r\nb", "a\rb ", "  설명 \n 두번째줄  ", "줄끝공백   \n",
+    "ADMIN > ADMIN > Approval", " >  > ", "pjt.approval.knox",
+    pd.Timestamp("2024-01-01"), pd.Timestamp("2024-01-01 12:30:00"),
+]
+
+
+def collect_public_values(data_dir: Path) -> List:
+    vals = set()
+
+    def add(v):
+        if isinstance(v, str):
+            vals.add(v)
+
+    idx_teams = data_dir / "index_teams.json"
+    if idx_teams.exists():
+        for t in json.loads(idx_teams.read_text(encoding="utf-8")).get("teams", []):
+            add(t.get("team_code")); add(t.get("team_name"))
+    idx_sys = data_dir / "index_systems_by_team.json"
+    if idx_sys.exists():
+        for tc, lst in json.loads(idx_sys.read_text(encoding="utf-8")).items():
+            add(tc)
+            for s in lst:
+                add(s.get("sys_code")); add(s.get("sys_name"))
+    idx_roles = data_dir / "index_roles_by_team_sys.json"
+    if idx_roles.exists():
+        for key, lst in json.loads(idx_roles.read_text(encoding="utf-8")).items():
+            for part in key.split("|"):
+                add(part)
+            for r in lst:
+                add(r.get("auth_code")); add(r.get("auth_name")); add(r.get("auth_desc"))
+    for p in sorted((data_dir / "by_team").glob("role_bundle_team_*.jsonl")):
+        for line in p.read_text(encoding="utf-8").splitlines():
+            if not line.strip():
+                continue
+            b = json.loads(line)
+            for k in ["team_code", "team_name", "sys_code", "sys_name", "auth_code", "auth_name", "auth_desc"]:
+                add(b.get(k))
+            for m in b.get("menus", []) or []:
+                add(m.get("menu_id")); add(m.get("path"))
+                for lv in str(m.get("path", "")).split(">"):
+                    add(lv); add(lv.strip())
+    return sorted(vals)
+
+
+def series_variants(values: List) -> List[pd.Series]:
+    """같은 값을 엑셀 로딩 시 나올 수 있는 여러 dtype으로"""
+    out = [pd.Series(values, dtype=object, name="mixed")]
+    nums = [v for v in values if isinstance(v, (int, float, np.integer, np.floating)) and not isinstance(v, (bool, np.bool_))]
+    out.append(pd.Series([float(v) for v in nums] + [np.nan], dtype="float64", name="float"))
+    out.append(pd.Series([int(v) for v in nums if float(v).is_integer() and abs(float(v)) < 2 ** 62], dtype="int64", name="int"))
+    out.append(pd.Series([pd.Timestamp("2024-01-01"), pd.NaT, pd.Timestamp("2025-06-30 08:00")], name="datetime"))
+    strs = [v for v in values if isinstance(v, str)]
+    out.append(pd.Series(strs + [None, np.nan], dtype=object, name="str_with_na"))
+    # 셔플 + 반복(factorize codes 확장 경로 확인)
+    rng = np.random.default_rng(0)
+    rep = pd.Series(values * 3, dtype=object, name="repeated")
+    out.append(rep.iloc[rng.permutation(len(rep))].reset_index(drop=True))
+    # 인덱스가 RangeIndex가 아닌 경우
+    out.append(pd.Series(values, dtype=object, index=[f"r{i}" for i in range(len(values))], name="labeled"))
+    return out
+
+
+def main() -> int:
+    data_dir = Path(sys.argv[1]) if len(sys.argv) > 1 else Path(__file__).resolve().parent.parent / "public" / "data"
+    public_vals = collect_public_values(data_dir)
+    values = EDGE_VALUES + public_vals
+    print(f"[CHECK] values: public={len(public_vals)} edge={len(EDGE_VALUES)}")
+
+    failed = 0
+    for name, scalar_fn, vec_fn in PAIRS:
+        for s in series_variants(values):
+            expected = s.map(scalar_fn)
+            got = vec_fn(s)
+            if not (got.equals(expected) and got.dtype == expected.dtype and got.index.equals(expected.index) and got.name == expected.name):
+                diff = [(repr(s.iloc[i]), expected.iloc[i], got.iloc[i]) for i in range(len(s)) if expected.iloc[i] != got.iloc[i]]
+                print(f"[FAIL] {name} / {s.name}: {diff[:5]} (dtype {got.dtype} vs {expected.dtype})")
+                failed += 1
+            else:
+                print(f"[OK]   {name} / {s.name} (rows={len(s)})")
+
+    # 참고용 속도 비교(실데이터 값을 1M행으로 반복)
+    big = pd.Series(np.resize(np.array(public_vals or ["x"], dtype=object), 1_000_000), dtype=object)
+    for name, scalar_fn, vec_fn in PAIRS:
+        t0 = time.perf_counter(); big.map(scalar_fn); t1 = time.perf_counter()
+        vec_fn(big); t2 = time.perf_counter()
+        print(f"[BENCH] {name}: map={t1 - t0:.3f}s vec={t2 - t1:.3f}s (x{(t1 - t0) / max(t2 - t1, 1e-9):.1f})")
+
+    if failed:
+        print(f"❌ 불일치 {failed}건")
+        return 1
+    print("✅ 모든 케이스 동일")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
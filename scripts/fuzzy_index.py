@@ -0,0 +1,286 @@
+# -*- coding: utf-8 -*-
+"""
+메뉴/권한 이름 오타 교정 인덱스 (SymSpell 방식, 자모 단위)
+
+- 대상 어휘: 고유한 auth_name / 메뉴 3level 이름(path 마지막 레벨) / menu_id
+- 정규화: search_normalize(소문자 + 공백 제거 + NFC) -> 한글 음절을 초성/중성/종성 자모로 분해
+  ("비즈니스파트너목록" 과 "비즈니스 파트너 목록", "비즈니스파트너몽록" 이 자모 편집 거리 0 / 0 / 1)
+- SymSpell 삭제 사전: 자모 문자열 앞 prefix_length 글자에서 max_distance 개까지 지운 문자열 -> 어휘 id
+  질의도 같은 방식으로 지운 문자열을 만들어 사전에서 후보를 모은 뒤, 전체 자모 문자열의 편집 거리로 확인
+- 확인 전 거르기: 길이 차 > max_distance, 자모 2-gram 차집합 > 2 * max_distance
+  (편집 1번은 서로 다른 2-gram을 최대 2개 없앰 -> 거리 d 이내면 질의 2-gram 중 2d개 넘게 빠질 수 없음)
+- 순위: (편집 거리, 등장 권한 수 내림차순, 길이 차, 이름)
+- 질의당 작업량 제한
+  - 짧은 질의(자모 SHORT_QUERY_JAMO 글자 이하, 한글 2음절 정도)는 편집 거리 1까지만
+  - 후보를 (거리 하한, 순위 나머지) 순으로 확인. 하한 = max(길이 차, 빠진 질의 2-gram 수 / 2)
+  - top-k가 차면 k번째 결과로 상한을 좁힘: 같은 거리로는 순위 나머지(등장 수, 길이 차, 이름)가 앞설 때만
+    들어올 수 있으므로, 편집 거리 계산 전에 하한만으로 대부분 건너뜀 (결과는 전부 확인한 것과 같음)
+  - max_checks: 편집 거리 계산 수 상한 (하한 순 앞쪽부터). 기본 MAX_CHECKS=0 = 제한 없음 (선형 스캔과 같은 결과)
+    상한을 주면 지연은 줄지만 정확도를 잃음: 32 에서 오타 질의 3,000건 중 26 ~ 319건의 top-5가 제한 없는 결과와 다름
+    (어휘에 따라 다름). 제한 없어도 p99 < 1ms (bench 목표) 이므로 기본은 정확한 쪽
+    -> 바꾸기 전에 bench_fuzzy_index.py --max-checks N 으로 같은 top-k 비율 / 지연 확인
+
+산출물 (out_base/fuzzy/fuzzy_index.json)
+  {"version","max_distance","prefix_length",
+   "terms": [[표시 이름, 자모 문자열, [종류...], 등장 권한 수], ...],   (종류: "auth" | "menu" | "menu_id")
+   "deletes": {삭제 문자열: [term id, ...]}}
+"""
+
+import json
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from search_index import search_normalize
+
+FUZZY_DIR = "fuzzy"
+FUZZY_INDEX_FILE = "fuzzy_index.json"
+FUZZY_INDEX_VERSION = 1
+MAX_DISTANCE = 2
+PREFIX_LENGTH = 7
+SHORT_QUERY_JAMO = 6
+MAX_CHECKS = 0
+FUZZY_KINDS = ("auth", "menu", "menu_id")
+
+# 한글 음절 분해 (U+AC00 ~ U+D7A3), 호환 자모로 표기
+_HANGUL_BASE = 0xAC00
+_HANGUL_LAST = 0xD7A3
+_CHO = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_JUNG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+_JONG = " ㄱㄲㄳㄴㄵㄶㄷㄹㄺㄻㄼㄽㄾㄿㅀㅁㅂㅄㅅㅆㅇㅈㅊㅋㅌㅍㅎ"
+
+
+def jamo_decompose(text) -> str:
+    """search_normalize 후 한글 음절 -> 초성+중성(+종성). 그 외 글자는 그대로"""
+    out: List[str] = []
+    for ch in search_normalize(text):
+        code = ord(ch)
+        if _HANGUL_BASE <= code <= _HANGUL_LAST:
+            s = code - _HANGUL_BASE
+            out.append(_CHO[s // 588])
+            out.append(_JUNG[(s % 588) // 28])
+            if s % 28:
+                out.append(_JONG[s % 28])
+        else:
+            out.append(ch)
+    return unicodedata.normalize("NFC", "".join(out))
+
+
+def edit_distance(a: str, b: str, max_distance: int) -> int:
+    """
+    Levenshtein 거리. max_distance를 넘으면 max_distance + 1
+    - 공통 앞/뒷부분은 거리에 영향이 없으므로 잘라내고 가운데만 계산 (코드형 이름은 대부분 여기서 끝남)
+    - 대각선 폭 max_distance 안의 칸만 계산 (그 밖은 어차피 max_distance 초과)
+    - 행 최솟값이 넘으면 바로 중단
+    """
+    if a == b:
+        return 0
+    over = max_distance + 1
+    if abs(len(a) - len(b)) > max_distance:
+        return over
+    n = min(len(a), len(b))
+    start = 0
+    while start < n and a[start] == b[start]:
+        start += 1
+    end = 0
+    while end < n - start and a[-1 - end] == b[-1 - end]:
+        end += 1
+    a = a[start:len(a) - end]
+    b = b[start:len(b) - end]
+    if not a or not b:
+        return len(a) + len(b) if len(a) + len(b) <= max_distance else over
+    lb = len(b)
+    prev = [j if j <= max_distance else over for j in range(lb + 1)]
+    for i, ca in enumerate(a, 1):
+        cur = [over] * (lb + 1)
+        if i <= max_distance:
+            cur[0] = i
+        row_min = cur[0]
+        for j in range(max(1, i - max_distance), min(lb, i + max_distance) + 1):
+            v = prev[j - 1] if ca == b[j - 1] else prev[j - 1] + 1
+            if prev[j] + 1 < v:
+                v = prev[j] + 1
+            if cur[j - 1] + 1 < v:
+                v = cur[j - 1] + 1
+            cur[j] = v
+            if v < row_min:
+                row_min = v
+        if row_min > max_distance:
+            return over
+        prev = cur
+    return prev[lb] if prev[lb] <= max_distance else over
+
+
+def deletes_of(s: str, max_distance: int) -> Set[str]:
+    """s와 s에서 1..max_distance 글자를 지운 문자열 전부"""
+    out = {s}
+    frontier = {s}
+    for _ in range(max_distance):
+        nxt: Set[str] = set()
+        for w in frontier:
+            if len(w) <= 1:
+                continue
+            for i in range(len(w)):
+                nxt.add(w[:i] + w[i + 1:])
+        nxt -= out
+        out |= nxt
+        frontier = nxt
+    return out
+
+
+# =========================
+# 어휘 수집 (번들 한 줄 -> 이름)
+# =========================
+def row_fuzzy_terms(row: Dict) -> Set[Tuple[str, str]]:
+    """번들 한 줄(menus 복원 상태) -> {(종류, 이름)}"""
+    terms: Set[Tuple[str, str]] = set()
+    if row.get("auth_name"):
+        terms.add(("auth", str(row["auth_name"]).strip()))
+    for m in row.get("menus", []) or []:
+        levels = [lv.strip() for lv in str(m.get("path", "") or "").split(">")]
+        if levels and levels[-1]:
+            terms.add(("menu", levels[-1]))
+        if m.get("menu_id"):
+            terms.add(("menu_id", str(m["menu_id"]).strip()))
+    return terms
+
+
+def new_fuzzy_index() -> Dict:
+    return {"terms": {}}  # 정규화 이름 -> {"text", "kinds", "count"}
+
+
+def add_fuzzy_terms(index: Dict, terms: Iterable[Tuple[str, str]]):
+    """권한 하나분 이름 (같은 권한 안의 중복은 이미 set으로 제거된 상태)"""
+    for kind, text in terms:
+        key = search_normalize(text)
+        if len(key) < 2:
+            continue
+        t = index["terms"].get(key)
+        if t is None:
+            t = index["terms"][key] = {"text": text, "kinds": set(), "count": 0}
+        elif text < t["text"]:
+            t["text"] = text  # 표기가 여러 개면 가장 작은 것 (입력 순서와 무관하게 같은 표시 이름)
+        t["kinds"].add(kind)
+        t["count"] += 1
+
+
+def fuzzy_index_doc(index: Dict, max_distance: int = MAX_DISTANCE, prefix_length: int = PREFIX_LENGTH) -> Dict:
+    """산출물 JSON 구조 (이름 정규화 순으로 id 부여 -> 입력 순서와 무관하게 같은 파일)"""
+    terms = []
+    deletes: Dict[str, List[int]] = {}
+    for tid, key in enumerate(sorted(index["terms"])):
+        t = index["terms"][key]
+        jamo = jamo_decompose(key)
+        terms.append([t["text"], jamo, sorted(t["kinds"]), t["count"]])
+        for d in deletes_of(jamo[:prefix_length], max_distance):
+            deletes.setdefault(d, []).append(tid)
+    return {
+        "version": FUZZY_INDEX_VERSION,
+        "max_distance": max_distance,
+        "prefix_length": prefix_length,
+        "terms": terms,
+        "deletes": {d: deletes[d] for d in sorted(deletes)},
+    }
+
+
+def fuzzy_index_text(index: Dict, max_distance: int = MAX_DISTANCE, prefix_length: int = PREFIX_LENGTH) -> str:
+    return json.dumps(fuzzy_index_doc(index, max_distance, prefix_length), ensure_ascii=False, separators=(",", ":"))
+
+
+# =========================
+# 질의
+# =========================
+def jamo_grams(jamo: str) -> frozenset:
+    return frozenset(jamo[i:i + 2] for i in range(len(jamo) - 1))
+
+
+def prepare_fuzzy_index(doc: Dict) -> Dict:
+    """산출물 JSON -> 질의용 (어휘별 자모 2-gram 추가, 로드 시 1회)"""
+    return dict(doc, grams=[jamo_grams(t[1]) for t in doc["terms"]])
+
+
+def query_distance(q: str, d_max: int) -> int:
+    """짧은 질의는 편집 거리 1까지만 (자모 2~3글자 차이면 전혀 다른 낱말이 대부분)"""
+    return min(d_max, 1) if len(q) <= SHORT_QUERY_JAMO else d_max
+
+
+def fuzzy_lookup(doc: Dict, query: str, k: int = 5, kinds: Optional[Iterable[str]] = None,
+                 max_distance: Optional[int] = None, max_checks: int = MAX_CHECKS) -> List[Dict]:
+    """
+    doc(prepare_fuzzy_index 결과, 또는 산출물 JSON 그대로 - 이때는 2-gram 거르기 생략) -> 가까운 이름 top-k
+    [{"text","kinds","count","distance"}]
+    max_checks: 편집 거리를 계산할 후보 수 상한 (하한 순으로 앞쪽부터). 0이면 제한 없음 (선형 스캔과 같은 결과)
+                0이 아니면 후보가 많은 질의의 top-k가 달라질 수 있음 (모듈 설명 참고)
+    """
+    d_max = doc["max_distance"] if max_distance is None else min(int(max_distance), doc["max_distance"])
+    q = jamo_decompose(query)
+    if not q or k <= 0:
+        return []
+    d_max = query_distance(q, d_max)
+    want = set(kinds) if kinds else None
+    terms = doc["terms"]
+    deletes = doc["deletes"]
+
+    cand: Set[int] = set()
+    for d in deletes_of(q[:doc["prefix_length"]], d_max):
+        ids = deletes.get(d)
+        if ids:
+            cand.update(ids)
+
+    # 거리 하한: 길이 차, 질의 2-gram 중 빠진 수 / 2 (편집 1번이 없애는 2-gram은 최대 2개)
+    grams = doc.get("grams")
+    gq = jamo_grams(q)
+    lq = len(q)
+    queue: List[Tuple] = []
+    for tid in cand:
+        text, jamo, term_kinds, count = terms[tid]
+        if want and not want.intersection(term_kinds):
+            continue
+        lendiff = abs(len(jamo) - lq)
+        if lendiff > d_max:
+            continue  # 2-gram 집합 연산보다 먼저 (긴 menu_id는 앞부분만 같은 후보가 많음)
+        lower = lendiff
+        if grams is not None:
+            lower = max(lower, (len(gq - grams[tid]) + 1) // 2)
+        if lower <= d_max:
+            queue.append((lower, -count, lendiff, text, tid))
+    queue.sort()
+
+    # found: 순위 키 (거리, -등장 수, 길이 차, 이름, 종류, 등장 수). k개가 차면 k번째(last)보다 앞서야 들어옴
+    found: List[Tuple] = []
+    last: Optional[Tuple] = None
+    checks = 0
+    for lower, neg_count, lendiff, text, tid in queue:
+        limit = d_max
+        if last is not None:
+            limit = last[0] if (neg_count, lendiff, text) < last[1:4] else last[0] - 1
+        if lower > limit:
+            if last is not None and lower > last[0]:
+                break  # 뒤쪽 후보는 하한이 더 크거나 같음
+            continue
+        if max_checks and checks >= max_checks:
+            break
+        checks += 1
+        dist = edit_distance(q, terms[tid][1], limit)
+        if dist > limit:
+            continue
+        found.append((dist, neg_count, lendiff, text, terms[tid][2], -neg_count))
+        if len(found) >= k:
+            found.sort(key=lambda f: f[:4])
+            del found[k:]
+            last = found[-1]
+    found.sort(key=lambda f: f[:4])
+    return [{"text": f[3], "kinds": f[4], "count": f[5], "distance": f[0]} for f in found]
+
+
+def linear_lookup(doc: Dict, query: str, k: int = 5, max_distance: Optional[int] = None) -> List[Dict]:
+    """(벤치마크 기준선) 모든 이름과 편집 거리를 계산하는 선형 스캔. 순위 규칙은 fuzzy_lookup과 같음"""
+    d_max = doc["max_distance"] if max_distance is None else int(max_distance)
+    q = jamo_decompose(query)
+    d_max = query_distance(q, d_max)
+    found = []
+    for text, jamo, term_kinds, count in doc["terms"]:
+        dist = edit_distance(q, jamo, d_max)
+        if dist <= d_max:
+            found.append((dist, -count, abs(len(jamo) - len(q)), text, term_kinds, count))
+    found.sort(key=lambda f: f[:4])
+    return [{"text": f[3], "kinds": f[4], "count": f[5], "distance": f[0]} for f in found[:k]]
@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+"""
+규칙 기반 의도 분류기 (LLM 앞단)
+
+- services/geminiService.ts fallbackAnalysis의 키워드 규칙 + /api/analyze-intent 프롬프트의 분류 우선순위를
+  가중치 있는 단서(cue) 점수로 일반화
+- 어휘(팀/시스템/권한/메뉴 이름)는 산출물(permission_query store)에서 추출 -> 질의에 나온 엔터티로 점수 보정 + keyword/candidates
+- 반환 스키마는 /api/analyze-intent와 같음: {type, keyword, candidates, message, confidence}
+  + "source": "rules", "escalate": confidence < threshold (True면 LLM으로 넘김)
+
+점수
+- 유형별 점수 = 맞은 단서 가중치 합 + 엔터티 보정
+- confidence = (1 - e^-top) * (0.5 + 0.5 * (top - second) / top)  (점수가 크고 2등과 차이가 클수록 높음)
+- 아무 단서도 없으면 UNKNOWN(0.3)
+
+사용: python scripts/intent_engine.py [out_base] "질문" ["질문" ...]   (분류 결과 + 소요 시간 출력)
+"""
+
+import math
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from search_index import search_normalize
+
+DEFAULT_THRESHOLD = 0.7
+MAX_CANDIDATES = 5
+
+MESSAGES = {
+    "ROLE_LIST": "권한 목록을 조회할게요.",
+    "ROLE_TO_MENU": "접근 가능한 메뉴를 정리해드릴게요.",
+    "MENU_TO_ROLE": "해당 메뉴에 필요한 권한을 찾아볼게요.",
+    "UNKNOWN": "질문을 조금만 더 구체적으로 알려주세요.",
+}
+
+# (정규화된 단서, 가중치). 정규화 = 소문자 + 공백 제거 (search_normalize)
+CUES: Dict[str, List[Tuple[str, float]]] = {
+    "ROLE_LIST": [
+        ("권한목록", 3.0), ("권한리스트", 3.0), ("권한만", 3.0), ("전체권한", 2.5), ("모든권한", 2.5),
+        ("권한뭐", 2.5), ("어떤권한있", 2.5), ("무슨권한있", 2.5), ("권한종류", 2.5),
+        ("목록", 2.0), ("리스트", 2.0), ("뭐뭐", 2.0), ("뭐있어", 2.0), ("뭐가있", 2.0), ("전체", 1.0),
+    ],
+    "ROLE_TO_MENU": [
+        ("전체메뉴", 3.5), ("메뉴전체", 3.5), ("접근가능", 2.5), ("볼수있", 2.5), ("메뉴보여", 2.5),
+        ("무슨메뉴", 2.5), ("어떤메뉴", 2.5), ("메뉴뭐", 2.5), ("메뉴목록", 1.5),
+        ("메뉴", 1.5), ("볼수", 1.0), ("기능", 1.0), ("가진", 1.0), ("화면", 1.0),
+    ],
+    "MENU_TO_ROLE": [
+        ("보려면", 3.0), ("신청해야", 3.0), ("접근하려면", 3.0), ("쓰려면", 2.5), ("사용하려면", 2.5),
+        ("하려면", 2.0), ("필요", 2.5), ("있어야", 2.0), ("접근", 1.0),
+    ],
+}
+
+# 엔터티 보정: 질의에 해당 종류 이름이 나오면 유형별 가산점
+ENTITY_BOOST: Dict[str, Dict[str, float]] = {
+    "auth": {"ROLE_TO_MENU": 1.5},
+    "menu": {"MENU_TO_ROLE": 1.0},
+    "team": {"ROLE_LIST": 0.5, "ROLE_TO_MENU": 0.5},
+    "system": {"ROLE_LIST": 0.5},
+}
+
+# keyword 추출 시 지우는 말 (fallbackAnalysis 정규식 + App.tsx stopwords)
+_RE_FILLER = re.compile(
+    r"권한|메뉴|역할|필요해|필요한|필요|보려면|하려면|쓰려면|사용하려면|접근하려면|접근|가능한|가능|"
+    r"신청해야|신청|어떻게|뭐뭐|뭐야|뭐가|뭐|있어야|있어|있나요|볼수|가진|확인|보여줘|알려줘|찾아줘|"
+    r"목록|리스트|전체|모든|모두|전부|우리|팀의|팀|시스템|어떤|무슨|해야|해줘|주세요|하나요|[?？!.,]"
+)
+_RE_SPACES = re.compile(r"\s+")
+_PAGING_CUES = ("더보여", "다음", "나머지")
+_UI_CUES = ("크다", "줄여", "많이보")
+
+
+# =========================
+# 어휘 (산출물에서 추출)
+# =========================
+def build_intent_vocab(store: Dict) -> Dict[str, Dict[str, str]]:
+    """
+    permission_query store -> {"team"|"system"|"auth"|"menu": {정규화 이름: 원래 표기}}
+    - 2글자 미만, 숫자만 있는 짧은 코드(권한 "3" 등)는 오탐이 많아 제외
+    """
+    vocab: Dict[str, Dict[str, str]] = {"team": {}, "system": {}, "auth": {}, "menu": {}}
+
+    def add(kind: str, text) -> None:
+        text = str(text or "").strip()
+        n = search_normalize(text)
+        if len(n) < 2 or (n.isdigit() and len(n) < 4):
+            return
+        vocab[kind].setdefault(n, text)
+
+    for t in store["teams"].values():
+        add("team", t["team_name"])
+    for row in store["role_rows"]:
+        add("system", row["sys_code"])
+        add("system", row["sys_name"])
+        add("auth", row["auth_code"])
+        add("auth", row["auth_name"])
+    for menus in store["role_menus"]:
+        for m in menus:
+            for level in str(m.get("path", "") or "").split(">"):
+                add("menu", level)
+            add("menu", m.get("menu_id", ""))
+    return vocab
+
+
+_RE_ASCII_WORD = re.compile(r"[a-z0-9_]")
+
+
+def _contains_name(q: str, n: str) -> bool:
+    """영문/숫자 이름은 앞뒤가 영문/숫자/_ 이면 다른 코드의 일부로 보고 제외 (ZC_FI_01 안의 FI 등)"""
+    i = q.find(n)
+    if i < 0 or not n.isascii():
+        return i >= 0
+    while i >= 0:
+        before = q[i - 1] if i > 0 else ""
+        after = q[i + len(n)] if i + len(n) < len(q) else ""
+        if not (before and _RE_ASCII_WORD.match(before)) and not (after and _RE_ASCII_WORD.match(after)):
+            return True
+        i = q.find(n, i + 1)
+    return False
+
+
+def find_entities(vocab: Dict[str, Dict[str, str]], q: str) -> Dict[str, List[str]]:
+    """정규화 질의 q에 들어 있는 이름(긴 것 우선, 다른 이름에 포함되는 짧은 이름은 제외)"""
+    found: Dict[str, List[str]] = {}
+    for kind, names in vocab.items():
+        hits = [n for n in names if n in q and _contains_name(q, n)]
+        if not hits:
+            continue
+        hits.sort(key=len, reverse=True)
+        kept: List[str] = []
+        for n in hits:
+            if not any(n in k for k in kept):
+                kept.append(n)
+        found[kind] = [names[n] for n in kept]
+    return found
+
+
+# =========================
+# 분류
+# =========================
+def score_intents(q: str, entities: Dict[str, List[str]]) -> Dict[str, float]:
+    # 메뉴/권한 이름 안의 단서는 세지 않음 ("비즈니스파트너목록"의 "목록" 등)
+    for kind in ("menu", "auth"):
+        for name in entities.get(kind, []):
+            q = q.replace(search_normalize(name), " ")
+    scores = {t: 0.0 for t in CUES}
+    for t, cues in CUES.items():
+        for cue, w in cues:
+            if cue in q:
+                scores[t] += w
+    for kind, boosts in ENTITY_BOOST.items():
+        if entities.get(kind):
+            for t, w in boosts.items():
+                scores[t] += w
+    return scores
+
+
+def confidence_of(scores: Dict[str, float]) -> Tuple[str, float]:
+    ranked = sorted(scores.items(), key=lambda kv: -kv[1])
+    (top_t, top), (_, second) = ranked[0], ranked[1]
+    if top <= 0:
+        return "UNKNOWN", 0.3
+    conf = (1 - math.exp(-top)) * (0.5 + 0.5 * (top - second) / top)
+    return top_t, round(min(conf, 0.99), 3)
+
+
+def residual_keyword(query: str) -> str:
+    """단서/군말을 지우고 남은 2글자 이상 토큰 (App.tsx 검색어 토큰 규칙과 같은 길이 기준)"""
+    return " ".join(t for t in _RE_SPACES.split(_RE_FILLER.sub(" ", query)) if len(t) >= 2)
+
+
+def classify(vocab: Dict[str, Dict[str, str]], query: str, current_team: str = "", current_system: str = "",
+             threshold: float = DEFAULT_THRESHOLD) -> Dict:
+    safe = str(query or "").strip()
+    q = search_normalize(safe)
+
+    def result(t: str, keyword: str, candidates: List[str], conf: float, message: Optional[str] = None) -> Dict:
+        return {
+            "type": t,
+            "keyword": keyword,
+            "candidates": candidates[:MAX_CANDIDATES],
+            "message": message or MESSAGES[t],
+            "confidence": conf,
+            "source": "rules",
+            "escalate": conf < threshold,
+        }
+
+    if not q:
+        return result("UNKNOWN", "", [], 0.2, "질문을 입력해 주세요.")
+    # fallbackAnalysis와 같은 특수 요청 (페이지 넘김 / 화면 밀도)
+    if any(k in q for k in _PAGING_CUES):
+        return result("ROLE_TO_MENU", "CONTINUE", [], 0.9,
+                      "다음 20개 메뉴를 더 찾아볼게요. 추가로 보려면 '다음 20개 더 보여줘'라고 입력해 주세요.")
+    if any(k in q for k in _UI_CUES):
+        return result("UNKNOWN", "", [], 0.8,
+                      "한 화면에 더 많이 보실 수 있게 카드 높이와 여백을 줄이는 최적화 모드를 제안해 드릴까요?")
+
+    entities = find_entities(vocab, q)
+    t, conf = confidence_of(score_intents(q, entities))
+    rest = residual_keyword(safe)
+
+    if t == "ROLE_LIST":
+        # 프롬프트 규칙: keyword = 팀명 또는 빈 문자열
+        teams = entities.get("team", [])
+        return result(t, teams[0] if teams else str(current_team or ""), teams + entities.get("system", []), conf)
+    if t == "ROLE_TO_MENU":
+        named = entities.get("auth", []) + entities.get("team", []) + entities.get("system", [])
+        if "전체메뉴" in q or "메뉴전체" in q:
+            keyword = "전체"
+        else:
+            keyword = named[0] if named else (rest or safe)
+        return result(t, keyword, named, conf)
+    if t == "MENU_TO_ROLE":
+        menus = entities.get("menu", [])
+        return result(t, rest or (menus[0] if menus else safe), menus, conf)
+    return result("UNKNOWN", "", [], conf)
+
+
+def main() -> int:
+    sys.path.insert(0, str(Path(__file__).resolve().parent))
+    from permission_query import load_query_store  # 어휘 추출용 (분류 자체는 store 없이 동작)
+
+    args = sys.argv[1:]
+    out_base = Path(__file__).resolve().parent.parent / "public" / "data"
+    if args and Path(args[0]).is_dir():
+        out_base, args = Path(args[0]), args[1:]
+    t0 = time.perf_counter()
+    vocab = build_intent_vocab(load_query_store(out_base))
+    print("[INTENT] vocab: " + " ".join(f"{k}={len(v)}" for k, v in vocab.items()) + f" ({time.perf_counter() - t0:.2f}s)")
+    for q in args or ["우리 팀 권한 뭐있어", "전체 메뉴 보여줘", "결재 메뉴 보려면 어떤 권한이 필요해?", "ROLE_USER로 볼 수 있는 메뉴"]:
+        t0 = time.perf_counter()
+        r = classify(vocab, q)
+        print(f"[INTENT] {q!r} -> {r['type']} conf={r['confidence']} escalate={r['escalate']} "
+              f"keyword={r['keyword']!r} candidates={r['candidates']} ({(time.perf_counter() - t0) * 1e6:.0f}us)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
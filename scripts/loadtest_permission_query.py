@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+"""
+permission_query 부하 테스트 (p50 / p99)
+
+- 실제 산출물에서 질의를 뽑아(팀/시스템/권한/메뉴 토큰 일부) 타입별로 반복
+  1) 라이브러리 호출: query(store, ...)
+  2) HTTP: 같은 프로세스에 서버를 띄우고 keep-alive 연결로 GET /api/query
+- 규칙 기반 의도 분류(intent_engine.classify)도 템플릿 질문으로 지연/정확도/LLM escalate 비율 측정
+  + 분류 결과 후보 선해석(resolve_candidates, 질문 팀 범위) 지연
+- 결과는 [LOAD] 줄로 출력, --json 경로를 주면 같은 숫자를 파일로도 저장
+- MENU_TO_ROLE 결과가 전체 스캔(프런트와 같은 includes 기준)과 다르면 exit 1
+
+사용: python scripts/loadtest_permission_query.py [out_base] [--n 5000] [--http-n 2000] [--json 결과.json]
+"""
+
+import argparse
+import http.client
+import json
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+from urllib.parse import urlencode
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from intent_engine import build_intent_vocab, classify  # noqa: E402
+from permission_query import load_query_store, make_server, query, resolve_candidates  # noqa: E402
+from search_index import search_normalize  # noqa: E402
+
+
+def make_queries(store: Dict, n: int, seed: int = 0) -> List[Tuple[str, Dict]]:
+    rng = random.Random(seed)
+    teams = sorted(store["teams"])
+    roles = store["role_rows"]
+    tokens = store["tokens"]
+    out: List[Tuple[str, Dict]] = []
+    for i in range(n):
+        kind = ("ROLE_LIST", "ROLE_TO_MENU", "MENU_TO_ROLE")[i % 3]
+        if kind == "ROLE_LIST":
+            tc = rng.choice(teams)
+            systems = store["systems"][tc]
+            sc = rng.choice(systems)["sys_code"] if systems and rng.random() < 0.5 else None
+            out.append((kind, {"team": tc, "sys_code": sc}))
+        elif kind == "ROLE_TO_MENU":
+            r = rng.choice(roles)
+            args = {"team": r["team_code"], "sys_code": r["sys_code"]}
+            if rng.random() < 0.7:
+                args["auth_code"] = r["auth_code"]
+            out.append((kind, args))
+        else:
+            tok = rng.choice(tokens)
+            a = rng.randrange(len(tok))
+            kw = tok[a:a + rng.randint(2, 6)] if len(tok) > 1 else tok
+            out.append((kind, {"keyword": kw, "team": rng.choice(teams) if rng.random() < 0.3 else None}))
+    return out
+
+
+INTENT_TEMPLATES = [
+    ("ROLE_LIST", "{team} 권한 뭐있어"),
+    ("ROLE_LIST", "우리 팀 권한 목록"),
+    ("ROLE_LIST", "{system} 권한 리스트 보여줘"),
+    ("ROLE_TO_MENU", "{auth} 권한으로 볼 수 있는 메뉴"),
+    ("ROLE_TO_MENU", "전체 메뉴 보여줘"),
+    ("ROLE_TO_MENU", "{team} 접근 가능 메뉴"),
+    ("MENU_TO_ROLE", "{menu} 메뉴 보려면 어떤 권한이 필요해?"),
+    ("MENU_TO_ROLE", "{menu} 쓰려면 뭐 신청해야 해"),
+    ("UNKNOWN", "안녕하세요"),
+]
+
+
+def make_intent_queries(store: Dict, n: int, seed: int = 0) -> List[Tuple[str, str, str]]:
+    """(기대 유형, 질문, 질문 팀 team_code) - 실제 팀/시스템/권한/메뉴 이름을 템플릿에 채움"""
+    rng = random.Random(seed)
+    rows = store["role_rows"]
+    menus = [m for ms in store["role_menus"] for m in ms[:3]]
+    out = []
+    for i in range(n):
+        want, tpl = INTENT_TEMPLATES[i % len(INTENT_TEMPLATES)]
+        r = rng.choice(rows)
+        m = rng.choice(menus) if menus else {"path": ""}
+        levels = [lv.strip() for lv in str(m.get("path", "")).split(">") if lv.strip()]
+        out.append((want, tpl.format(
+            team=r["team_name"], system=r["sys_name"] or r["sys_code"], auth=r["auth_name"] or r["auth_code"],
+            menu=levels[-1] if levels else "결재",
+        ), r["team_code"]))
+    return out
+
+
+def check_menu_to_role(store: Dict, queries: List[Tuple[str, Dict]]) -> Tuple[int, int]:
+    """인덱스 결과 == 권한별 메뉴 path 레벨 전체 스캔 -> (확인 수, 불일치 수)"""
+    checked = failed = 0
+    for kind, args in queries:
+        if kind != "MENU_TO_ROLE":
+            continue
+        checked += 1
+        kw = search_normalize(args["keyword"])
+        want = []
+        for rid, row in enumerate(store["role_rows"]):
+            if args["team"] and row["team_code"] != args["team"]:
+                continue
+            hit = any(
+                kw in search_normalize(level) or str(m.get("menu_id", "")).lower() == args["keyword"].strip().lower()
+                for m in store["role_menus"][rid]
+                for level in str(m.get("path", "") or "").split(">")
+            )
+            if hit:
+                want.append(row)
+        got = query(store, kind, limit=10 ** 9, **args)["items"]
+        if got != want:
+            failed += 1
+            if failed <= 3:
+                print(f"[FAIL] MENU_TO_ROLE {args}: index={len(got)} scan={len(want)}")
+    return checked, failed
+
+
+def percentiles(ts: List[float]) -> Dict[str, float]:
+    ts = sorted(ts)
+
+    def p(q: float) -> float:
+        return ts[min(len(ts) - 1, int(len(ts) * q))] * 1e6
+
+    return {"n": len(ts), "p50_us": round(p(0.50), 1), "p99_us": round(p(0.99), 1), "max_us": round(ts[-1] * 1e6, 1)}
+
+
+def run_library(store: Dict, queries: List[Tuple[str, Dict]]) -> Dict[str, List[float]]:
+    times: Dict[str, List[float]] = {}
+    for kind, args in queries:
+        t0 = time.perf_counter()
+        query(store, kind, **args)
+        times.setdefault(kind, []).append(time.perf_counter() - t0)
+    return times
+
+
+def run_http(store: Dict, queries: List[Tuple[str, Dict]]) -> Dict[str, List[float]]:
+    server = make_server(store, "127.0.0.1", 0)
+    th = threading.Thread(target=server.serve_forever, daemon=True)
+    th.start()
+    conn = http.client.HTTPConnection("127.0.0.1", server.server_address[1])
+    times: Dict[str, List[float]] = {}
+    try:
+        for kind, args in queries:
+            params = {"type": kind, "team": args.get("team"), "sys": args.get("sys_code"),
+                      "auth": args.get("auth_code"), "keyword": args.get("keyword")}
+            url = "/api/query?" + urlencode({k: v for k, v in params.items() if v is not None})
+            t0 = time.perf_counter()
+            conn.request("GET", url)
+            resp = conn.getresponse()
+            body = resp.read()
+            times.setdefault(kind, []).append(time.perf_counter() - t0)
+            if resp.status != 200:
+                raise RuntimeError(f"HTTP {resp.status}: {body[:200]!r}")
+    finally:
+        conn.close()
+        server.shutdown()
+        server.server_close()
+    return times
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="permission_query 부하 테스트")
+    ap.add_argument("out_base", nargs="?", default=str(Path(__file__).resolve().parent.parent / "public" / "data"))
+    ap.add_argument("--n", type=int, default=6000, help="라이브러리 질의 수")
+    ap.add_argument("--http-n", type=int, default=1500, help="HTTP 질의 수 (0=생략)")
+    ap.add_argument("--json", default="", help="결과 저장 경로")
+    args = ap.parse_args()
+
+    t0 = time.perf_counter()
+    store = load_query_store(Path(args.out_base))
+    t_load = time.perf_counter() - t0
+    print(f"[LOAD] store: teams={len(store['teams'])} roles={len(store['role_rows'])} tokens={len(store['tokens'])} load={t_load:.2f}s")
+
+    queries = make_queries(store, args.n)
+    checked, failed = check_menu_to_role(store, queries[:600])
+    print(f"[LOAD] MENU_TO_ROLE index vs scan: {checked - failed}/{checked} same")
+
+    report: Dict = {"load_s": round(t_load, 3), "library": {}, "http": {}}
+    for mode, fn, qs in (("library", run_library, queries), ("http", run_http, queries[:args.http_n])):
+        if not qs:
+            continue
+        for kind, ts in sorted(fn(store, qs).items()):
+            report[mode][kind] = percentiles(ts)
+            r = report[mode][kind]
+            print(f"[LOAD] {mode:<8}{kind:<14} n={r['n']:<6} p50={r['p50_us']:>9.1f}us p99={r['p99_us']:>9.1f}us max={r['max_us']:>9.1f}us")
+
+    vocab = build_intent_vocab(store)
+    intent_qs = make_intent_queries(store, args.n)
+    times, resolve_times, correct, escalated = [], [], 0, 0
+    for want, text, team_code in intent_qs:
+        t0 = time.perf_counter()
+        r = classify(vocab, text)
+        times.append(time.perf_counter() - t0)
+        correct += int(r["type"] == want)
+        escalated += int(r["escalate"])
+        t0 = time.perf_counter()
+        resolve_candidates(store, r, team_code, "", text)
+        resolve_times.append(time.perf_counter() - t0)
+    report["intent"] = dict(percentiles(times), accuracy=round(correct / len(intent_qs), 3),
+                            escalate_rate=round(escalated / len(intent_qs), 3))
+    r = report["intent"]
+    print(f"[LOAD] intent  rules          n={r['n']:<6} p50={r['p50_us']:>9.1f}us p99={r['p99_us']:>9.1f}us "
+          f"max={r['max_us']:>9.1f}us accuracy={r['accuracy']:.1%} escalate={r['escalate_rate']:.1%}")
+    report["resolve"] = r = percentiles(resolve_times)
+    print(f"[LOAD] intent  resolve        n={r['n']:<6} p50={r['p50_us']:>9.1f}us p99={r['p99_us']:>9.1f}us max={r['max_us']:>9.1f}us")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"[LOAD] saved: {args.json}")
+    if failed:
+        print("❌ 인덱스/스캔 결과 불일치")
+        return 1
+    print("✅ 완료")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
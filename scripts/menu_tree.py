@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+"""
+권한 번들별 정렬된 메뉴 트리 (App.tsx 가 권한 선택 / "더 보여줘" 때마다 하던 정렬을 전처리에서 1회)
+
+번들에 추가되는 필드 (값은 모두 같은 번들 menus 의 위치 = menu_refs 모드에서도 같은 위치)
+- menu_tree : [[L1 표시명, [[L2 표시명, [메뉴 위치, ...]], ...]], ...]
+              App.tsx nestedMenus 와 같은 규칙 (path를 '>'로 나눠 L1/L2/L3, 빈 레벨은 '기타',
+              정규화 L1|L2|L3 중복 제거, L3에 한글이 없는 메뉴 제외)
+              L1/L2: '기타' 맨 뒤 -> 한글 먼저 -> 이름순, 메뉴: L3 이름순
+- menu_order: [메뉴 위치, ...]  App.tsx sortMenusKoreanFirst 와 같은 규칙
+              (menu_id 중복 제거, 한글 -> 선두 null 아님 -> 앞에서 채워진 레벨 수 desc -> 채워진 레벨 수 desc -> path)
+
+이름순은 localeCompare('ko') 근사 (글자 단위: 공백/기호 -> 숫자 -> 한글 가나다 -> 영문 대소문자/악센트 무시 순).
+기호 순서도 ICU 표를 따르지만 전각 같은 3차 비교 등 일부는 브라우저 정렬과 다를 수 있음
+-> 기본 off (CONFIG output.menu_tree). 켜도 App.tsx 는 menu_tree / menu_order 순서가 services/menuTree.ts
+   정렬 결과와 다르면 (menuTreeInOrder / menuOrderInOrder) 다시 정렬
+-> 규칙 변경 시 scripts/check_menu_tree_order.py 로 services/menuTree.fixture.json 갱신 (services/menuTree.test.ts 가 같은 fixture 사용)
+"""
+
+import re
+import unicodedata
+from typing import Dict, List, Tuple
+
+ETC_LABEL = "기타"
+
+# App.tsx 의 hasKorean / normalize 와 같은 정규식
+_RE_KOREAN = re.compile(r"[ㄱ-ㅎ|ㅏ-ㅣ|가-힣]")
+_RE_SPACE = re.compile(r"\s+")
+_RE_NULL = re.compile(r"^null$", re.IGNORECASE)
+
+
+def ui_clean(val) -> str:
+    """App.tsx cleanValue: None / 빈 값 / 'nan' / 'null' -> '기타'"""
+    if val is None:
+        return ETC_LABEL
+    s = str(val).strip()
+    if s == "" or s.lower() in ("nan", "null"):
+        return ETC_LABEL
+    return s
+
+
+def ui_normalize(text) -> str:
+    return _RE_SPACE.sub("", str(text or "").lower())
+
+
+def has_korean(text) -> bool:
+    return bool(_RE_KOREAN.search(str(text or "")))
+
+
+# 브라우저(ICU) 'ko' 정렬에서의 공백/기호 순서 (목록에 없는 기호는 그 뒤에 코드포인트 순)
+_PUNCT_ORDER = {ch: i for i, ch in enumerate(" _-–—,;:!?….·'’\"“”(（)）[［]］{}@*/\\&#%※`^+<=>|｜~～$ㆍ")}
+
+
+def _char_rank(ch: str) -> Tuple[int, int, str]:
+    """localeCompare('ko') 1차 비교 근사: 공백/기호 -> 숫자 -> 한글 -> 영문 등 (대소문자 무시)"""
+    if ch.isdigit():
+        return (1, 0, ch)
+    if "가" <= ch <= "힣" or "ㄱ" <= ch <= "ㅣ":
+        return (2, 0, ch)
+    if ch.isalpha():
+        # 악센트는 1차 비교에서 무시 (é -> e), 같으면 collate_key의 tie-break에서 악센트 없는 쪽이 먼저
+        return (3, 0, unicodedata.normalize("NFD", ch)[0].lower())
+    return (0, _PUNCT_ORDER.get(ch, len(_PUNCT_ORDER)), ch)
+
+
+def collate_key(text: str) -> Tuple:
+    # 1차가 같으면 소문자 먼저 (ICU 3차 비교와 같은 방향)
+    return (tuple(_char_rank(ch) for ch in text), text.swapcase())
+
+
+def label_sort_key(label: str) -> Tuple:
+    """App.tsx sortLabelWithKoreanEtcEnglish: 기타 맨 뒤 -> 한글 먼저 -> 이름순"""
+    v = ui_clean(label)
+    return (2 if v == ETC_LABEL else 0, 0 if has_korean(v) else 1, collate_key(v))
+
+
+def menu_levels(path) -> Tuple[str, str, str]:
+    parts = [ui_clean(p) for p in str(path or "").split(">")]
+    return parts[0], (parts[1] if len(parts) > 1 else ETC_LABEL), (parts[2] if len(parts) > 2 else parts[-1])
+
+
+def build_menu_tree(menus: List[Dict]) -> List:
+    groups: Dict[str, Dict] = {}  # l1 정규화 -> {"label", "l2": {l2 정규화: {"label", "items": [(l3, 위치)]}}}
+    seen = set()
+    for i, m in enumerate(menus):
+        l1, l2, l3 = menu_levels(m.get("path", ""))
+        key = ui_normalize(f"{l1}|{l2}|{l3}")
+        if key in seen or not has_korean(l3):
+            continue
+        seen.add(key)
+        g1 = groups.setdefault(ui_normalize(l1), {"label": l1, "l2": {}})
+        g1["l2"].setdefault(ui_normalize(l2), {"label": l2, "items": []})["items"].append((l3, i))
+
+    tree = []
+    for g1 in sorted(groups.values(), key=lambda g: label_sort_key(g["label"])):
+        l2_nodes = []
+        for g2 in sorted(g1["l2"].values(), key=lambda g: label_sort_key(g["label"])):
+            items = sorted(g2["items"], key=lambda it: collate_key(ui_clean(it[0])))
+            l2_nodes.append([g2["label"], [i for _, i in items]])
+        tree.append([g1["label"], l2_nodes])
+    return tree
+
+
+def menu_sort_key(menu: Dict) -> Tuple:
+    """App.tsx menuSortKey"""
+    path = menu.get("path", "")
+    parts = ["" if p == ETC_LABEL else p for p in (ui_clean(p) for p in str(path or "").split(">"))]
+    filled = [bool(p) and not _RE_NULL.match(p) for p in parts]
+    prefix_filled = 0
+    for f in filled:
+        if not f:
+            break
+        prefix_filled += 1
+    is_kor = 0 if has_korean(f"{ui_clean(path)} {ui_clean(menu.get('menu_id'))}") else 1
+    return (is_kor, 0 if filled[0] else 1, -prefix_filled, -sum(filled), collate_key(ui_clean(path)))
+
+
+def build_menu_order(menus: List[Dict]) -> List[int]:
+    first: Dict[str, int] = {}
+    for i, m in enumerate(menus):
+        first.setdefault(ui_clean(m.get("menu_id")), i)
+    return sorted(first.values(), key=lambda i: menu_sort_key(menus[i]))
+
+
+def with_menu_tree(bundle: Dict, enabled: bool = True) -> Dict:
+    """
+    번들 -> menu_tree / menu_order 를 menus 기준으로 다시 계산한 사본 (merge로 menus가 바뀌어도 항상 맞음)
+    enabled=False면 이전 산출물에 남은 두 필드를 제거
+    """
+    out = {k: v for k, v in bundle.items() if k not in ("menu_tree", "menu_order")}
+    if enabled:
+        menus = bundle.get("menus", []) or []
+        out["menu_tree"] = build_menu_tree(menus)
+        out["menu_order"] = build_menu_order(menus)
+    return out
@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+"""
+preprocess_permissions_v2의 norm_text / norm_code / canon_team_code 벡터화 버전
+
+- 셀마다 파이썬 정규식을 돌리던 Series.map(norm_*)를 대체
+- 값 종류가 적은 컬럼(팀/시스템/권한/메뉴 코드)이므로 pd.factorize로 고유값만 뽑아
+  고유값에 대해서만 .str / NumPy 마스크 연산을 하고 codes로 다시 펼침
+- 결과는 기존 스칼라 함수와 "완전히 동일"해야 함 -> check_normalize_equivalence.py로 검증
+
+컬럼 정규화 상태 추적
+- df.attrs["canonical"] = {컬럼명: "text"|"code"|"team"}
+- normalize_columns()는 이미 같은 종류로 정규화된 컬럼은 건너뜀(컬럼당 1회)
+- merge는 attrs를 버리고 concat은 attrs가 모두 같을 때만 유지하므로
+  carry_canonical / concat_canonical로 명시적으로 이어붙임
+
+SAP 권한 설명
+- build_sap_desc_series: 권한별 메뉴명 상위 N개 설명 (preprocess_permissions / _v2 공용)
+"""
+
+from typing import Dict, Iterable, List
+
+import numpy as np
+import pandas as pd
+
+CANON_ATTR = "canonical"
+
+_RE_CODE_DOT0 = r"\A(-?\d+)\.0\Z"
+_RE_DIGITS = r"\d+"
+
+
+# =========================
+# 문자열 고유값 처리 (.str 연산)
+# =========================
+def _text_str(u: pd.Series) -> pd.Series:
+    u = u.str.replace("\r\n", "\n", regex=False).str.replace("\r", "\n", regex=False)
+    u = u.str.replace(r"[ \t]+\n", "\n", regex=True)
+    return u.str.strip()
+
+
+def _code_str(u: pd.Series) -> pd.Series:
+    return u.str.strip().str.replace(_RE_CODE_DOT0, r"\1", regex=True)
+
+
+def _team_str(u: pd.Series) -> pd.Series:
+    u = u.str.strip()
+    u = u.where(~u.str.endswith(".0"), u.str[:-2])
+    digits = u.str.fullmatch(_RE_DIGITS) & ~u.str.startswith("0RULE_")
+    stripped = u.str.lstrip("0")
+    stripped = stripped.where(stripped != "", "0")
+    return u.where(~digits, stripped)
+
+
+# =========================
+# 고유값 -> 정규화 결과
+# =========================
+def _float_code(vals: np.ndarray) -> List[str]:
+    """norm_code(float): 정수값이면 str(int(x)), 아니면 str(x)"""
+    f = vals.astype(np.float64)
+    with np.errstate(invalid="ignore"):
+        integral = np.isfinite(f) & (np.floor(f) == f)
+    return [str(int(v)) if ok else str(v) for v, ok in zip(vals, integral)]
+
+
+def _normalize_uniques(uniques: np.ndarray, kind: str) -> np.ndarray:
+    """
+    스칼라 함수와 동일한 규칙:
+    - norm_text(x)       == _text_str(str(x))
+    - canon_team_code(x) == _team_str(str(x))
+    - norm_code(x)       == float이면 _float_code, 아니면 _code_str(str(x))
+    """
+    out = np.empty(len(uniques), dtype=object)
+    if len(uniques) == 0:
+        return out
+
+    is_float = np.fromiter((isinstance(v, float) for v in uniques), dtype=bool, count=len(uniques))
+    if kind == "code" and is_float.any():
+        out[is_float] = _float_code(uniques[is_float])
+        rest = ~is_float
+    else:
+        rest = np.ones(len(uniques), dtype=bool)
+
+    if rest.any():
+        s = pd.Series([v if isinstance(v, str) else str(v) for v in uniques[rest]], dtype=object)
+        fn = {"text": _text_str, "code": _code_str, "team": _team_str}[kind]
+        out[rest] = fn(s).to_numpy(dtype=object)
+    return out
+
+
+def _normalize_series(s: pd.Series, kind: str) -> pd.Series:
+    arr = s.to_numpy(dtype=object) if s.dtype == object else s
+    codes, uniques = pd.factorize(arr, use_na_sentinel=True)
+    uniques = np.asarray(pd.Series(uniques).astype(object).to_numpy(), dtype=object)
+
+    vals = _normalize_uniques(uniques, kind)
+    res = np.empty(len(codes), dtype=object)
+    hit = codes >= 0
+    res[hit] = vals[codes[hit]]
+    res[~hit] = ""
+
+    # factorize는 0.0과 -0.0을 같은 값으로 묶음 -> str(-0.0)='-0.0' 이므로 따로 계산
+    if s.dtype.kind == "f":
+        f = s.to_numpy()
+        neg_zero = (f == 0) & np.signbit(f)
+        if neg_zero.any():
+            res[neg_zero] = _normalize_uniques(np.array([-0.0], dtype=object), kind)[0]
+
+    # object 컬럼에서 1 / 1.0 / True 는 factorize가 같은 값으로 묶음 -> 비문자열 셀만 셀 단위로 재계산
+    if s.dtype == object and len(uniques):
+        non_str_u = np.fromiter((not isinstance(v, str) for v in uniques), dtype=bool, count=len(uniques))
+        if non_str_u.any():
+            idx = np.flatnonzero(hit & non_str_u[np.where(hit, codes, 0)])
+            memo: Dict = {}
+            for i in idx:
+                v = arr[i]
+                key = (type(v), repr(v) if isinstance(v, float) else v)
+                if key not in memo:
+                    memo[key] = _normalize_uniques(np.array([v], dtype=object), kind)[0]
+                res[i] = memo[key]
+
+    return pd.Series(res, index=s.index, name=s.name, dtype=object)
+
+
+def norm_text_series(s: pd.Series) -> pd.Series:
+    """Series.map(norm_text)와 동일"""
+    return _normalize_series(s, "text")
+
+
+def norm_code_series(s: pd.Series) -> pd.Series:
+    """Series.map(norm_code)와 동일"""
+    return _normalize_series(s, "code")
+
+
+def canon_team_code_series(s: pd.Series) -> pd.Series:
+    """Series.map(canon_team_code)와 동일"""
+    return _normalize_series(s, "team")
+
+
+_KIND_FN = {"text": norm_text_series, "code": norm_code_series, "team": canon_team_code_series}
+
+
+# =========================
+# 컬럼 정규화 상태 추적
+# =========================
+def canonical_cols(df: pd.DataFrame) -> Dict[str, str]:
+    return dict(df.attrs.get(CANON_ATTR, {}))
+
+
+def mark_canonical(df: pd.DataFrame, cols: Dict[str, str]) -> pd.DataFrame:
+    marks = canonical_cols(df)
+    marks.update({c: k for c, k in cols.items() if c in df.columns})
+    df.attrs[CANON_ATTR] = marks
+    return df
+
+
+def canonical_series(df: pd.DataFrame, col: str, kind: str) -> pd.Series:
+    """컬럼을 바꾸지 않고 정규화된 값만 필요할 때. 이미 정규화된 컬럼이면 그대로 반환"""
+    if canonical_cols(df).get(col) == kind:
+        return df[col]
+    return _KIND_FN[kind](df[col])
+
+
+def normalize_columns(df: pd.DataFrame, spec: Dict[str, str]) -> pd.DataFrame:
+    """
+    spec={컬럼: 종류} 대로 in-place 정규화. 이미 같은 종류로 정규화된 컬럼은 건너뜀.
+    컬럼이 없으면 ""로 생성(기존 코드의 방어 로직과 동일)
+    """
+    marks = canonical_cols(df)
+    for c, kind in spec.items():
+        if c not in df.columns:
+            df[c] = ""
+        elif marks.get(c) != kind:
+            df[c] = _KIND_FN[kind](df[c])
+        marks[c] = kind
+    df.attrs[CANON_ATTR] = marks
+    return df
+
+
+def carry_canonical(dst: pd.DataFrame, src: pd.DataFrame, cols: Iterable[str] = None) -> pd.DataFrame:
+    """
+    merge 결과(dst)에 왼쪽 프레임(src)의 정규화 표시를 이어붙임.
+    left merge의 왼쪽 컬럼 값은 그대로이므로 안전. (오른쪽에서 온 컬럼은 NaN이 생길 수 있어 제외)
+    """
+    marks = canonical_cols(src)
+    if cols is not None:
+        marks = {c: marks[c] for c in cols if c in marks}
+    return mark_canonical(dst, marks)
+
+
+def concat_canonical(frames: List[pd.DataFrame], **kwargs) -> pd.DataFrame:
+    """pd.concat + 모든 프레임에서 같은 종류로 정규화된 컬럼만 표시 유지"""
+    out = pd.concat(frames, **kwargs)
+    common: Dict[str, str] = {}
+    if frames:
+        common = canonical_cols(frames[0])
+        for f in frames[1:]:
+            m = canonical_cols(f)
+            common = {c: k for c, k in common.items() if m.get(c) == k}
+    out.attrs[CANON_ATTR] = {c: k for c, k in common.items() if all(c in f.columns for f in frames)}
+    return out
+
+
+# =========================
+# ✅ NEW: category 표현 (값 종류가 적은 정규화 컬럼)
+# =========================
+def to_category(df: pd.DataFrame, cols: Iterable[str]) -> pd.DataFrame:
+    """
+    cols -> pandas category (in-place, 없는 컬럼은 건너뜀). 정규화 표시(attrs)는 그대로.
+    카테고리는 값 정렬순(astype 기본)이라 sort_values / drop_duplicates 결과가 object 컬럼과 같음.
+    groupby는 observed=True 로 호출할 것 (아니면 카테고리 조합 전체가 그룹이 됨)
+    """
+    for c in cols:
+        if c in df.columns and not isinstance(df[c].dtype, pd.CategoricalDtype):
+            df[c] = df[c].astype("category")
+    return df
+
+
+# =========================
+# SAP 권한 설명 (v1 / v2 공용)
+# =========================
+def build_sap_desc_series(df: pd.DataFrame, keys: List[str], name_col: str, topn: int = 3) -> pd.Series:
+    """
+    groupby(keys)[name_col].apply(build_sap_role_desc) 와 같은 결과를 행 수에 선형으로 계산
+    (v2 build_sap_role_desc / v1 build_sap_auth_desc 는 같은 규칙 -> 두 스크립트가 이 함수를 같이 씀)
+    - name_col은 norm_text 완료 상태여야 함
+    - 그룹별 첫 등장 순서 유지: drop_duplicates(첫 값 유지) -> cumcount < topn
+    - 이름이 하나도 없는 그룹은 "여러 메뉴 등이 있습니다."
+    """
+    g = df.groupby(keys, sort=True, observed=True)
+    all_keys = g.size().index
+    gid = g.ngroup().to_numpy()
+    names = df[name_col].to_numpy(dtype=object)
+    keep = (gid >= 0) & (names != "")
+    named = pd.DataFrame({"gid": gid[keep], "name": names[keep]}).drop_duplicates()
+    rank = named.groupby("gid", sort=False).cumcount().to_numpy()
+
+    # 그룹 id 배열 위에서 순위별로 이어붙임 (그룹마다 파이썬 함수를 부르지 않음)
+    joined = np.full(len(all_keys), "", dtype=object)
+    for r in range(topn):
+        sel = named[rank == r]
+        ids = sel["gid"].to_numpy()
+        part = sel["name"].to_numpy(dtype=object)
+        joined[ids] = part if r == 0 else joined[ids] + ", " + part
+    desc = np.where(joined != "", joined + " 등이 있습니다.", "여러 메뉴 등이 있습니다.")
+    return pd.Series(desc, index=all_keys, name=name_col, dtype=object)
@@ -0,0 +1,568 @@
+# -*- coding: utf-8 -*-
+"""
+권한 조회 서비스 (서버 측, 메모리 인덱스)
+
+- preprocess_permissions_v2 산출물을 한 번만 읽어 dict 인덱스로 올림
+  - permissions.bin(바이너리 번들)이 있으면 그것을, 없으면 by_team/*.jsonl(inline/catalog/shared 모두)을 읽음
+- 인덱스
+  - teams       : team_code -> {"team_code","team_name"}   (+ 정규화 팀명 -> team_code)
+  - systems     : team_code -> [{"sys_code","sys_name"}]
+  - roles       : (team_code, sys_code) -> [권한 id]
+  - by_menu_id  : menu_id(소문자) -> [권한 id]
+  - by_token    : 메뉴 path 레벨 토큰(search_normalize) -> [권한 id]
+  - token_grams : 토큰 2/3-gram -> 토큰 번호 (부분일치 후보를 좁힌 뒤 `in`으로 확인)
+  - team_tokens : team_code -> 토큰 -> [권한 id]  (팀 범위 후보 선해석용, 전사 posting을 훑지 않음)
+- 질의 (intent 타입과 같은 이름)
+  - ROLE_LIST    : 팀(+시스템)의 권한 목록
+  - ROLE_TO_MENU : 팀(+시스템, +권한)이 볼 수 있는 메뉴
+  - MENU_TO_ROLE : 메뉴 키워드(부분일치, 프런트 normalize 규칙) / menu_id -> 그 메뉴를 가진 권한
+
+사용
+- 라이브러리: store = load_query_store(out_base); query(store, "ROLE_LIST", team="30202")
+- HTTP     : python scripts/permission_query.py [out_base] [--port 3002]
+             GET /api/query?type=ROLE_LIST&team=..&sys=..&auth=..&keyword=..&limit=..
+             GET /api/intent?query=..&team=..&system=..   (규칙 기반 의도 분류, intent_engine + 후보 선해석)
+             GET /api/resolve?type=..&keyword=..&candidate=..&query=..&team=..&system=..
+                 (LLM 등 다른 분류기 결과 -> 권한/메뉴 hit, hit가 없으면 오타 교정 suggestions)
+             GET /api/fuzzy?q=..&k=5&kind=auth|menu|menu_id   (오타 교정, fuzzy_index)
+"""
+
+import argparse
+import json
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from binary_bundle import BINARY_BUNDLE_FILE, BinaryBundle
+from fuzzy_index import (
+    FUZZY_DIR,
+    FUZZY_INDEX_FILE,
+    add_fuzzy_terms,
+    fuzzy_index_doc,
+    fuzzy_lookup,
+    new_fuzzy_index,
+    prepare_fuzzy_index,
+    row_fuzzy_terms,
+)
+from intent_engine import DEFAULT_THRESHOLD, build_intent_vocab, classify
+from search_index import query_grams, search_normalize, text_grams
+
+INTENT_TYPES = ("ROLE_LIST", "ROLE_TO_MENU", "MENU_TO_ROLE")
+DEFAULT_LIMIT = 200
+MAX_LIMIT = 2000          # ?limit= 상한
+DEFAULT_FUZZY_K = 5
+MAX_FUZZY_K = 50          # /api/fuzzy ?k= 상한
+MENU_UNION_CACHE_MAX = 1024  # (팀, 시스템) 메뉴 합집합 LRU 크기
+_ROLE_MATCH_FIELDS = ("team_name", "sys_name", "auth_name", "auth_desc")  # 권한 자체 hit 판정 필드 (App.tsx isMatch)
+
+
+# =========================
+# 산출물 -> 팀별 번들 (menus 복원 상태)
+# =========================
+def iter_team_bundles(out_base: Path) -> Iterable[Tuple[str, List[Dict]]]:
+    bin_path = out_base / BINARY_BUNDLE_FILE
+    if bin_path.exists():
+        with BinaryBundle(bin_path) as bb:
+            for tc in bb.team_codes():
+                yield tc, bb.team_bundles(tc)
+        return
+
+    import preprocess_permissions_v2 as v2  # permissions.bin이 없을 때만 (pandas 로드)
+
+    catalog = v2.load_menu_catalog(out_base)
+    files = v2.list_old_team_files(out_base / "by_team")
+    for tc in sorted(files):
+        yield tc, v2.sorted_team_rows(v2.load_team_bundles(tc, files[tc], out_base / v2.BY_ROLE_DIR, catalog))
+
+
+# =========================
+# 인덱스 구성
+# =========================
+def new_query_store() -> Dict:
+    return {
+        "teams": {},
+        "team_by_name": {},
+        "systems": {},
+        "role_rows": [],    # 권한 id -> {"team_code","team_name","sys_code","sys_name","auth_code","auth_name","auth_desc"}
+        "role_menus": [],   # 권한 id -> [{"path","menu_id"}]
+        "roles": {},
+        "by_menu_id": {},
+        "by_token": {},
+        "tokens": [],       # 토큰 번호 -> 토큰
+        "token_grams": {},
+        "menu_union": OrderedDict(),  # (team_code, sys_code|None) -> 중복 제거한 메뉴 (LRU, MENU_UNION_CACHE_MAX개)
+        "menu_union_lock": threading.Lock(),  # ThreadingHTTPServer 스레드끼리 공유
+        "role_text": [],    # 권한 id -> 정규화 (team_name, sys_name, auth_name, auth_desc, auth_code 소문자)
+        "path_levels": {},  # 메뉴 path -> 정규화 레벨 tuple
+        "team_tokens": {},
+        "fuzzy": None,      # 오타 교정 인덱스 (fuzzy_index.prepare_fuzzy_index)
+    }
+
+
+def add_team_to_store(store: Dict, team_code: str, rows: List[Dict]):
+    team_name = next((r.get("team_name") for r in rows if r.get("team_name")), "")
+    store["teams"][team_code] = {"team_code": team_code, "team_name": team_name}
+    team_tokens = store["team_tokens"].setdefault(team_code, {})
+    for r in rows:
+        if r.get("team_name"):
+            store["team_by_name"].setdefault(search_normalize(r["team_name"]), team_code)
+
+    systems: Dict[str, str] = {}
+    for r in rows:
+        sc = r.get("sys_code", "")
+        if not systems.get(sc):
+            systems[sc] = r.get("sys_name", "")
+        rid = len(store["role_rows"])
+        store["role_rows"].append({
+            "team_code": team_code,
+            "team_name": r.get("team_name", ""),
+            "sys_code": sc,
+            "sys_name": r.get("sys_name", ""),
+            "auth_code": r.get("auth_code", ""),
+            "auth_name": r.get("auth_name", ""),
+            "auth_desc": r.get("auth_desc", ""),
+        })
+        store["role_text"].append(
+            tuple(search_normalize(r.get(f, "")) for f in _ROLE_MATCH_FIELDS) + (str(r.get("auth_code", "")).lower(),)
+        )
+        menus = r.get("menus", []) or []
+        store["role_menus"].append(menus)
+        store["roles"].setdefault((team_code, sc), []).append(rid)
+
+        tokens: Set[str] = set()
+        menu_ids: Set[str] = set()
+        for m in menus:
+            if m.get("menu_id"):
+                menu_ids.add(str(m["menu_id"]).lower())
+            path = str(m.get("path", "") or "")
+            levels = store["path_levels"].get(path)
+            if levels is None:
+                levels = store["path_levels"][path] = tuple(search_normalize(lv) for lv in path.split(">"))
+            tokens.update(tok for tok in levels if tok)
+        for mid in menu_ids:
+            store["by_menu_id"].setdefault(mid, []).append(rid)
+        for tok in tokens:
+            if tok not in store["by_token"]:
+                tid = len(store["tokens"])
+                store["tokens"].append(tok)
+                store["by_token"][tok] = []
+                for g in text_grams(tok):
+                    store["token_grams"].setdefault(g, []).append(tid)
+            store["by_token"][tok].append(rid)
+            team_tokens.setdefault(tok, []).append(rid)
+    store["systems"][team_code] = [{"sys_code": sc, "sys_name": sn} for sc, sn in systems.items()]
+
+
+def load_query_store(out_base: Path) -> Dict:
+    store = new_query_store()
+    for tc, rows in iter_team_bundles(Path(out_base)):
+        add_team_to_store(store, tc, rows)
+    store["fuzzy"] = load_fuzzy(store, Path(out_base))
+    return store
+
+
+def load_fuzzy(store: Dict, out_base: Path) -> Dict:
+    """fuzzy/fuzzy_index.json 이 있으면 그것을, 없으면 store의 권한/메뉴로 같은 인덱스를 만듦"""
+    path = out_base / FUZZY_DIR / FUZZY_INDEX_FILE
+    if path.exists():
+        return prepare_fuzzy_index(json.loads(path.read_text(encoding="utf-8")))
+    index = new_fuzzy_index()
+    for row, menus in zip(store["role_rows"], store["role_menus"]):
+        add_fuzzy_terms(index, row_fuzzy_terms({"auth_name": row["auth_name"], "menus": menus}))
+    return prepare_fuzzy_index(fuzzy_index_doc(index))
+
+
+# =========================
+# 질의
+# =========================
+def resolve_team(store: Dict, team: Optional[str]) -> Optional[str]:
+    """team_code 그대로 또는 팀명(정규화 일치) -> team_code"""
+    if team is None:
+        return None
+    team = str(team).strip()
+    if team in store["teams"]:
+        return team
+    return store["team_by_name"].get(search_normalize(team))
+
+
+def team_role_ids(store: Dict, team_code: str, sys_code: Optional[str] = None) -> List[int]:
+    if sys_code:
+        return store["roles"].get((team_code, sys_code), [])
+    out: List[int] = []
+    for s in store["systems"].get(team_code, []):
+        out.extend(store["roles"].get((team_code, s["sys_code"]), []))
+    return out
+
+
+def role_list(store: Dict, team: str, sys_code: Optional[str] = None) -> List[Dict]:
+    tc = resolve_team(store, team)
+    if tc is None:
+        return []
+    return [store["role_rows"][rid] for rid in team_role_ids(store, tc, sys_code)]
+
+
+def role_to_menu(store: Dict, team: str, sys_code: Optional[str] = None, auth_code: Optional[str] = None) -> List[Dict]:
+    """팀(+시스템, +권한)의 메뉴. 여러 권한이면 (path, menu_id) 중복 제거, 처음 나온 순서"""
+    tc = resolve_team(store, team)
+    if tc is None:
+        return []
+    rids = team_role_ids(store, tc, sys_code)
+    if auth_code:
+        rids = [rid for rid in rids if store["role_rows"][rid]["auth_code"] == auth_code]
+        if len(rids) == 1:
+            return store["role_menus"][rids[0]]
+        return menu_union(store, rids)
+    key = (tc, sys_code or None)
+    cache = store["menu_union"]
+    with store["menu_union_lock"]:
+        hit = cache.get(key)
+        if hit is not None:
+            cache.move_to_end(key)
+            return hit
+    # 계산은 잠금 밖에서 (동시에 같은 키를 계산해도 결과가 같으므로 나중 것이 덮어씀)
+    menus = menu_union(store, rids)
+    with store["menu_union_lock"]:
+        cache[key] = menus
+        cache.move_to_end(key)
+        while len(cache) > MENU_UNION_CACHE_MAX:
+            cache.popitem(last=False)
+    return menus
+
+
+def menu_union(store: Dict, rids: List[int]) -> List[Dict]:
+    seen: Set[Tuple[str, str]] = set()
+    out: List[Dict] = []
+    for rid in rids:
+        for m in store["role_menus"][rid]:
+            key = (m.get("path", ""), m.get("menu_id", ""))
+            if key not in seen:
+                seen.add(key)
+                out.append(m)
+    return out
+
+
+def matching_tokens(store: Dict, keyword: str) -> List[str]:
+    """keyword(정규화)를 부분 문자열로 가진 path 토큰 (프런트 normalize(path).includes(kwd)와 같은 기준)"""
+    kw = search_normalize(keyword)
+    if not kw:
+        return []
+    grams = query_grams(kw)
+    if not grams:  # 1글자: 전체 토큰 확인
+        return [t for t in store["tokens"] if kw in t]
+    cand = set(store["token_grams"].get(grams[0], []))
+    for g in grams[1:]:
+        if not cand:
+            break
+        cand &= set(store["token_grams"].get(g, []))
+    return [store["tokens"][tid] for tid in sorted(cand) if kw in store["tokens"][tid]]
+
+
+def menu_to_role(store: Dict, keyword: str, team: Optional[str] = None) -> List[Dict]:
+    """메뉴 키워드/메뉴ID -> 권한 목록 (team을 주면 그 팀만)"""
+    rids: Set[int] = set(store["by_menu_id"].get(str(keyword).strip().lower(), []))
+    for tok in matching_tokens(store, keyword):
+        rids.update(store["by_token"][tok])
+    tc = resolve_team(store, team) if team else None
+    rows = [store["role_rows"][rid] for rid in sorted(rids)]
+    if team:
+        rows = [r for r in rows if r["team_code"] == tc]
+    return rows
+
+
+def query(store: Dict, intent_type: str, team: Optional[str] = None, sys_code: Optional[str] = None,
+          auth_code: Optional[str] = None, keyword: str = "", limit: int = DEFAULT_LIMIT) -> Dict:
+    """intent 하나 -> {"type","count","items"} (items는 limit까지)"""
+    if intent_type == "ROLE_LIST":
+        items = role_list(store, team or "", sys_code)
+    elif intent_type == "ROLE_TO_MENU":
+        items = role_to_menu(store, team or "", sys_code, auth_code)
+    elif intent_type == "MENU_TO_ROLE":
+        items = menu_to_role(store, keyword, team)
+    else:
+        raise ValueError(f"unknown intent type: {intent_type!r} (expected one of {INTENT_TYPES})")
+    return {"type": intent_type, "count": len(items), "items": items[:limit]}
+
+
+# =========================
+# 후보 선해석 (intent 결과 -> 권한/메뉴 hit)
+# =========================
+# App.tsx 검색 토큰 규칙과 같음: 구분자로 자르고 2글자 미만 / stopword 제외
+RESOLVE_STOPWORDS = frozenset([
+    "메뉴", "권한", "역할", "접근", "가능", "보여줘", "알려줘", "찾아줘",
+    "필요", "필요한", "어떻게", "뭐", "뭐야", "뭐뭐",
+    "전체", "모두", "전부", "다", "조회", "확인", "해줘", "해주세요", "주세요",
+    "부탁", "관련", "내", "우리", "팀", "시스템",
+])
+_RE_RESOLVE_SPLIT = re.compile(r"[\s_/\-.|]+")
+_RE_CONTEXT_CODE = re.compile(r"\(([^()]*)\)\s*$")
+RESOLVE_TYPES = ("ROLE_TO_MENU", "MENU_TO_ROLE")
+FUZZY_SUGGEST_K = 3
+
+
+def context_code(value) -> str:
+    """App.tsx가 보내는 "팀명 (team_code)" / "시스템명 (sys_code)" -> 코드 (괄호가 없으면 그대로)"""
+    s = str(value or "").strip()
+    m = _RE_CONTEXT_CODE.search(s)
+    return m.group(1).strip() if m else s
+
+
+def resolve_keywords(intent: Dict, query_text: str = "") -> List[str]:
+    """keyword + candidates (+ 원문) -> 정규화 검색어 (중복 제거, 나온 순서)"""
+    out: List[str] = []
+    terms = [intent.get("keyword", "")] + list(intent.get("candidates") or [])
+    for t in terms + [query_text]:
+        # keyword/candidates는 자르기 전 전체도 검색어로 (menu_id, ZC_FI_01 같은 코드)
+        parts = _RE_RESOLVE_SPLIT.split(str(t or ""))
+        if t is not query_text and len(parts) > 1:
+            parts.insert(0, str(t))
+        for part in parts:
+            n = search_normalize(part)
+            if len(part.strip()) < 2 or part.strip() in RESOLVE_STOPWORDS or n in RESOLVE_STOPWORDS:
+                continue
+            if n and n not in out:
+                out.append(n)
+    return out
+
+
+def resolve_menu_ids(intent: Dict) -> Set[str]:
+    """menu_id 정확 일치는 자르지 않은 keyword/candidates 전체로만 (pjt.core.x 의 "pjt" 조각 제외)"""
+    return {str(t).strip().lower() for t in [intent.get("keyword", "")] + list(intent.get("candidates") or []) if t}
+
+
+def match_quality(kw: str, text: str) -> int:
+    """정확히 같음 3 > 앞부분 일치 2 > 부분일치 1 > 없음 0 (text는 정규화된 값)"""
+    if not kw or kw not in text:
+        return 0
+    if kw == text:
+        return 3
+    return 2 if text.startswith(kw) else 1
+
+
+def _resolve_in_scope(store: Dict, kws: List[str], menu_ids: Set[str], team_code: Optional[str],
+                      sys_code: Optional[str]) -> List[Tuple]:
+    """범위(팀/시스템) 안의 hit -> [(score, rid, path, menu_id)]"""
+    scope = team_role_ids(store, team_code, sys_code) if team_code else range(len(store["role_rows"]))
+    in_scope = set(scope)
+
+    # 1) 메뉴 hit 후보 권한: 토큰 인덱스 + menu_id 정확 일치. 토큰별 점수는 질의당 1번만 계산
+    token_q: Dict[str, int] = {}
+    menu_rids: Set[int] = set()
+    for mid in menu_ids:
+        menu_rids.update(store["by_menu_id"].get(mid, []))
+    postings = store["team_tokens"].get(team_code, {}) if team_code else store["by_token"]
+    for kw in kws:
+        for tok in matching_tokens(store, kw):
+            menu_rids.update(postings.get(tok, []))
+            token_q[tok] = max(token_q.get(tok, 0), match_quality(kw, tok))
+    menu_rids &= in_scope
+
+    # 2) 권한 자체 hit: 팀/시스템/권한명/설명/권한코드 부분일치
+    role_score: Dict[int, int] = {}
+    for rid in scope:
+        best = max((match_quality(kw, f) for kw in kws for f in store["role_text"][rid]), default=0)
+        if best:
+            role_score[rid] = best
+
+    # path 점수는 질의당 path마다 1번 (권한끼리 같은 메뉴를 많이 공유)
+    path_q: Dict[str, int] = {}
+
+    def score_path(path: str) -> int:
+        q = path_q.get(path)
+        if q is None:
+            q = path_q[path] = max((token_q.get(lv, 0) for lv in store["path_levels"][path]), default=0)
+        return q
+
+    hits: List[Tuple] = []
+    for rid in sorted(menu_rids):
+        bonus = 0.5 if rid in role_score else 0.0
+        found = False
+        for m in store["role_menus"][rid]:
+            mid = str(m.get("menu_id", "") or "")
+            path = str(m.get("path", "") or "")
+            q = 4 if menu_ids and mid.lower() in menu_ids else score_path(path)
+            if q:
+                hits.append((q + bonus, rid, path, mid))
+                found = True
+        if found:
+            role_score.pop(rid, None)
+    # 메뉴 hit 없이 권한만 걸린 경우: menu_id "" (프런트는 그 권한의 전체 메뉴를 보여줌)
+    hits.extend((score, rid, "", "") for rid, score in role_score.items())
+    return hits
+
+
+def suggest_names(store: Dict, keywords: List[str], k: int = FUZZY_SUGGEST_K) -> List[Dict]:
+    """검색어별 가까운 메뉴/권한 이름 (편집 거리 1 이상만 = 실제 교정), 이름 중복 제거"""
+    if not store.get("fuzzy"):
+        return []
+    out: List[Dict] = []
+    seen: Set[str] = set()
+    for kw in keywords:
+        if len(kw) < 3:  # 2글자 이하는 거리 1~2 후보가 너무 많음
+            continue
+        for s in fuzzy_lookup(store["fuzzy"], kw, k):
+            if s["distance"] > 0 and s["text"] not in seen:
+                seen.add(s["text"])
+                out.append(dict(s, keyword=kw))
+    return out
+
+
+def resolve_candidates(store: Dict, intent: Dict, team: str = "", system: str = "", query_text: str = "",
+                       limit: int = DEFAULT_LIMIT) -> Dict:
+    """
+    intent 결과 -> 점수순 hit
+    - hits      : [{"team_code","sys_code","auth_code","menu_id","path","score"}]  (menu_id ""이면 권한 단위 hit)
+    - hit_roles : "team_code|sys_code|auth_code" -> 권한 행 (표시용)
+    - 범위: 선택 팀(+시스템). 시스템 안에서 hit가 없으면 팀 전체로 넓힘 (App.tsx runSearch와 같은 순서)
+    - hit가 하나도 없으면 suggestions: 검색어별 오타 교정 후보 이름 (다시 물어볼 때 쓰도록)
+    """
+    empty = {"hits": [], "hit_roles": {}, "hit_count": 0}
+    if intent.get("type") not in RESOLVE_TYPES or intent.get("keyword") == "CONTINUE":
+        return empty
+    kws = resolve_keywords(intent, query_text)
+    menu_ids = resolve_menu_ids(intent)
+    if not kws:
+        return empty
+    team_code = context_code(team)
+    tc = resolve_team(store, team_code) if team_code else None
+    if team_code and tc is None:
+        return empty
+    sc = context_code(system) or None
+
+    hits: List[Tuple] = []
+    for scope_sys in ([sc, None] if sc else [None]):
+        hits = _resolve_in_scope(store, kws, menu_ids, tc, scope_sys)
+        if hits:
+            break
+    hits.sort(key=lambda h: (-h[0], h[1], h[2]))
+
+    if not hits:
+        return dict(empty, suggestions=suggest_names(store, kws))
+
+    out, roles = [], {}
+    for score, rid, path, mid in hits[:limit]:
+        row = store["role_rows"][rid]
+        key = f"{row['team_code']}|{row['sys_code']}|{row['auth_code']}"
+        roles.setdefault(key, row)
+        out.append({"team_code": row["team_code"], "sys_code": row["sys_code"], "auth_code": row["auth_code"],
+                    "menu_id": mid, "path": path, "score": score})
+    return {"hits": out, "hit_roles": roles, "hit_count": len(hits)}
+
+
+# =========================
+# HTTP (표준 라이브러리만)
+# =========================
+def int_param(q: Dict[str, str], name: str, default: int, max_value: int) -> int:
+    """쿼리 정수 파라미터 -> 1..max_value 로 자름. 숫자가 아니면 ValueError (-> 400)"""
+    raw = q.get(name, "")
+    if raw.strip() == "":
+        return default
+    try:
+        value = int(raw)
+    except ValueError:
+        raise ValueError(f"{name} must be an integer: {raw!r}") from None
+    return max(1, min(value, max_value))
+
+
+def make_handler(store: Dict, vocab: Optional[Dict] = None, threshold: float = DEFAULT_THRESHOLD):
+    class QueryHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive (부하 테스트에서 연결 재사용)
+        disable_nagle_algorithm = True  # 헤더/본문 두 번 쓰기 + delayed ACK로 응답마다 ~40ms 지연되는 것 방지
+
+        def _send(self, status: int, body: Dict):
+            raw = json.dumps(body, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(raw)))
+            self.end_headers()
+            self.wfile.write(raw)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path == "/api/health":
+                return self._send(200, {"ok": True, "teams": len(store["teams"]), "roles": len(store["role_rows"])})
+            qs = parse_qs(url.query)
+            q = {k: v[0] for k, v in qs.items()}
+            try:
+                limit = int_param(q, "limit", DEFAULT_LIMIT, MAX_LIMIT)
+                k = int_param(q, "k", DEFAULT_FUZZY_K, MAX_FUZZY_K)
+            except ValueError as e:
+                return self._send(400, {"error": str(e)})
+            if url.path == "/api/intent" and vocab is not None:
+                t0 = time.perf_counter()
+                team = q.get("team", "")
+                # App.tsx는 "팀명 (코드)" 형태로 보내므로 분류에는 괄호 앞 이름을 넘김
+                res = classify(vocab, q.get("query", ""), team.split(" (")[0], q.get("system", ""), threshold)
+                if q.get("resolve", "1") != "0":
+                    res.update(resolve_candidates(store, res, team, q.get("system", ""), q.get("query", ""), limit))
+                res["elapsed_us"] = round((time.perf_counter() - t0) * 1e6, 1)
+                return self._send(200, res)
+            if url.path == "/api/fuzzy":
+                t0 = time.perf_counter()
+                kinds = qs.get("kind") or None
+                items = fuzzy_lookup(store["fuzzy"], q.get("q", ""), k, kinds) if store.get("fuzzy") else []
+                return self._send(200, {"items": items, "elapsed_us": round((time.perf_counter() - t0) * 1e6, 1)})
+            if url.path == "/api/resolve":
+                t0 = time.perf_counter()
+                intent = {"type": q.get("type", ""), "keyword": q.get("keyword", ""), "candidates": qs.get("candidate", [])}
+                res = resolve_candidates(store, intent, q.get("team", ""), q.get("system", ""), q.get("query", ""), limit)
+                res["elapsed_us"] = round((time.perf_counter() - t0) * 1e6, 1)
+                return self._send(200, res)
+            if url.path != "/api/query":
+                return self._send(404, {"error": "Not Found"})
+            t0 = time.perf_counter()
+            try:
+                res = query(
+                    store, q.get("type", ""), team=q.get("team"), sys_code=q.get("sys"), auth_code=q.get("auth"),
+                    keyword=q.get("keyword", ""), limit=limit,
+                )
+            except ValueError as e:
+                return self._send(400, {"error": str(e)})
+            res["elapsed_us"] = round((time.perf_counter() - t0) * 1e6, 1)
+            return self._send(200, res)
+
+        def log_message(self, fmt, *args):  # 요청마다 stderr 출력 안 함
+            pass
+
+    return QueryHandler
+
+
+def make_server(store: Dict, host: str = "127.0.0.1", port: int = 3002, vocab: Optional[Dict] = None,
+                threshold: float = DEFAULT_THRESHOLD) -> ThreadingHTTPServer:
+    return ThreadingHTTPServer((host, port), make_handler(store, vocab, threshold))
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="권한 조회 서비스 (메모리 인덱스 + HTTP)")
+    ap.add_argument("out_base", nargs="?", default=str(Path(__file__).resolve().parent.parent / "public" / "data"))
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=3002)
+    ap.add_argument("--intent-threshold", type=float, default=DEFAULT_THRESHOLD,
+                    help="이 값 미만 confidence는 escalate=true (LLM으로 넘김)")
+    args = ap.parse_args()
+
+    t0 = time.perf_counter()
+    store = load_query_store(Path(args.out_base))
+    print(
+        f"[QUERY] loaded teams={len(store['teams'])} roles={len(store['role_rows'])} "
+        f"menu_ids={len(store['by_menu_id'])} tokens={len(store['tokens'])} ({time.perf_counter() - t0:.2f}s)"
+    )
+    vocab = build_intent_vocab(store)
+    server = make_server(store, args.host, args.port, vocab, args.intent_threshold)
+    print(f"[QUERY] listening on http://{args.host}:{args.port}/api/query (+ /api/intent, /api/resolve, /api/fuzzy)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,6 +5,8 @@ from typing import Dict, List, Tuple
 
 import pandas as pd
 
+from normalize_vec import build_sap_desc_series
+
 # =========================
 # 설정
 # =========================
@@ -87,6 +89,14 @@ def build_sap_auth_desc(level3_list: List[str], topn: int = 3) -> str:
         return "여러 메뉴 등이 있습니다."
     return f"{', '.join(uniq[:topn])} 등이 있습니다."
 
+def fill_sap_auth_desc(df: pd.DataFrame) -> pd.Series:
+    """권한별로 3level 모아 desc 생성 -> 키 조인으로 auth_desc가 빈 행만 채움"""
+    keys = ["team_code", "sys_code", "auth_code"]
+    sap_desc = build_sap_desc_series(df, keys, "3level", topn=SAP_DESC_TOPN)
+    gen = df[keys].merge(sap_desc.rename("_gen").reset_index(), how="left", on=keys)["_gen"].fillna("")
+    has_desc = df["auth_desc"].str.strip() != ""
+    return df["auth_desc"].where(has_desc, gen.to_numpy())
+
 # =========================
 # 읽기: 원본 그대로 읽고(=dtype=str 사용 X) -> 우리가 직접 문자열 변환
 # =========================
@@ -132,19 +142,7 @@ def normalize_df(df: pd.DataFrame, is_ias: bool, is_sap: bool) -> pd.DataFrame:
 
     # SAP: auth_desc가 비었으면 생성(권한 단위)
     if is_sap:
-        # 권한별로 3level 모아 desc 생성
-        sap_desc_map = (
-            df.groupby(["team_code", "sys_code", "auth_code"])["3level"]
-              .apply(lambda s: build_sap_auth_desc(s.tolist(), topn=SAP_DESC_TOPN))
-              .to_dict()
-        )
-
-        def fill_sap_desc(row):
-            if row["auth_desc"].strip():
-                return row["auth_desc"]
-            return sap_desc_map.get((row["team_code"], row["sys_code"], row["auth_code"]), "")
-
-        df["auth_desc"] = df.apply(fill_sap_desc, axis=1)
+        df["auth_desc"] = fill_sap_auth_desc(df)
 
     return df
 
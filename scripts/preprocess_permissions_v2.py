@@ -8,6 +8,7 @@
 2) team_code / dept_code / role_code 등 코드 정규화 강화(선행0/float .0 등)
 3) apply_level_mapping의 out.get(...) 버그 수정(컬럼 없을 때 .map 호출 오류 방지)
 4) 기존 by_team/*.jsonl까지 읽어서 번들도 보존(가능한 경우)
+5) 역할별 메뉴 확장은 고유 권한 행(ROLE_KEY_COLS) 기준 (사용자 행 x 메뉴는 결과 엑셀을 쓸 때만)
 
 사용 방법
 - CONFIG.paths.excel_a / excel_b / out_base / out_xlsx 경로만 본인 환경에 맞게 확인
@@ -15,13 +16,71 @@
 - 없으면: 이번 결과만 생성
 """
 
+import argparse
+import gzip
+import hashlib
+import importlib.util
 import json
+import os
 import re
+import sys
+import time
+import xml.etree.ElementTree as ET
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, Iterable, List, Tuple, Optional
 
+import numpy as np
 import pandas as pd
 
+from normalize_vec import (
+    build_sap_desc_series,
+    canon_team_code_series,
+    canonical_cols,
+    canonical_series,
+    carry_canonical,
+    concat_canonical,
+    mark_canonical,
+    norm_code_series,
+    norm_text_series,
+    normalize_columns,
+    to_category,
+)
+from binary_bundle import (
+    BINARY_BUNDLE_FILE,
+    add_binary_team,
+    binary_bundle_bytes,
+    new_binary_bundle,
+)
+from fuzzy_index import (
+    FUZZY_DIR,
+    FUZZY_INDEX_FILE,
+    add_fuzzy_terms,
+    fuzzy_index_text,
+    new_fuzzy_index,
+    row_fuzzy_terms,
+)
+from menu_tree import with_menu_tree
+from stage_profiler import (
+    BUDGET_KEYS,
+    BUILD_REPORT_FILE,
+    build_report,
+    new_stage_profiler,
+    peak_rss_mb,
+    print_stage_table,
+    stage,
+    write_build_report,
+)
+
+# 선택 의존성: 있으면 시트 캐시를 Parquet(columnar)로, 없으면 pickle로 저장 (import 없이 설치 여부만 확인)
+HAS_ARROW = importlib.util.find_spec("pyarrow") is not None
+
+try:  # 선택: .br 사이드카. 없으면 .gz만 만들고 보고서에 표시
+    import brotli
+except ImportError:
+    brotli = None
+
 
 # =========================
 # CONFIG
@@ -35,6 +94,9 @@ CONFIG: Dict = {
 
         # ✅ 기존 산출물이 이미 있는 폴더(append-only merge 기준)
         "out_base": r"D:\works\GEN_AI\auth_chat\auth_chat_2_restore\public\data",
+
+        # ✅ 증분 빌드 캐시(build_manifest.json + 파싱된 시트). public 아래 두지 말 것(배포됨)
+        "cache_dir": r"D:\works\GEN_AI\auth_chat\auth_chat_2_restore\.build_cache",
     },
     "sheets_a": {
         "sap_users": ["SAP 권한별 임직원"],
@@ -96,8 +158,74 @@ CONFIG: Dict = {
         "out_sheet_log": "로그",
         "IAS_SYS_NAME_FORCED": "IAS_Sales",
     },
+    "output": {
+        # 번들 메뉴 기록 방식
+        # - "inline" : 번들마다 menus=[{"path","menu_id"}] 전체 기록(기존)
+        # - "catalog": menu_catalog.json 1개에 메뉴를 모으고 번들은 menu_refs=[정수 id]만 기록
+        "bundle_menus": "inline",
+        # 번들 저장 방식
+        # - "inline": by_team/*.jsonl 한 줄에 번들 전체 기록(기존)
+        # - "shared": 권한+메뉴 payload를 해시해 by_role/<hash>.json 1회만 저장,
+        #             by_team/*.jsonl은 팀 메타 + role_ref(해시)만 담는 manifest
+        "bundle_store": "inline",
+        # True: 팀별 역인덱스 menu_index/menu_index_team_<team_code>.json 생성
+        #       (메뉴 path / menu_id -> 그 메뉴를 가진 (team_code, sys_code, auth_code))
+        #       서버/운영 도구용 MENU_TO_ROLE 조회 파일. 화면(App.tsx)은 받지 않음
+        "menu_index": True,
+        # True: 오타 교정용 fuzzy/fuzzy_index.json 생성 (auth_name / 메뉴 3level / menu_id, 자모 SymSpell 삭제 사전)
+        "fuzzy_index": True,
+        # True: 번들마다 menu_tree(정렬된 L1/L2/L3 트리) + menu_order(한글 우선 정렬 순서) 기록
+        #       (값은 menus 위치 목록 -> 화면/페이지네이션은 정렬 없이 자르기만. shared 모드면 by_role payload에 포함)
+        #       기본 off: by_team 이 커지고(약 15%) 정렬은 localeCompare 근사 -> 화면 정렬 비용이 문제일 때만 켬
+        #       (App.tsx 는 menu_tree 순서가 브라우저 정렬과 다르면 다시 정렬, 규칙 검증은 scripts/check_menu_tree_order.py)
+        "menu_tree": False,
+        # True: 팀별 roles/<team_code>.json (systems + roles) + roles/manifest.json 생성
+        #       (index_systems_by_team.json / index_roles_by_team_sys.json 도 호환용으로 계속 씀)
+        "role_shards": True,
+        # True: 서버 측 조회용 바이너리 번들 permissions.bin (고정폭 테이블 + 문자열 풀, binary_bundle.BinaryBundle로 mmap)
+        "binary_bundle": True,
+        # True: 통합 결과 엑셀(out_xlsx) 기록. 실행 시 --no-excel 로 끔
+        "excel": True,
+    },
+    "build": {
+        # True: 시트 fingerprint가 같으면 캐시된 파싱 결과 사용 + 내용이 바뀐 팀 파일만 다시 씀
+        "incremental": True,
+        # by_team merge/write 병렬 프로세스 수 (1=직렬, 0=CPU 수). 실행 시 --workers N 으로 덮어씀
+        "workers": 1,
+        # True: 코드/이름/레벨 컬럼을 union 직후부터 pandas category로 유지 (메모리 / merge / drop_duplicates)
+        "category": True,
+    },
+    "finalize": {
+        # True: index_*.json / menu_catalog.json 을 indent 없이, by_team jsonl도 공백 없는 구분자로 기록
+        #       (배포용. 실행 시 --minify 로도 켬)
+        "minify": False,
+        # True: 산출물(*.json, *.jsonl)마다 같은 폴더에 .gz / .br 사이드카 생성 (실행 시 --precompress)
+        #       services/index.ts 가 Accept-Encoding을 보고 사이드카를 그대로 응답
+        "gzip": False,
+        "brotli": False,
+        "gzip_level": 9,
+        "brotli_quality": 11,
+    },
+    "profile": {
+        # True: main()의 단계별 wall/CPU 시간, 행 수, 메모리를 cache_dir/build_report.json 에 기록 (--report 로 경로 변경)
+        "report": True,
+        # cProfile을 켤 단계 이름 목록 ("all" = 전부). 덤프는 cache_dir/profiles/<순번>_<단계>.prof
+        # 실행 시 --profile all 또는 --profile level_mapping,write_bundles
+        "cprofile_stages": [],
+        # 단계별 예산: {"단계": {"wall_s": 초, "cpu_s": 초, "rss_peak_mb": MB}} -> 넘으면 보고서 기록 후 exit 1
+        # 실행 시 --budget level_mapping.wall_s=30 (여러 번 가능)
+        "budgets": {},
+        # 단계 중 RSS 최댓값 측정 간격(초). 0이면 측정 안 함
+        "sample_interval_s": 0.02,
+    },
 }
 
+MENU_CATALOG_FILE = "menu_catalog.json"
+BY_ROLE_DIR = "by_role"
+MENU_INDEX_DIR = "menu_index"
+ROLES_DIR = "roles"
+ROLE_PAYLOAD_KEYS = ["sys_code", "sys_name", "auth_code", "auth_name", "auth_desc", "menus", "menu_refs", "menu_tree", "menu_order"]
+
 
 # =========================
 # 유틸
@@ -166,12 +294,16 @@ def ensure_any_col(df: pd.DataFrame, candidates: List[str], label: str, sheet_na
     return c
 
 
-def resolve_sheet_name(path: Path, candidates: List[str]) -> str:
-    xls = pd.ExcelFile(path)
+def pick_sheet_name(sheet_names: List[str], candidates: List[str]) -> str:
     for c in candidates:
-        if c in xls.sheet_names:
+        if c in sheet_names:
             return c
-    raise ValueError(f"시트를 찾지 못했습니다. 후보={candidates}\n실제 시트={xls.sheet_names}")
+    raise ValueError(f"시트를 찾지 못했습니다. 후보={candidates}\n실제 시트={sheet_names}")
+
+
+def resolve_sheet_name(path: Path, candidates: List[str]) -> str:
+    with pd.ExcelFile(path) as xls:
+        return pick_sheet_name(xls.sheet_names, candidates)
 
 
 def read_sheet_raw(path: Path, sheet: str) -> pd.DataFrame:
@@ -199,6 +331,200 @@ def log_join_rate(tag: str, left_cnt: int, matched_cnt: int):
     print(f"[JOIN] {tag}: matched {matched_cnt}/{left_cnt} ({rate:.2f}%)")
 
 
+# =========================
+# ✅ NEW: 증분 빌드 (시트 fingerprint / 팀 출력 해시 manifest)
+# =========================
+BUILD_MANIFEST_FILE = "build_manifest.json"
+SHEET_CACHE_VERSION = 2
+
+NS_MAIN = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+NS_REL = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+NS_PKG_REL = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+
+def sha256_bytes(*parts: bytes) -> str:
+    h = hashlib.sha256()
+    for b in parts:
+        h.update(b)
+    return h.hexdigest()
+
+
+def xlsx_sheet_parts(z: zipfile.ZipFile) -> Dict[str, str]:
+    """시트명 -> zip 내부 worksheet xml 경로 (xl/workbook.xml + rels 해석, 시트 순서 유지)"""
+    wb = ET.fromstring(z.read("xl/workbook.xml"))
+    rels = ET.fromstring(z.read("xl/_rels/workbook.xml.rels"))
+    targets = {r.get("Id"): r.get("Target", "") for r in rels.iter(f"{NS_PKG_REL}Relationship")}
+    parts: Dict[str, str] = {}
+    for sh in wb.iter(f"{NS_MAIN}sheet"):
+        t = targets.get(sh.get(f"{NS_REL}id"), "")
+        parts[sh.get("name")] = t.lstrip("/") if t.startswith("/") else f"xl/{t}"
+    return parts
+
+
+def scan_workbook(path: Path) -> Dict:
+    """
+    워크북을 파싱하지 않고(zip만 열어서) 시트 목록 + 시트별 content hash 계산.
+    - xlsx: worksheet xml + sharedStrings.xml (문자열 셀은 sharedStrings를 참조하므로 함께 해시)
+      -> 다른 시트의 문자열만 바뀌어도 sharedStrings가 바뀌면 보수적으로 '변경'으로 판단
+    - zip이 아니면(xls 등): pd.ExcelFile로 시트 목록만 읽고 파일 전체 해시를 모든 시트에 사용
+    """
+    ver = str(SHEET_CACHE_VERSION).encode()
+    try:
+        with zipfile.ZipFile(path) as z:
+            parts = xlsx_sheet_parts(z)
+            names = set(z.namelist())
+            shared = z.read("xl/sharedStrings.xml") if "xl/sharedStrings.xml" in names else b""
+            fps = {sh: sha256_bytes(ver, sh.encode("utf-8"), z.read(part), shared) for sh, part in parts.items()}
+            return {"sheet_names": list(parts.keys()), "fingerprints": fps}
+    except (zipfile.BadZipFile, KeyError):
+        with pd.ExcelFile(path) as xls:
+            sheet_names = list(xls.sheet_names)
+        whole = Path(path).read_bytes()
+        return {"sheet_names": sheet_names, "fingerprints": {sh: sha256_bytes(ver, sh.encode("utf-8"), whole) for sh in sheet_names}}
+
+
+def workbook_info(path: Path, manifest: Dict) -> Dict:
+    """mtime/size가 manifest와 같으면 zip도 열지 않고 저장된 시트 목록/해시 재사용"""
+    st = Path(path).stat()
+    key = Path(path).name
+    ent = manifest["files"].get(key)
+    if ent and ent.get("mtime_ns") == st.st_mtime_ns and ent.get("size") == st.st_size and ent.get("version") == SHEET_CACHE_VERSION:
+        return ent
+    info = scan_workbook(path)
+    ent = {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "version": SHEET_CACHE_VERSION, **info}
+    manifest["files"][key] = ent
+    return ent
+
+
+def load_build_manifest(cache_dir: Path) -> Dict:
+    p = cache_dir / BUILD_MANIFEST_FILE
+    if p.exists():
+        m = json.loads(p.read_text(encoding="utf-8"))
+    else:
+        m = {}
+    m.setdefault("files", {})
+    m.setdefault("sheets", {})
+    m.setdefault("teams", {})
+    m.setdefault("final", {})
+    return m
+
+
+def save_build_manifest(cache_dir: Path, manifest: Dict):
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    (cache_dir / BUILD_MANIFEST_FILE).write_text(
+        json.dumps(manifest, ensure_ascii=False, indent=2, sort_keys=True),
+        encoding="utf-8",
+    )
+
+
+def save_sheet_cache(cache_dir: Path, key: str, df: pd.DataFrame) -> str:
+    """
+    정리된 시트를 캐시에 저장하고 파일명 반환.
+    - pyarrow가 있으면 Parquet 시도 -> 다시 읽어 원본과 완전히 같을 때만 채택
+      (한 컬럼에 숫자/문자가 섞인 원본 시트는 Arrow로 표현 불가 -> pickle)
+    - 아니면 pickle
+    """
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    stem = f"sheet_{hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]}"
+    if HAS_ARROW:
+        p = cache_dir / f"{stem}.parquet"
+        try:
+            df.to_parquet(p, index=True)
+            pd.testing.assert_frame_equal(pd.read_parquet(p), df)
+            return p.name
+        except Exception:
+            p.unlink(missing_ok=True)
+    p = cache_dir / f"{stem}.pkl"
+    df.to_pickle(p)
+    return p.name
+
+
+def load_sheet_cache(cache_dir: Path, name: str) -> pd.DataFrame:
+    p = cache_dir / name
+    return pd.read_parquet(p) if p.suffix == ".parquet" else pd.read_pickle(p)
+
+
+def load_workbook_sheets(
+    path: Path,
+    wanted: Dict[str, List[str]],
+    cache_dir: Path,
+    manifest: Optional[Dict],
+) -> Dict[str, Tuple[str, pd.DataFrame]]:
+    """
+    필요한 시트를 한 번에 로드: {논리키: 시트명 후보} -> {논리키: (실제 시트명, df)}
+    - 시트명 확인/fingerprint는 zip 메타만 사용(워크북 파싱 X)
+    - 캐시 hit 시트는 캐시에서, miss 시트만 워크북을 "1번만" 열어 한 번에 읽음
+    - manifest=None(증분 끔)이면 캐시 없이 워크북 1회 오픈으로 전부 읽음
+    """
+    if manifest is None:
+        with pd.ExcelFile(path) as xls:
+            resolved = {k: pick_sheet_name(xls.sheet_names, cands) for k, cands in wanted.items()}
+            raw = pd.read_excel(xls, sheet_name=list(dict.fromkeys(resolved.values())))
+        return {k: (sh, clean_columns(raw[sh])) for k, sh in resolved.items()}
+
+    info = workbook_info(path, manifest)
+    resolved = {k: pick_sheet_name(info["sheet_names"], cands) for k, cands in wanted.items()}
+
+    loaded: Dict[str, pd.DataFrame] = {}
+    missing: List[str] = []
+    for sh in dict.fromkeys(resolved.values()):
+        key = f"{Path(path).name}::{sh}"
+        ent = manifest["sheets"].get(key)
+        if ent and ent.get("fingerprint") == info["fingerprints"][sh] and (cache_dir / ent.get("cache", "")).is_file():
+            loaded[sh] = load_sheet_cache(cache_dir, ent["cache"])
+            print(f"[CACHE] hit  {key}")
+        else:
+            missing.append(sh)
+
+    if missing:
+        with pd.ExcelFile(path) as xls:
+            raw = pd.read_excel(xls, sheet_name=missing)
+        for sh in missing:
+            key = f"{Path(path).name}::{sh}"
+            df = clean_columns(raw[sh])
+            name = save_sheet_cache(cache_dir, key, df)
+            manifest["sheets"][key] = {"fingerprint": info["fingerprints"][sh], "cache": name, "rows": len(df)}
+            loaded[sh] = df
+            print(f"[CACHE] miss {key} (rows={len(df)}, cache={Path(name).suffix[1:]})")
+
+    return {k: (sh, loaded[sh]) for k, sh in resolved.items()}
+
+
+def write_lines_if_changed(out_path: Path, lines: Iterable[str], manifest: Optional[Dict], key: str) -> bool:
+    """
+    lines를 같은 폴더의 임시 파일에 한 줄씩 쓰면서 해시 계산 -> 바뀐 경우만 os.replace(원자적 교체)
+    - 출력 해시가 manifest와 같고 파일이 있으면 임시 파일만 지우고 끝(배포 diff에 실제 변경만 남김)
+    - manifest=None이면 항상 교체. 반환: 실제로 교체했는지
+    """
+    tmp = out_path.with_name(f".{out_path.name}.tmp")
+    h = hashlib.sha256()
+    with tmp.open("w", encoding="utf-8") as f:
+        for line in lines:
+            h.update(line.encode("utf-8"))
+            f.write(line)
+    digest = h.hexdigest()
+    if manifest is not None and manifest["teams"].get(key) == digest and out_path.exists():
+        tmp.unlink()
+        return False
+    os.replace(tmp, out_path)
+    if manifest is not None:
+        manifest["teams"][key] = digest
+    return True
+
+
+def write_bytes_if_changed(out_path: Path, data: bytes, manifest: Optional[Dict], key: str) -> bool:
+    """write_lines_if_changed의 바이너리 버전 (해시가 같고 파일이 있으면 건너뜀)"""
+    digest = hashlib.sha256(data).hexdigest()
+    if manifest is not None and manifest["teams"].get(key) == digest and out_path.exists():
+        return False
+    tmp = out_path.with_name(f".{out_path.name}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, out_path)
+    if manifest is not None:
+        manifest["teams"][key] = digest
+    return True
+
+
 # =========================
 # 요구 1) 중복제거
 # =========================
@@ -228,20 +554,26 @@ def to_team_priv_format(
 ) -> pd.DataFrame:
     df = df_src.copy()
 
-    df["team_name"] = df[col_dept_name].map(norm_text)
-    df["team_code"] = df[col_dept_code].map(canon_team_code)
+    df["team_name"] = norm_text_series(df[col_dept_name])
+    df["team_code"] = canon_team_code_series(df[col_dept_code])
 
     df["sys_code"] = norm_text(sys_code)
     df["sys_name"] = norm_text(sys_code)
 
-    df["auth_code"] = df[col_role_code].map(norm_code)
-    df["auth_name"] = df[col_role_name].map(norm_text)
+    df["auth_code"] = norm_code_series(df[col_role_code])
+    df["auth_name"] = norm_text_series(df[col_role_name])
 
     if col_desc and col_desc in df.columns:
-        df["auth_desc"] = df[col_desc].map(norm_text)
+        df["auth_desc"] = norm_text_series(df[col_desc])
     else:
         df["auth_desc"] = ""
 
+    # 이후 단계에서 같은 컬럼을 다시 정규화하지 않도록 표시
+    mark_canonical(df, {
+        "team_name": "text", "team_code": "team", "sys_code": "text", "sys_name": "text",
+        "auth_code": "code", "auth_name": "text", "auth_desc": "text",
+    })
+
     if col_start and col_start in df.columns:
         df["start_date"] = df[col_start]
     else:
@@ -268,28 +600,23 @@ def fill_sap_auth_desc_from_tcode(
     topn: int,
 ) -> Tuple[pd.DataFrame, pd.DataFrame]:
     t = df_tcode.copy()
-    t["auth_code"] = t[role_code_col].map(norm_code)
-    t["role_name"] = t[role_name_col].map(norm_text)
-    t["menu_name"] = t[menu_name_col].map(norm_text)
+    t["auth_code"] = norm_code_series(t[role_code_col])
+    t["role_name"] = norm_text_series(t[role_name_col])
+    t["menu_name"] = norm_text_series(t[menu_name_col])
 
-    t.loc[t["menu_name"] == "", "menu_name"] = t.loc[t["menu_name"] == "", "role_name"]
+    t["menu_name"] = t["menu_name"].where(t["menu_name"] != "", t["role_name"])
 
-    role_desc_map = (
-        t.groupby("auth_code")["menu_name"]
-         .apply(lambda s: build_sap_role_desc(s.tolist(), topn=topn))
-         .to_dict()
-    )
-    map_df = pd.DataFrame([{"auth_code": k, "sap_generated_desc": v} for k, v in role_desc_map.items()])
+    role_desc = build_sap_desc_series(t, ["auth_code"], "menu_name", topn=topn)
+    map_df = role_desc.rename("sap_generated_desc").reset_index()
 
     df = df_team_sap.copy()
-
-    def _fill(row):
-        cur = norm_text(row.get("auth_desc", ""))
-        if cur:
-            return cur
-        return role_desc_map.get(norm_code(row.get("auth_code", "")), "")
-
-    df["auth_desc"] = df.apply(_fill, axis=1)
+    if "auth_desc" in df.columns:
+        cur = canonical_series(df, "auth_desc", "text")
+    else:
+        cur = pd.Series("", index=df.index, dtype=object)
+    # auth_code -> 생성 desc 조인 (행 단위 apply 대신 인덱스 조인)
+    gen = canonical_series(df, "auth_code", "code").map(role_desc).fillna("")
+    df["auth_desc"] = cur.where(cur != "", gen)
     print(f"[SAP DESC] filled rows={len(df)}")
     return df, map_df
 
@@ -297,8 +624,15 @@ def fill_sap_auth_desc_from_tcode(
 # =========================
 # 요구 6) 역할별 메뉴 1:N 확장 매핑
 # =========================
-def expand_role_menu_mapping(df_team: pd.DataFrame, df_role_menu: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
-    rm = df_role_menu.copy()
+# 번들/인덱스/로그가 읽는 권한 행 컬럼. 이 컬럼이 모두 같은 행은 결과가 같으므로 확장 전에 한 번만 남김
+ROLE_KEY_COLS = ["team_code", "team_name", "sys_code", "sys_name", "auth_code", "auth_name", "auth_desc"]
+# 역할->메뉴 조회표에서 category로 바꿀 컬럼 (CONFIG["build"]["category"])
+MENU_CATEGORY_COLS = ["menu_id", "menu_name", "url", "1level", "2level", "3level"]
+
+
+def normalize_role_menu_sheet(df_role_menu: pd.DataFrame) -> pd.DataFrame:
+    """A.역할별 메뉴 -> (role_id, auth_name, menu_id, menu_name, url) 정규화"""
+    rm = df_role_menu
     c_role_id = ensure_any_col(rm, CONFIG["cols_a_role_menu"]["role_id"], "역할ID", "역할별 메뉴")
     c_role_name = ensure_any_col(rm, CONFIG["cols_a_role_menu"]["role_name"], "역할명", "역할별 메뉴")
     c_menu_id = ensure_any_col(rm, CONFIG["cols_a_role_menu"]["menu_id"], "메뉴ID", "역할별 메뉴")
@@ -313,21 +647,79 @@ def expand_role_menu_mapping(df_team: pd.DataFrame, df_role_menu: pd.DataFrame)
         c_menu_name: "menu_name",
         c_url: "url",
     })
-    rm2["auth_name"] = rm2["auth_name"].map(norm_text)
-    rm2["role_id"] = rm2["role_id"].map(norm_code)
-    rm2["menu_id"] = rm2["menu_id"].map(norm_code)
-    rm2["menu_name"] = rm2["menu_name"].map(norm_text)
-    rm2["url"] = rm2["url"].map(norm_text)
+    normalize_columns(rm2, {"auth_name": "text", "role_id": "code", "menu_id": "code", "menu_name": "text", "url": "text"})
+    return rm2
 
-    left_cnt = len(df_team)
-    out = df_team.merge(rm2, how="left", on="auth_name")
 
-    matched = out["menu_id"].map(norm_text).ne("").sum()
-    log_join_rate("A.role_menu (expand by auth_name)", left_cnt, matched)
-
-    fail = out.loc[out["menu_id"].map(norm_text).eq(""), ["sys_code", "team_code", "team_name", "auth_code", "auth_name"]].copy()
+def expand_role_menu_mapping(df_team: pd.DataFrame, df_role_menu: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame, np.ndarray, pd.DataFrame]:
+    """
+    ✅ 사용자 행 x 메뉴로 바로 펼치지 않음 (가장 큰 중간 결과였고 to_outputs가 대부분 drop_duplicates로 버림)
+    1) df_team -> ROLE_KEY_COLS 기준 고유 권한 행 (첫 등장 순서 유지, 행마다 "_role_ref")
+    2) 고유 (sys_code, auth_name) x 역할별 메뉴 -> 역할->메뉴 조회표 (레벨 매핑은 이 표에 1회)
+    메뉴 행은 materialize_role_menus 에서 고유 권한 행 기준으로만 만듦
+    (결과 엑셀 / 로그는 user_refs 로 사용자 행에 다시 붙임 -> user_role_menus / user_level_fail)
+    반환: (고유 권한 행, 조회표, 사용자 행별 _role_ref, fail(사용자 행 기준))
+    """
+    rm2 = normalize_role_menu_sheet(df_role_menu)
+
+    cols = [c for c in ROLE_KEY_COLS if c in df_team.columns]
+    roles = carry_canonical(df_team[cols].drop_duplicates().reset_index(drop=True), df_team, cols)
+    pairs = roles[["sys_code", "auth_name"]].drop_duplicates().reset_index(drop=True)
+    pairs["_role_ref"] = np.arange(len(pairs))
+    roles = carry_canonical(roles.merge(pairs, how="left", on=["sys_code", "auth_name"]), roles)
+    # (sys_code, auth_name)은 pairs에서 고유 -> left merge 행 수/순서 = df_team
+    user_refs = df_team[["sys_code", "auth_name"]].merge(pairs, how="left", on=["sys_code", "auth_name"])["_role_ref"].to_numpy()
+    print(f"[EXPAND] team rows={len(df_team)} -> distinct role rows={len(roles)} (sys_code+auth_name={len(pairs)})")
+
+    lookup = carry_canonical(pairs.merge(rm2, how="left", on="auth_name"), pairs)
+    has_menu = norm_text_series(lookup["menu_id"]).ne("")
+    ref_has_menu = np.zeros(len(pairs), dtype=bool)
+    ref_has_menu[lookup.loc[has_menu, "_role_ref"].to_numpy()] = True
+    log_join_rate("A.role_menu (expand by auth_name, distinct roles)", len(roles), int(ref_has_menu[roles["_role_ref"].to_numpy()].sum()))
+
+    # 메뉴가 없는 역할은 조회표에 1행(NaN)뿐 -> 사용자 행마다 1건 (기존 1:N merge 결과의 fail과 같은 행/순서)
+    fail = df_team.loc[~ref_has_menu[user_refs], ["sys_code", "team_code", "team_name", "auth_code", "auth_name"]].copy()
     fail["issue"] = "role_menu mapping fail (auth_name not found)"
-    return out, fail
+    return roles, lookup, user_refs, fail
+
+
+def materialize_role_menus(roles: pd.DataFrame, lookup: pd.DataFrame) -> pd.DataFrame:
+    """고유 권한 행 x (레벨 매핑된) 조회표 -> 권한별 메뉴 행 (to_outputs 입력)"""
+    right = lookup.drop(columns=["sys_code", "auth_name"])
+    out = roles.merge(right, how="left", on="_role_ref").drop(columns="_role_ref")
+    # 조회표는 _role_ref 마다 1행 이상(left merge) -> 오른쪽 컬럼에도 새 NaN이 생기지 않음
+    marks = {c: k for c, k in canonical_cols(lookup).items() if c in right.columns}
+    marks.update(canonical_cols(roles))
+    return mark_canonical(out, marks)
+
+
+def level_mapping_rank(sys_code: pd.Series) -> np.ndarray:
+    """apply_level_mapping 결과 행 순서 (IAS류 -> SAP -> 기타, 묶음 안은 입력 순서) 재현용 정렬 키"""
+    ias_like = ["IAS", "LEGO", CONFIG["constants"]["IAS_SYS_NAME_FORCED"]]
+    return np.where(sys_code.isin(ias_like).to_numpy(), 0, np.where((sys_code == "SAP").to_numpy(), 1, 2))
+
+
+def _in_level_mapping_order(df: pd.DataFrame) -> pd.DataFrame:
+    order = np.argsort(level_mapping_rank(df["sys_code"]), kind="stable")
+    return mark_canonical(df.iloc[order].reset_index(drop=True), canonical_cols(df))
+
+
+def user_role_menus(df_team: pd.DataFrame, user_refs: np.ndarray, lookup: pd.DataFrame) -> pd.DataFrame:
+    """
+    결과 엑셀 "팀별 권한_통합_메뉴매핑": 사용자 행(원본 시트 컬럼 포함) x 레벨 매핑된 조회표
+    기존 (사용자 행 1:N merge -> apply_level_mapping) 결과와 같은 행/컬럼/순서. 엑셀을 쓸 때만 만듦
+    """
+    keyed = carry_canonical(df_team.assign(_role_ref=user_refs), df_team)
+    return _in_level_mapping_order(materialize_role_menus(keyed, lookup))
+
+
+def user_level_fail(df_team: pd.DataFrame, user_refs: np.ndarray, lookup: pd.DataFrame) -> pd.DataFrame:
+    """level_mapping_fail 을 사용자 행 기준으로 (조회표의 실패 행만 사용자 행에 붙임 -> 전체 확장 없이 같은 결과)"""
+    bad = lookup.loc[norm_text_series(lookup["menu_id"]).ne("") & norm_text_series(lookup["3level"]).eq(""),
+                     ["_role_ref", "menu_id", "menu_name", "3level"]]
+    users = df_team[["sys_code", "team_code", "team_name", "auth_code", "auth_name"]].assign(_role_ref=user_refs)
+    # inner merge는 왼쪽(사용자 행) 순서 유지, 같은 사용자 안은 조회표 순서
+    return level_mapping_fail(_in_level_mapping_order(users.merge(bad, how="inner", on="_role_ref")))
 
 
 # =========================
@@ -338,19 +730,19 @@ def apply_level_mapping(df: pd.DataFrame, df_b_ias: pd.DataFrame, df_b_sap: pd.D
 
     # IAS_Sales
     b_ias = df_b_ias.copy()
-    b_ias["menu_name"] = b_ias[ensure_any_col(b_ias, CONFIG["cols_b"]["ias_menu_name"], "menu_name", "B.IAS_Sales")].map(norm_text)
-    b_ias["menu_id"] = b_ias[ensure_any_col(b_ias, CONFIG["cols_b"]["ias_menu_id"], "menu_id", "B.IAS_Sales")].map(norm_code)
-    b_ias["1level"] = b_ias[ensure_any_col(b_ias, CONFIG["cols_b"]["ias_1"], "1level", "B.IAS_Sales")].map(norm_text)
-    b_ias["2level"] = b_ias[ensure_any_col(b_ias, CONFIG["cols_b"]["ias_2"], "2level", "B.IAS_Sales")].map(norm_text)
-    b_ias["3level"] = b_ias[ensure_any_col(b_ias, CONFIG["cols_b"]["ias_3"], "3level", "B.IAS_Sales")].map(norm_text)
+    b_ias["menu_name"] = norm_text_series(b_ias[ensure_any_col(b_ias, CONFIG["cols_b"]["ias_menu_name"], "menu_name", "B.IAS_Sales")])
+    b_ias["menu_id"] = norm_code_series(b_ias[ensure_any_col(b_ias, CONFIG["cols_b"]["ias_menu_id"], "menu_id", "B.IAS_Sales")])
+    b_ias["1level"] = norm_text_series(b_ias[ensure_any_col(b_ias, CONFIG["cols_b"]["ias_1"], "1level", "B.IAS_Sales")])
+    b_ias["2level"] = norm_text_series(b_ias[ensure_any_col(b_ias, CONFIG["cols_b"]["ias_2"], "2level", "B.IAS_Sales")])
+    b_ias["3level"] = norm_text_series(b_ias[ensure_any_col(b_ias, CONFIG["cols_b"]["ias_3"], "3level", "B.IAS_Sales")])
     b_ias = b_ias[["menu_name", "menu_id", "1level", "2level", "3level"]].drop_duplicates()
 
     # SAP
     b_sap = df_b_sap.copy()
-    b_sap["menu_id"] = b_sap[ensure_any_col(b_sap, CONFIG["cols_b"]["sap_menu_id"], "menu_id", "B.SAP")].map(norm_code)
-    b_sap["1level"] = b_sap[ensure_any_col(b_sap, CONFIG["cols_b"]["sap_1"], "1level", "B.SAP")].map(norm_text)
-    b_sap["2level"] = b_sap[ensure_any_col(b_sap, CONFIG["cols_b"]["sap_2"], "2level", "B.SAP")].map(norm_text)
-    b_sap["3level"] = b_sap[ensure_any_col(b_sap, CONFIG["cols_b"]["sap_3"], "3level", "B.SAP")].map(norm_text)
+    b_sap["menu_id"] = norm_code_series(b_sap[ensure_any_col(b_sap, CONFIG["cols_b"]["sap_menu_id"], "menu_id", "B.SAP")])
+    b_sap["1level"] = norm_text_series(b_sap[ensure_any_col(b_sap, CONFIG["cols_b"]["sap_1"], "1level", "B.SAP")])
+    b_sap["2level"] = norm_text_series(b_sap[ensure_any_col(b_sap, CONFIG["cols_b"]["sap_2"], "2level", "B.SAP")])
+    b_sap["3level"] = norm_text_series(b_sap[ensure_any_col(b_sap, CONFIG["cols_b"]["sap_3"], "3level", "B.SAP")])
     b_sap = b_sap[["menu_id", "1level", "2level", "3level"]].drop_duplicates()
 
     # ✅ FIX: 컬럼이 없을 때 out.get("menu_id","")가 str이 되어 .map이 깨지는 문제 방지
@@ -359,9 +751,7 @@ def apply_level_mapping(df: pd.DataFrame, df_b_ias: pd.DataFrame, df_b_sap: pd.D
     if "menu_name" not in out.columns:
         out["menu_name"] = ""
 
-    out["menu_id"] = out["menu_id"].map(norm_code)
-    out["menu_name"] = out["menu_name"].map(norm_text)
-    out["sys_code"] = out["sys_code"].map(norm_text)
+    normalize_columns(out, {"menu_id": "code", "menu_name": "text", "sys_code": "text"})
 
     ias_like = set(["IAS", "LEGO", CONFIG["constants"]["IAS_SYS_NAME_FORCED"]])
 
@@ -370,8 +760,8 @@ def apply_level_mapping(df: pd.DataFrame, df_b_ias: pd.DataFrame, df_b_sap: pd.D
 
     if len(df_ias) > 0:
         before = len(df_ias)
-        df_ias = df_ias.merge(b_ias, how="left", on=["menu_name", "menu_id"], suffixes=("", "_b"))
-        matched = df_ias["3level"].map(norm_text).ne("").sum()
+        df_ias = carry_canonical(df_ias.merge(b_ias, how="left", on=["menu_name", "menu_id"], suffixes=("", "_b")), df_ias)
+        matched = norm_text_series(df_ias["3level"]).ne("").sum()
         log_join_rate("B.level (IAS-like: menu_name+menu_id)", before, matched)
 
     df_sap = df_rest[df_rest["sys_code"] == "SAP"].copy()
@@ -379,29 +769,32 @@ def apply_level_mapping(df: pd.DataFrame, df_b_ias: pd.DataFrame, df_b_sap: pd.D
 
     if len(df_sap) > 0:
         before = len(df_sap)
-        df_sap = df_sap.merge(
+        df_sap = carry_canonical(df_sap.merge(
             b_sap,
             how="left",
             left_on=["menu_id", "menu_name"],
             right_on=["menu_id", "3level"],
             suffixes=("", "_b"),
-        )
-        matched = df_sap["3level"].map(norm_text).ne("").sum()
+        ), df_sap)
+        matched = norm_text_series(df_sap["3level"]).ne("").sum()
         log_join_rate("B.level (SAP: menu_name==B.3level + menu_id)", before, matched)
 
-    out2 = pd.concat([df_ias, df_sap, df_other], ignore_index=True)
+    out2 = concat_canonical([df_ias, df_sap, df_other], ignore_index=True)
 
     # level 컬럼 없으면 만들어두기
     for c in ["1level", "2level", "3level"]:
         if c not in out2.columns:
             out2[c] = ""
 
-    fail = out2.loc[
-        out2["menu_id"].map(norm_text).ne("") & out2["3level"].map(norm_text).eq(""),
-        ["sys_code", "team_code", "team_name", "auth_code", "auth_name", "menu_id", "menu_name"]
-    ].copy()
+    return out2, level_mapping_fail(out2)
+
+
+def level_mapping_fail(df: pd.DataFrame) -> pd.DataFrame:
+    """메뉴는 있는데 3level이 빈 행 (조회표에는 팀 컬럼이 없으므로 있는 컬럼만)"""
+    cols = [c for c in ["sys_code", "team_code", "team_name", "auth_code", "auth_name", "menu_id", "menu_name"] if c in df.columns]
+    fail = df.loc[norm_text_series(df["menu_id"]).ne("") & norm_text_series(df["3level"]).eq(""), cols].copy()
     fail["issue"] = "level mapping fail (menu exists but 3level empty)"
-    return out2, fail
+    return fail
 
 
 # =========================
@@ -415,18 +808,50 @@ def first_non_empty(series: pd.Series, is_code: bool = False) -> str:
     return ""
 
 
+def first_non_empty_by(df: pd.DataFrame, keys: List[str], col: str) -> Dict:
+    """
+    groupby(keys)[col] 마다 first_non_empty(norm_text) 값 -> {그룹키: 값}
+    - 행 순서 그대로 비어 있지 않은 첫 값(drop_duplicates는 첫 행 유지)
+    - 값이 모두 빈 그룹은 결과에 없음
+    """
+    if col not in df.columns:
+        return {}
+    sub = df[keys].copy()
+    sub["_v"] = canonical_series(df, col, "text").to_numpy()
+    sub = sub[sub["_v"] != ""].drop_duplicates(subset=keys)
+    if len(keys) == 1:
+        return dict(zip(sub[keys[0]].tolist(), sub["_v"].tolist()))
+    return dict(zip(sub[keys].itertuples(index=False, name=None), sub["_v"].tolist()))
+
+
 def build_role_meta_map(df: pd.DataFrame, is_sap: bool) -> Dict[Tuple[str, str, str], Dict[str, str]]:
+    keys = ["team_code", "sys_code", "auth_code"]
+    groups = df[keys].dropna().drop_duplicates()
+    names = first_non_empty_by(df, keys, "auth_name")
+    descs = first_non_empty_by(df, keys, "auth_desc")
+
+    sap_descs: Dict = {}
+    if is_sap:
+        topn = int(CONFIG["constants"]["sap_desc_topn"])
+        levels = df[keys].copy()
+        levels["3level"] = norm_text_series(df["3level"]) if "3level" in df.columns else ""
+        sap_descs = build_sap_desc_series(levels, keys, "3level", topn=topn).to_dict()
+
     meta: Dict[Tuple[str, str, str], Dict[str, str]] = {}
-    for (team_code, sys_code, auth_code), g in df.groupby(["team_code", "sys_code", "auth_code"]):
-        auth_name = first_non_empty(g["auth_name"])
-        auth_desc = first_non_empty(g["auth_desc"])
+    for k in groups.itertuples(index=False, name=None):
+        auth_desc = descs.get(k, "")
         if is_sap and not auth_desc:
-            auth_desc = build_sap_role_desc(g.get("3level", pd.Series([""])).tolist(), topn=int(CONFIG["constants"]["sap_desc_topn"]))
-        meta[(team_code, sys_code, auth_code)] = {"auth_name": auth_name, "auth_desc": auth_desc}
+            auth_desc = sap_descs.get(k, "")
+        meta[k] = {"auth_name": names.get(k, ""), "auth_desc": auth_desc}
     return meta
 
 
 def to_outputs(df: pd.DataFrame, is_sap: bool) -> Dict:
+    """
+    (팀, 시스템, 권한, path, menu_id) 순으로 한 번 정렬한 뒤 한 번 훑으면서
+    roles_by_team_sys / bundles_by_team을 만든다. (그룹마다 pandas 연산을 하지 않음)
+    - 그룹 순서/첫 값 규칙은 groupby(sort=True) + first_non_empty와 동일
+    """
     role_meta = build_role_meta_map(df, is_sap=is_sap)
     need_cols = ["team_code", "team_name", "sys_code", "sys_name", "auth_code", "auth_name", "auth_desc", "menu_id", "1level", "2level", "3level"]
     for c in need_cols:
@@ -441,50 +866,66 @@ def to_outputs(df: pd.DataFrame, is_sap: bool) -> Dict:
         .to_dict(orient="records")
     )
 
-    systems_by_team: Dict[str, List[Dict[str, str]]] = {}
-    for team_code, g in df_menu.groupby("team_code"):
-        sysmap = {}
-        for _, r in g[["sys_code", "sys_name"]].drop_duplicates().iterrows():
-            sysmap[norm_text(r["sys_code"])] = norm_text(r["sys_name"])
-        systems_by_team[team_code] = [{"sys_code": sc, "sys_name": sn} for sc, sn in sorted(sysmap.items(), key=lambda x: x[1])]
+    # 팀별 시스템: 팀 안에서 처음 나온 (sys_code, sys_name) 순서대로, 같은 sys_code는 나중 값 우선
+    sysmaps: Dict[str, Dict[str, str]] = {}
+    pairs = df_menu[["team_code", "sys_code", "sys_name"]].drop_duplicates()
+    for team_code, sc, sn in pairs.itertuples(index=False, name=None):
+        sysmaps.setdefault(team_code, {})[norm_text(sc)] = norm_text(sn)
+    systems_by_team: Dict[str, List[Dict[str, str]]] = {
+        team_code: [{"sys_code": sc, "sys_name": sn} for sc, sn in sorted(sysmaps[team_code].items(), key=lambda x: x[1])]
+        for team_code in sorted(sysmaps)
+    }
 
-    roles_by_team_sys: Dict[str, List[Dict[str, str]]] = {}
-    for (team_code, sys_code), g_ts in df_menu.groupby(["team_code", "sys_code"]):
-        key = f"{team_code}|{sys_code}"
-        role_list = []
-        for auth_code in sorted(g_ts["auth_code"].map(norm_code).unique()):
-            m = role_meta.get((team_code, sys_code, auth_code), {"auth_name": "", "auth_desc": ""})
-            role_list.append({"auth_code": auth_code, "auth_name": m["auth_name"], "auth_desc": m["auth_desc"]})
-        roles_by_team_sys[key] = sorted(role_list, key=lambda x: (x["auth_name"], x["auth_code"]))
+    df_menu["path"] = norm_text_series(df_menu["1level"]) + " > " + norm_text_series(df_menu["2level"]) + " > " + norm_text_series(df_menu["3level"])
+    df_menu["_auth_norm"] = canonical_series(df_menu, "auth_code", "code")
+    team_names = first_non_empty_by(df_menu, ["team_code"], "team_name")
+    sys_names = first_non_empty_by(df_menu, ["team_code", "sys_code", "auth_code"], "sys_name")
 
-    df_menu["path"] = df_menu["1level"].map(norm_text) + " > " + df_menu["2level"].map(norm_text) + " > " + df_menu["3level"].map(norm_text)
+    ordered = df_menu.sort_values(["team_code", "sys_code", "auth_code", "path", "menu_id"])
+    rows = zip(*(ordered[c].tolist() for c in ["team_code", "sys_code", "auth_code", "_auth_norm", "path", "menu_id"]))
 
+    roles_by_team_sys: Dict[str, List[Dict[str, str]]] = {}
     bundles_by_team: Dict[str, Dict[str, Dict]] = {}
-    for team_code, g_team in df_menu.groupby("team_code"):
-        team_name = first_non_empty(g_team["team_name"])
-        bundles_by_team.setdefault(team_code, {})
-        for (sys_code, auth_code), g in g_team.groupby(["sys_code", "auth_code"]):
-            sys_name = first_non_empty(g["sys_name"])
-            m = role_meta.get((team_code, sys_code, auth_code), {"auth_name": "", "auth_desc": ""})
-
-            menus = (
-                g[["path", "menu_id"]]
-                .drop_duplicates()
-                .sort_values(["path", "menu_id"])
-                .to_dict(orient="records")
-            )
-
-            bundle = {
+    no_meta = {"auth_name": "", "auth_desc": ""}
+
+    def _flush_roles(team_code: str, sys_code: str, auth_codes: set):
+        role_list = []
+        for auth_code in sorted(auth_codes):
+            m = role_meta.get((team_code, sys_code, auth_code), no_meta)
+            role_list.append({"auth_code": auth_code, "auth_name": m["auth_name"], "auth_desc": m["auth_desc"]})
+        roles_by_team_sys[f"{team_code}|{sys_code}"] = sorted(role_list, key=lambda x: (x["auth_name"], x["auth_code"]))
+
+    cur_ts, cur_role, prev_menu = None, None, None
+    auth_codes: set = set()
+    menus: List[Dict] = []
+    for team_code, sys_code, auth_code, auth_norm, path, menu_id in rows:
+        if (team_code, sys_code) != cur_ts:
+            if cur_ts is not None:
+                _flush_roles(*cur_ts, auth_codes)
+            cur_ts, auth_codes = (team_code, sys_code), set()
+        auth_codes.add(auth_norm)
+
+        if (team_code, sys_code, auth_code) != cur_role:
+            cur_role, prev_menu = (team_code, sys_code, auth_code), None
+            m = role_meta.get(cur_role, no_meta)
+            menus = []
+            bundles_by_team.setdefault(team_code, {})[f"{sys_code}|{auth_code}"] = {
                 "team_code": team_code,
-                "team_name": team_name,
+                "team_name": team_names.get(team_code, ""),
                 "sys_code": sys_code,
-                "sys_name": sys_name,
+                "sys_name": sys_names.get(cur_role, ""),
                 "auth_code": auth_code,
                 "auth_name": m["auth_name"],
                 "auth_desc": m["auth_desc"],
                 "menus": menus,
             }
-            bundles_by_team[team_code][f"{sys_code}|{auth_code}"] = bundle
+
+        # 정렬돼 있으므로 같은 (path, menu_id)는 연속으로 나옴
+        if (path, menu_id) != prev_menu:
+            menus.append({"path": path, "menu_id": menu_id})
+            prev_menu = (path, menu_id)
+    if cur_ts is not None:
+        _flush_roles(*cur_ts, auth_codes)
 
     return {
         "teams_records": teams_records,
@@ -494,42 +935,233 @@ def to_outputs(df: pd.DataFrame, is_sap: bool) -> Dict:
     }
 
 
+# =========================
+# ✅ NEW: 메뉴 카탈로그 (번들 menus -> 정수 id 참조)
+# =========================
+def split_menu_levels(path: str) -> List[str]:
+    """'L1 > L2 > L3' -> ['L1','L2','L3'] (프런트의 path.split('>')와 동일 규칙)"""
+    return [p.strip() for p in str(path or "").split(">")]
+
+
+def load_menu_catalog(out_base: Path) -> Dict:
+    """
+    menu_catalog.json 로드. 없으면 빈 카탈로그.
+    - menus: id(=리스트 위치) -> {"path","menu_id","levels"}
+    - index: (path, menu_id) -> id
+    기존 id는 절대 바꾸지 않음(append-only) -> 캐시된 번들의 참조가 깨지지 않음
+    """
+    p = out_base / MENU_CATALOG_FILE
+    menus: List[Dict] = []
+    if p.exists():
+        menus = json.loads(p.read_text(encoding="utf-8")).get("menus", [])
+    index = {(m.get("path", ""), m.get("menu_id", "")): i for i, m in enumerate(menus)}
+    return {"menus": menus, "index": index}
+
+
+def intern_menu(catalog: Dict, menu: Dict) -> int:
+    key = (menu.get("path", ""), menu.get("menu_id", ""))
+    mid = catalog["index"].get(key)
+    if mid is None:
+        mid = len(catalog["menus"])
+        catalog["menus"].append({"path": key[0], "menu_id": key[1], "levels": split_menu_levels(key[0])})
+        catalog["index"][key] = mid
+    return mid
+
+
+def encode_bundle_menus(bundle: Dict, catalog: Dict) -> Dict:
+    """menus -> menu_refs (순서 유지, 나머지 필드/키 순서 유지)"""
+    out = {}
+    for k, v in bundle.items():
+        if k == "menus":
+            out["menu_refs"] = [intern_menu(catalog, m) for m in (v or [])]
+        else:
+            out[k] = v
+    return out
+
+
+def decode_bundle_menus(bundle: Dict, catalog: Dict) -> Dict:
+    """menu_refs -> menus (load_old_outputs에서 사용, merge는 항상 menus 기준)"""
+    if "menu_refs" not in bundle:
+        return bundle
+    menus = catalog["menus"]
+    out = {}
+    for k, v in bundle.items():
+        if k == "menu_refs":
+            out["menus"] = [{"path": menus[i]["path"], "menu_id": menus[i]["menu_id"]} for i in (v or []) if 0 <= i < len(menus)]
+        else:
+            out[k] = v
+    return out
+
+
+def write_menu_catalog(out_base: Path, catalog: Dict):
+    (out_base / MENU_CATALOG_FILE).write_text(dump_index_json({"menus": catalog["menus"]}), encoding="utf-8")
+
+
+# =========================
+# ✅ NEW: 공유 번들 저장소 (content-addressed by_role/<hash>.json)
+# =========================
+def role_payload_hash(payload: Dict) -> str:
+    raw = json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def store_shared_role(by_role_dir: Path, bundle: Dict) -> Dict:
+    """
+    번들을 (팀 메타) / (권한+메뉴 payload)로 나눠 payload는 by_role/<hash>.json에 1회만 저장.
+    반환값은 by_team jsonl에 기록할 manifest 한 줄.
+    - 같은 해시 = 같은 내용이므로 이미 있으면 다시 쓰지 않음
+    """
+    payload = {k: bundle[k] for k in ROLE_PAYLOAD_KEYS if k in bundle}
+    ref = role_payload_hash(payload)
+    p = by_role_dir / f"{ref}.json"
+    if not p.exists():
+        # 병렬 쓰기 시 같은 ref를 동시에 쓸 수 있음 -> 프로세스별 임시 파일 후 교체(내용은 동일)
+        tmp = p.with_name(f".{p.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, p)
+    return {
+        "team_code": bundle.get("team_code", ""),
+        "team_name": bundle.get("team_name", ""),
+        "sys_code": bundle.get("sys_code", ""),
+        "auth_code": bundle.get("auth_code", ""),
+        "role_ref": ref,
+    }
+
+
+def resolve_shared_role(by_role_dir: Path, line: Dict, cache: Dict[str, Dict]) -> Dict:
+    """manifest 한 줄(role_ref) -> 번들 전체로 복원 (load_old_outputs에서 사용)"""
+    ref = line.get("role_ref")
+    if not ref:
+        return line
+    if ref not in cache:
+        cache[ref] = json.loads((by_role_dir / f"{ref}.json").read_text(encoding="utf-8"))
+    out = {"team_code": line.get("team_code", ""), "team_name": line.get("team_name", "")}
+    out.update(cache[ref])
+    return out
+
+
+# =========================
+# ✅ NEW: 팀별 roles 샤드 (팀 선택 시 해당 팀 파일 하나만 받도록)
+# - roles/<team_code>.json : {"team_code", "systems": [...], "roles": {sys_code: [...]}}
+# - roles/manifest.json    : {"version", "teams": {team_code: 내용 해시}} (프런트 캐시 무효화용)
+# =========================
+ROLE_SHARDS_VERSION = 1
+
+
+def build_role_shards(systems_by_team: Dict[str, List[Dict]], roles_by_team_sys: Dict[str, List[Dict]]) -> Dict[str, Dict]:
+    """index 두 개 -> {team_code: 샤드}. 원본에 있는 키만 담음(읽어 되돌렸을 때 키가 늘지 않게)"""
+    shards: Dict[str, Dict] = {}
+    for team_code, sys_list in systems_by_team.items():
+        shards.setdefault(team_code, {"team_code": team_code})["systems"] = sys_list
+    for key, roles in roles_by_team_sys.items():
+        if "|" not in key:
+            continue
+        team_code, sys_code = key.split("|", 1)
+        shard = shards.setdefault(team_code, {"team_code": team_code})
+        shard.setdefault("roles", {})[sys_code] = roles
+    return shards
+
+
+def write_role_shards(out_base: Path, systems_by_team: Dict, roles_by_team_sys: Dict, manifest: Optional[Dict]) -> Tuple[int, int]:
+    """반환: (다시 쓴 파일 수, 전체 팀 수)"""
+    roles_dir = out_base / ROLES_DIR
+    roles_dir.mkdir(parents=True, exist_ok=True)
+    teams: Dict[str, str] = {}
+    n_written = 0
+    for team_code, shard in build_role_shards(systems_by_team, roles_by_team_sys).items():
+        text = json.dumps(shard, ensure_ascii=False, separators=(",", ":"))
+        teams[team_code] = sha256_bytes(text.encode("utf-8"))[:12]
+        p = roles_dir / f"{team_code}.json"
+        n_written += int(write_lines_if_changed(p, [text], manifest, f"{ROLES_DIR}/{p.name}"))
+    mtext = json.dumps({"version": ROLE_SHARDS_VERSION, "teams": teams}, ensure_ascii=False, separators=(",", ":"))
+    n_written += int(write_lines_if_changed(roles_dir / "manifest.json", [mtext], manifest, f"{ROLES_DIR}/manifest.json"))
+    return n_written, len(teams)
+
+
+def load_role_shards(out_base: Path) -> Optional[Tuple[Dict, Dict]]:
+    """roles/ 샤드 -> (systems_by_team, roles_by_team_sys). manifest가 없으면 None"""
+    roles_dir = out_base / ROLES_DIR
+    mp = roles_dir / "manifest.json"
+    if not mp.exists():
+        return None
+    systems_by_team: Dict[str, List[Dict]] = {}
+    roles_by_team_sys: Dict[str, List[Dict]] = {}
+    for team_code in json.loads(mp.read_text(encoding="utf-8")).get("teams", {}):
+        p = roles_dir / f"{team_code}.json"
+        if not p.exists():
+            continue
+        shard = json.loads(p.read_text(encoding="utf-8"))
+        if "systems" in shard:
+            systems_by_team[team_code] = shard["systems"]
+        for sys_code, roles in (shard.get("roles") or {}).items():
+            roles_by_team_sys[f"{team_code}|{sys_code}"] = roles
+    return systems_by_team, roles_by_team_sys
+
+
 # =========================
 # ✅ NEW: 기존 산출물과 append-only merge
 # =========================
-def load_old_outputs(out_base: Path) -> Optional[Dict]:
+def list_old_team_files(by_team: Path) -> Dict[str, List[Path]]:
+    """by_team/*.jsonl -> {정규화 team_code: [파일들]} (glob 순서 유지, 같은 팀으로 정규화되는 파일은 묶음)"""
+    files: Dict[str, List[Path]] = {}
+    if by_team.exists():
+        for p in by_team.glob("role_bundle_team_*.jsonl"):
+            team_code = canon_team_code(p.stem.replace("role_bundle_team_", "").strip())
+            files.setdefault(team_code, []).append(p)
+    return files
+
+
+def load_team_bundles(team_code: str, paths: List[Path], by_role: Path, menu_catalog: Dict) -> Dict[str, Dict]:
+    """한 팀의 기존 jsonl -> {sys|auth: 번들} (role_ref / menu_refs 형식이면 복원)"""
+    bundles: Dict[str, Dict] = {}
+    role_cache: Dict[str, Dict] = {}  # 팀 단위로만 유지 -> 메모리는 팀 하나 크기로 제한
+    for p in paths:
+        with p.open("r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                b = resolve_shared_role(by_role, json.loads(line), role_cache)
+                b = decode_bundle_menus(b, menu_catalog)
+                sc = norm_text(b.get("sys_code", ""))
+                ac = norm_code(b.get("auth_code", ""))
+                b["team_code"] = canon_team_code(b.get("team_code", team_code))
+                bundles[f"{sc}|{ac}"] = b
+    return bundles
+
+
+def load_old_outputs(out_base: Path, menu_catalog: Optional[Dict] = None, with_bundles: bool = True) -> Optional[Dict]:
+    """
+    기존 index json(+ with_bundles=True면 by_team 번들 전체) 로드.
+    main은 with_bundles=False로 index만 읽고 번들은 팀 단위로 스트리밍 merge(write_team_bundles_streaming)
+    """
     idx_teams = out_base / "index_teams.json"
     idx_sys = out_base / "index_systems_by_team.json"
     idx_roles = out_base / "index_roles_by_team_sys.json"
     by_team = out_base / "by_team"
 
-    if not (idx_teams.exists() and idx_sys.exists() and idx_roles.exists()):
+    has_shards = (out_base / ROLES_DIR / "manifest.json").exists()
+    if not (idx_teams.exists() and (has_shards or (idx_sys.exists() and idx_roles.exists()))):
         print("[OLD] 기존 index json 없음 -> merge 없이 신규 생성")
         return None
 
     old_teams = json.loads(idx_teams.read_text(encoding="utf-8")).get("teams", [])
-    old_sys = json.loads(idx_sys.read_text(encoding="utf-8"))
-    old_roles = json.loads(idx_roles.read_text(encoding="utf-8"))
+    shards = load_role_shards(out_base)
+    if shards is not None:
+        old_sys, old_roles = shards
+        print(f"[OLD] systems/roles <- {ROLES_DIR}/ 샤드 (teams={len(old_sys)})")
+    else:
+        old_sys = json.loads(idx_sys.read_text(encoding="utf-8"))
+        old_roles = json.loads(idx_roles.read_text(encoding="utf-8"))
 
-    # bundles: by_team/*.jsonl 있으면 전부 로드
+    # bundles: by_team/*.jsonl 있으면 전부 로드 (menu_refs 형식이면 카탈로그로 복원)
     old_bundles_by_team: Dict[str, Dict[str, Dict]] = {}
-    if by_team.exists():
-        for p in by_team.glob("role_bundle_team_*.jsonl"):
-            team_code = p.stem.replace("role_bundle_team_", "").strip()
-            team_code = canon_team_code(team_code)
-            old_bundles_by_team.setdefault(team_code, {})
-            with p.open("r", encoding="utf-8") as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    b = json.loads(line)
-                    tc = canon_team_code(b.get("team_code", team_code))
-                    sc = norm_text(b.get("sys_code", ""))
-                    ac = norm_code(b.get("auth_code", ""))
-                    key = f"{sc}|{ac}"
-                    b["team_code"] = tc
-                    old_bundles_by_team[tc][key] = b
+    if with_bundles:
+        if menu_catalog is None:
+            menu_catalog = load_menu_catalog(out_base)
+        by_role = out_base / BY_ROLE_DIR
+        for team_code, paths in list_old_team_files(by_team).items():
+            old_bundles_by_team[team_code] = load_team_bundles(team_code, paths, by_role, menu_catalog)
 
     print(f"[OLD] teams={len(old_teams)} systems_keys={len(old_sys)} roles_keys={len(old_roles)} bundles_teams={len(old_bundles_by_team)}")
     return {
@@ -611,45 +1243,410 @@ def merge_outputs_append_only(base: Dict, add: Dict) -> Dict:
     base.setdefault("bundles_by_team", {})
     for team_code, bundle_map in add.get("bundles_by_team", {}).items():
         tc = canon_team_code(team_code)
-        base["bundles_by_team"].setdefault(tc, {})
-        for sys_auth, bundle in bundle_map.items():
-            # bundle key normalize
-            sc = norm_text(bundle.get("sys_code", ""))
-            ac = norm_code(bundle.get("auth_code", ""))
-            k = f"{sc}|{ac}"
-            bundle["team_code"] = tc
-
-            if k not in base["bundles_by_team"][tc]:
-                base["bundles_by_team"][tc][k] = bundle
+        merge_team_bundles(base["bundles_by_team"].setdefault(tc, {}), tc, bundle_map)
+
+    return base
+
+
+def merge_team_bundles(base_map: Dict[str, Dict], tc: str, add_map: Dict[str, Dict]) -> Dict[str, Dict]:
+    """한 팀의 번들 union (sys|auth 기준), menus는 (menu_id,path) 기준 union. base_map을 갱신해서 반환"""
+    for sys_auth, bundle in add_map.items():
+        # bundle key normalize
+        sc = norm_text(bundle.get("sys_code", ""))
+        ac = norm_code(bundle.get("auth_code", ""))
+        k = f"{sc}|{ac}"
+        bundle["team_code"] = tc
+
+        if k not in base_map:
+            base_map[k] = bundle
+            continue
+
+        existing = base_map[k]
+
+        # menus union by (menu_id, path)
+        ex_menus = existing.get("menus", []) or []
+        ad_menus = bundle.get("menus", []) or []
+
+        seen = {(norm_code(m.get("menu_id","")), norm_text(m.get("path",""))) for m in ex_menus}
+        for m in ad_menus:
+            mid = norm_code(m.get("menu_id",""))
+            pth = norm_text(m.get("path",""))
+            if not mid and not pth:
                 continue
+            kk = (mid, pth)
+            if kk not in seen:
+                ex_menus.append({"menu_id": mid, "path": pth})
+                seen.add(kk)
+        ex_menus.sort(key=lambda x: (x.get("path",""), x.get("menu_id","")))
+        existing["menus"] = ex_menus
+
+        # 메타 보강
+        for f in ["team_name","sys_name","auth_name","auth_desc"]:
+            if norm_text(existing.get(f,"")) == "" and norm_text(bundle.get(f,"")) != "":
+                existing[f] = bundle[f]
 
-            existing = base["bundles_by_team"][tc][k]
+        base_map[k] = existing
+    return base_map
 
-            # menus union by (menu_id, path)
-            ex_menus = existing.get("menus", []) or []
-            ad_menus = bundle.get("menus", []) or []
 
-            seen = {(norm_code(m.get("menu_id","")), norm_text(m.get("path",""))) for m in ex_menus}
-            for m in ad_menus:
-                mid = norm_code(m.get("menu_id",""))
-                pth = norm_text(m.get("path",""))
-                if not mid and not pth:
+# =========================
+# ✅ NEW: 메뉴 -> 권한 역인덱스 (MENU_TO_ROLE 질의용)
+# =========================
+def build_menu_index(team_code: str, rows: List[Dict]) -> Dict:
+    """
+    팀의 최종 번들(jsonl과 같은 순서) -> 역인덱스
+    - roles: [[team_code, sys_code, auth_code], ...] (jsonl 줄 순서와 같음)
+    - paths / menu_ids: 메뉴 path / menu_id -> roles 위치 목록
+    path는 정규화된 원문 그대로 키로 둠 -> 프런트가 자기 normalize()로 비교(기존 부분일치 검색과 결과 동일)
+    """
+    roles: List[List[str]] = []
+    paths: Dict[str, List[int]] = {}
+    menu_ids: Dict[str, List[int]] = {}
+    for i, b in enumerate(rows):
+        roles.append([b.get("team_code", team_code), b.get("sys_code", ""), b.get("auth_code", "")])
+        for m in b.get("menus", []) or []:
+            for table, key in ((paths, m.get("path", "")), (menu_ids, m.get("menu_id", ""))):
+                if not key:
                     continue
-                kk = (mid, pth)
-                if kk not in seen:
-                    ex_menus.append({"menu_id": mid, "path": pth})
-                    seen.add(kk)
-            ex_menus.sort(key=lambda x: (x.get("path",""), x.get("menu_id","")))
-            existing["menus"] = ex_menus
+                postings = table.setdefault(key, [])
+                if not postings or postings[-1] != i:
+                    postings.append(i)
+    return {
+        "team_code": team_code,
+        "roles": roles,
+        "paths": dict(sorted(paths.items())),
+        "menu_ids": dict(sorted(menu_ids.items())),
+    }
 
-            # 메타 보강
-            for f in ["team_name","sys_name","auth_name","auth_desc"]:
-                if norm_text(existing.get(f,"")) == "" and norm_text(bundle.get(f,"")) != "":
-                    existing[f] = bundle[f]
 
-            base["bundles_by_team"][tc][k] = existing
+# =========================
+# ✅ NEW: by_team 스트리밍 merge/write (팀 하나씩: 기존 jsonl 읽기 -> merge -> 임시 파일 -> 원자적 교체)
+# - --workers N: 팀 단위 작업을 ProcessPoolExecutor로 분산. 결과는 workers 수와 무관하게 동일
+# - 카탈로그 모드는 id가 처리 순서에 의존하므로 새 메뉴 키를 먼저 모아 부모에서 팀 순서대로 intern
+# =========================
+_WORKER_CATALOG: Optional[Dict] = None
+
+
+def _init_bundle_worker(menu_catalog: Optional[Dict]):
+    global _WORKER_CATALOG
+    _WORKER_CATALOG = menu_catalog
+
+
+def sorted_team_rows(bundle_map: Dict[str, Dict]) -> List[Dict]:
+    rows = list(bundle_map.values())
+    rows.sort(key=lambda b: (norm_text(b.get("sys_name","")), norm_text(b.get("auth_name","")), norm_code(b.get("auth_code",""))))
+    return rows
+
+
+def team_bundle_lines(rows: List[Dict], menu_catalog: Optional[Dict], by_role: Optional[Path], minify: bool = False,
+                      menu_tree: bool = False) -> Iterable[str]:
+    separators = (",", ":") if minify else None
+    for row in rows:
+        # 이전 산출물에서 읽은 번들은 merge로 menus가 바뀌었을 수 있음 -> 항상 다시 계산 (꺼져 있으면 제거)
+        row = with_menu_tree(row, menu_tree)
+        if menu_catalog is not None:
+            row = encode_bundle_menus(row, menu_catalog)
+        if by_role is not None:
+            row = store_shared_role(by_role, row)
+        yield json.dumps(row, ensure_ascii=False, separators=separators) + "\n"
+
+
+def merge_one_team(job: Dict, menu_catalog: Dict) -> Dict[str, Dict]:
+    """job: {tc, old_paths, add_maps, has_old, by_role, ...} -> 이 팀의 최종 번들 맵"""
+    if not job["has_old"]:
+        return job["add_maps"][0]
+    bundle_map = load_team_bundles(job["tc"], job["old_paths"], job["by_role"], menu_catalog)
+    for add_map in job["add_maps"]:
+        merge_team_bundles(bundle_map, job["tc"], add_map)
+    return bundle_map
+
+
+def collect_team_new_menu_keys(job: Dict) -> List[Tuple[str, str]]:
+    """(카탈로그 1단계) 직렬 intern 순서대로, 아직 카탈로그에 없는 (path, menu_id) 목록"""
+    catalog = _WORKER_CATALOG
+    keys: List[Tuple[str, str]] = []
+    seen = set()
+    for row in sorted_team_rows(merge_one_team(job, catalog)):
+        for m in row.get("menus", []) or []:
+            key = (m.get("path", ""), m.get("menu_id", ""))
+            if key not in catalog["index"] and key not in seen:
+                seen.add(key)
+                keys.append(key)
+    return keys
+
+
+def write_team_job(job: Dict) -> Dict:
+    """
+    팀 하나 merge + jsonl(+ 역인덱스) 쓰기.
+    manifest는 부모가 가진 이전 해시만 받아서 비교하고 새 해시를 돌려줌
+    """
+    catalog = job.get("menu_catalog") or _WORKER_CATALOG
+    bundle_map = merge_one_team(job, catalog)
+    rows = sorted_team_rows(bundle_map)
+    mini = {"teams": dict(job["old_digests"])} if job["incremental"] else None
+
+    out_path = job["by_team"] / f"role_bundle_team_{job['tc']}.jsonl"
+    lines = team_bundle_lines(
+        rows, catalog if job["use_catalog"] else None, job["by_role"] if job["use_shared"] else None, job["minify"],
+        job["menu_tree"],
+    )
+    written = write_lines_if_changed(out_path, lines, mini, out_path.name)
 
-    return base
+    index_written = False
+    if job["menu_index_dir"] is not None:
+        idx_path = job["menu_index_dir"] / f"menu_index_team_{job['tc']}.json"
+        idx_text = json.dumps(build_menu_index(job["tc"], rows), ensure_ascii=False, separators=(",", ":"))
+        index_written = write_lines_if_changed(idx_path, [idx_text], mini, f"{MENU_INDEX_DIR}/{idx_path.name}")
+
+    fuzzy_terms = [row_fuzzy_terms(row) for row in rows] if job["fuzzy_index"] else None
+
+    return {
+        "digests": mini["teams"] if mini is not None else {},
+        "written": written,
+        "index_written": index_written,
+        "bundles": len(bundle_map),
+        "fuzzy_terms": fuzzy_terms,
+        "bin_rows": rows if job["binary_bundle"] else None,
+    }
+
+
+def write_team_bundles_streaming(
+    out_base: Path,
+    new_bundles_by_team: Dict[str, Dict[str, Dict]],
+    has_old: bool,
+    menu_catalog: Dict,
+    manifest: Optional[Dict],
+    workers: int = 1,
+) -> Dict[str, int]:
+    """
+    팀 순서는 기존 전체 로드 방식과 동일(기존 파일 glob 순서 -> 신규 팀) -> 카탈로그 id 부여 순서도 동일.
+    메모리에는 한 번에 (프로세스당) 한 팀의 기존 번들만 올라감.
+    """
+    by_team = out_base / "by_team"
+    by_role = out_base / BY_ROLE_DIR
+    use_catalog = CONFIG["output"]["bundle_menus"] == "catalog"
+    use_shared = CONFIG["output"]["bundle_store"] == "shared"
+    if use_shared:
+        by_role.mkdir(parents=True, exist_ok=True)
+    menu_index_dir = out_base / MENU_INDEX_DIR if CONFIG["output"]["menu_index"] else None
+    if menu_index_dir is not None:
+        menu_index_dir.mkdir(parents=True, exist_ok=True)
+
+    old_files = list_old_team_files(by_team) if has_old else {}
+    new_by_tc: Dict[str, List[Dict[str, Dict]]] = {}
+    for team_code, bundle_map in new_bundles_by_team.items():
+        new_by_tc.setdefault(canon_team_code(team_code) if has_old else team_code, []).append(bundle_map)
+    order = list(old_files) + [tc for tc in new_by_tc if tc not in old_files]
+
+    # 팀별 작업 단위. CONFIG는 자식 프로세스(spawn)에서 기본값으로 다시 로드되므로 필요한 값은 모두 job에 담음
+    jobs = [{
+        "tc": tc,
+        "old_paths": old_files.get(tc, []),
+        "add_maps": new_by_tc.get(tc, []),
+        "has_old": has_old,
+        "by_team": by_team,
+        "by_role": by_role,
+        "use_catalog": use_catalog,
+        "use_shared": use_shared,
+        "menu_index_dir": menu_index_dir,
+        "fuzzy_index": bool(CONFIG["output"]["fuzzy_index"]),
+        "minify": bool(CONFIG["finalize"]["minify"]),
+        "menu_tree": bool(CONFIG["output"]["menu_tree"]),
+        "binary_bundle": bool(CONFIG["output"]["binary_bundle"]),
+        "incremental": manifest is not None,
+        "old_digests": {
+            k: manifest["teams"][k]
+            for k in [f"role_bundle_team_{tc}.jsonl", f"{MENU_INDEX_DIR}/menu_index_team_{tc}.json"]
+            if k in manifest["teams"]
+        } if manifest is not None else {},
+    } for tc in order]
+
+    if workers <= 1 or len(jobs) <= 1:
+        results = []
+        for job in jobs:
+            results.append(write_team_job(dict(job, menu_catalog=menu_catalog)))
+    else:
+        chunksize = max(1, len(jobs) // (workers * 4))
+        if use_catalog:
+            # 1단계: 팀별 신규 메뉴 키 수집 -> 부모에서 팀 순서대로 intern (직렬과 같은 id)
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_bundle_worker, initargs=(menu_catalog,)) as ex:
+                for keys in ex.map(collect_team_new_menu_keys, jobs, chunksize=chunksize):
+                    for path, menu_id in keys:
+                        intern_menu(menu_catalog, {"path": path, "menu_id": menu_id})
+        # 2단계: merge + 쓰기 (카탈로그는 모든 키가 이미 있으므로 읽기 전용)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_bundle_worker, initargs=(menu_catalog,)) as ex:
+            results = list(ex.map(write_team_job, jobs, chunksize=chunksize))
+
+    stats = {"teams": len(results), "written": 0, "index_written": 0, "max_team_bundles": 0, "bundles": 0}
+    for r in results:
+        if manifest is not None:
+            manifest["teams"].update(r["digests"])
+        stats["written"] += int(r["written"])
+        stats["index_written"] += int(r["index_written"])
+        stats["max_team_bundles"] = max(stats["max_team_bundles"], r["bundles"])
+        stats["bundles"] += r["bundles"]
+
+    # 오타 교정 인덱스: 권한별 이름 집합을 team_code 순으로 모아 한 파일로 (어휘 id는 이름 정규화 순)
+    if CONFIG["output"]["fuzzy_index"]:
+        fuzzy = new_fuzzy_index()
+        for tc, r in sorted(zip(order, results), key=lambda x: x[0]):
+            for terms in r["fuzzy_terms"]:
+                add_fuzzy_terms(fuzzy, terms)
+        (out_base / FUZZY_DIR).mkdir(parents=True, exist_ok=True)
+        rel = f"{FUZZY_DIR}/{FUZZY_INDEX_FILE}"
+        stats["fuzzy_written"] = int(write_lines_if_changed(out_base / rel, [fuzzy_index_text(fuzzy)], manifest, rel))
+        stats["fuzzy_terms"] = len(fuzzy["terms"])
+
+    # 바이너리 번들: 팀 job이 돌려준 번들(menus 복원 상태)을 같은 순서로 모아 한 파일로
+    if CONFIG["output"]["binary_bundle"]:
+        state = new_binary_bundle()
+        for tc, r in sorted(zip(order, results), key=lambda x: x[0]):
+            rows = r.pop("bin_rows")
+            add_binary_team(state, tc, next((b.get("team_name") for b in rows if b.get("team_name")), ""), rows)
+        data = binary_bundle_bytes(state)
+        stats["binary_written"] = int(write_bytes_if_changed(out_base / BINARY_BUNDLE_FILE, data, manifest, BINARY_BUNDLE_FILE))
+        stats["binary_bytes"] = len(data)
+    return stats
+
+
+# =========================
+# ✅ NEW: 산출물 마무리 (minify / .gz·.br 사이드카 / 크기 보고)
+# - 사이드카는 원본과 같은 폴더에 <파일명>.gz / <파일명>.br
+# - 원본 해시가 manifest["final"]과 같고 사이드카가 있으면 다시 압축하지 않음
+# - gzip은 mtime=0으로 고정 -> 같은 입력이면 같은 바이트(배포 diff에 실제 변경만 남김)
+# =========================
+FINAL_SUFFIXES = (".json", ".jsonl")
+SIZE_REPORT_FILE = "size_report.json"
+
+
+def dump_index_json(obj) -> str:
+    if CONFIG["finalize"]["minify"]:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+    return json.dumps(obj, ensure_ascii=False, indent=2)
+
+
+def artifact_group(rel: str) -> str:
+    """크기 보고 묶음 단위: 하위 폴더면 폴더명, 최상위 파일이면 파일명"""
+    return rel.split("/", 1)[0] if "/" in rel else rel
+
+
+def iter_final_artifacts(out_base: Path) -> Iterable[Path]:
+    for p in sorted(out_base.rglob("*")):
+        if p.is_file() and p.suffix in FINAL_SUFFIXES and not p.name.startswith("."):
+            yield p
+
+
+def write_bytes_atomic(path: Path, data: bytes):
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def finalize_artifacts(out_base: Path, manifest: Optional[Dict], use_gzip: bool, use_brotli: bool) -> List[Dict]:
+    """
+    out_base 아래 *.json / *.jsonl 마다 사이드카 생성 -> 파일별 {"path","raw","gzip","br"} (바이트, 없으면 None)
+    manifest=None이면 항상 다시 압축
+    """
+    cfg = CONFIG["finalize"]
+    encoders = []
+    if use_gzip:
+        encoders.append(("gzip", ".gz", lambda b: gzip.compress(b, compresslevel=int(cfg["gzip_level"]), mtime=0)))
+    if use_brotli and brotli is not None:
+        encoders.append(("br", ".br", lambda b: brotli.compress(b, quality=int(cfg["brotli_quality"]))))
+
+    final = manifest["final"] if manifest is not None else {}
+    rows: List[Dict] = []
+    for p in iter_final_artifacts(out_base):
+        rel = p.relative_to(out_base).as_posix()
+        data = p.read_bytes()
+        digest = sha256_bytes(data)
+        prev = final.get(rel, {})
+        ent = {"sha256": digest}
+        row = {"path": rel, "raw": len(data), "gzip": None, "br": None, "written": 0}
+        for enc, suffix, compress in encoders:
+            side = p.with_name(p.name + suffix)
+            if prev.get("sha256") == digest and enc in prev and side.exists():
+                ent[enc] = prev[enc]
+            else:
+                comp = compress(data)
+                write_bytes_atomic(side, comp)
+                ent[enc] = len(comp)
+                row["written"] += 1
+            row[enc] = ent[enc]
+        final[rel] = ent
+        rows.append(row)
+    return rows
+
+
+def size_report(rows: List[Dict]) -> List[Dict]:
+    """파일별 결과 -> 묶음별 합계 (files, raw, gzip, br) + TOTAL. 만들지 않은 인코딩은 None"""
+    encs = [enc for enc in ("gzip", "br") if rows and rows[0][enc] is not None]
+
+    def empty(name: str) -> Dict:
+        g = {"artifact": name, "files": 0, "raw": 0, "gzip": None, "br": None}
+        g.update({enc: 0 for enc in encs})
+        return g
+
+    groups: Dict[str, Dict] = {}
+    total = empty("TOTAL")
+    for r in rows:
+        name = artifact_group(r["path"])
+        for g in (groups.setdefault(name, empty(name)), total):
+            g["files"] += 1
+            g["raw"] += r["raw"]
+            for enc in encs:
+                g[enc] += r[enc]
+    return sorted(groups.values(), key=lambda g: -g["raw"]) + [total]
+
+
+def print_size_report(report: List[Dict]):
+    def fmt(n: Optional[int], raw: int) -> str:
+        if n is None:
+            return f"{'-':>18}"
+        return f"{n / 1024:>10.1f}KB {n / raw * 100 if raw else 0:>5.1f}%"
+
+    print(f"[SIZE] {'artifact':<32}{'files':>7}{'raw':>14}{'gzip':>18}{'brotli':>18}")
+    for g in report:
+        print(f"[SIZE] {g['artifact']:<32}{g['files']:>7}{g['raw'] / 1024:>12.1f}KB{fmt(g['gzip'], g['raw'])}{fmt(g['br'], g['raw'])}")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    ap = argparse.ArgumentParser(description="팀별 권한 전처리 (append-only)")
+    paths = CONFIG["paths"]
+    ap.add_argument("--excel-a", default=paths["excel_a"], help="엑셀 A (권한별 임직원 / 역할별 메뉴) 경로")
+    ap.add_argument("--excel-b", default=paths["excel_b"], help="엑셀 B (메뉴 레벨) 경로")
+    ap.add_argument("--out-base", default=paths["out_base"], help="산출물 폴더 (기존 산출물과 append-only merge)")
+    ap.add_argument("--out-xlsx", default=paths["out_xlsx"], help="통합 결과 엑셀 경로")
+    ap.add_argument("--cache-dir", default=paths["cache_dir"], help="증분 빌드 캐시 / 보고서 폴더")
+    ap.add_argument("--no-excel", action="store_true", default=not CONFIG["output"]["excel"],
+                    help="통합 결과 엑셀을 쓰지 않음 (시트당 1,048,576행 제한을 넘는 대용량 벤치마크용)")
+    ap.add_argument("--workers", type=int, default=int(CONFIG["build"]["workers"]),
+                    help="by_team merge/write 병렬 프로세스 수 (1=직렬, 0=CPU 수)")
+    ap.add_argument("--no-category", action="store_true", default=not CONFIG["build"]["category"],
+                    help="코드/이름/레벨 컬럼을 category로 바꾸지 않음 (object 그대로, 비교용)")
+    ap.add_argument("--minify", action="store_true", default=bool(CONFIG["finalize"]["minify"]),
+                    help="index json / jsonl을 공백 없이 기록 (배포용)")
+    ap.add_argument("--precompress", action="store_true",
+                    default=bool(CONFIG["finalize"]["gzip"] or CONFIG["finalize"]["brotli"]),
+                    help="산출물마다 .gz / .br 사이드카 생성 + 크기 보고")
+    ap.add_argument("--report", default="", help="build_report.json 경로 (기본 cache_dir/build_report.json)")
+    ap.add_argument("--profile", default=",".join(CONFIG["profile"]["cprofile_stages"]),
+                    help="cProfile 덤프할 단계 (쉼표 구분, all=전부)")
+    ap.add_argument("--budget", action="append", default=[], metavar="STAGE.METRIC=VALUE",
+                    help=f"단계 예산 추가 (metric: {', '.join(BUDGET_KEYS)}), 넘으면 exit 1")
+    return ap.parse_args(argv)
+
+
+def parse_budgets(items: List[str]) -> Dict[str, Dict[str, float]]:
+    """CONFIG 예산 + --budget stage.metric=value"""
+    budgets = {k: dict(v) for k, v in CONFIG["profile"]["budgets"].items()}
+    for item in items:
+        key, sep, value = item.partition("=")
+        name, dot, metric = key.strip().rpartition(".")
+        if not sep or not dot or not name:
+            raise SystemExit(f"--budget 형식은 STAGE.METRIC=VALUE 입니다: {item!r}")
+        budgets.setdefault(name, {})[metric] = float(value)
+    return budgets
 
 
 def write_output_xlsx(path_out: Path, sheets: Dict[str, pd.DataFrame]):
@@ -660,40 +1657,63 @@ def write_output_xlsx(path_out: Path, sheets: Dict[str, pd.DataFrame]):
     print(f"✅ Saved Excel: {path_out}")
 
 
-def main():
-    path_a = Path(CONFIG["paths"]["excel_a"])
-    path_b = Path(CONFIG["paths"]["excel_b"])
-    out_xlsx = Path(CONFIG["paths"]["out_xlsx"])
+def main(argv: Optional[List[str]] = None):
+    args = parse_args(argv)
+    workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+    use_category = not args.no_category
+    if args.minify:
+        CONFIG["finalize"]["minify"] = True
+    if args.precompress and not (CONFIG["finalize"]["gzip"] or CONFIG["finalize"]["brotli"]):
+        CONFIG["finalize"]["gzip"] = CONFIG["finalize"]["brotli"] = True
 
-    out_base = Path(CONFIG["paths"]["out_base"])
+    path_a = Path(args.excel_a)
+    path_b = Path(args.excel_b)
+    out_xlsx = Path(args.out_xlsx)
+
+    out_base = Path(args.out_base)
     out_by_team = out_base / "by_team"
     out_base.mkdir(parents=True, exist_ok=True)
     out_by_team.mkdir(parents=True, exist_ok=True)
 
-    # --- sheets
-    sh_sap = resolve_sheet_name(path_a, CONFIG["sheets_a"]["sap_users"])
-    sh_ias = resolve_sheet_name(path_a, CONFIG["sheets_a"]["ias_users"])
-    sh_mro = resolve_sheet_name(path_a, CONFIG["sheets_a"]["mro_users"])
-    sh_srm = resolve_sheet_name(path_a, CONFIG["sheets_a"]["srm_users"])
-    sh_eac = resolve_sheet_name(path_a, CONFIG["sheets_a"]["eaccount_users"])
-    sh_sap_tcode = resolve_sheet_name(path_a, CONFIG["sheets_a"]["sap_role_tcode"])
-    sh_role_menu = resolve_sheet_name(path_a, CONFIG["sheets_a"]["role_menu"])
-
-    sh_b_ias = resolve_sheet_name(path_b, CONFIG["sheets_b"]["ias_sales"])
-    sh_b_sap = resolve_sheet_name(path_b, CONFIG["sheets_b"]["sap"])
-
-    # --- load
-    df_sap_raw = read_sheet_raw(path_a, sh_sap)
-    df_ias_raw = read_sheet_raw(path_a, sh_ias)
-    df_mro_raw = read_sheet_raw(path_a, sh_mro)
-    df_srm_raw = read_sheet_raw(path_a, sh_srm)
-    df_eac_raw = read_sheet_raw(path_a, sh_eac)
-
-    df_sap_tcode = read_sheet_raw(path_a, sh_sap_tcode)
-    df_role_menu = read_sheet_raw(path_a, sh_role_menu)
+    # 워크북당 1회 오픈 + 증분 캐시(시트 fingerprint 같으면 캐시 사용)
+    incremental = bool(CONFIG["build"]["incremental"])
+    cache_dir = Path(args.cache_dir)
+    manifest = load_build_manifest(cache_dir) if incremental else None
+
+    # ✅ 단계별 계측 (wall/CPU/행 수/메모리 -> build_report.json, 선택 cProfile, 예산 초과 시 exit 1)
+    prof = None
+    if CONFIG["profile"]["report"]:
+        profile_stages = [x.strip() for x in args.profile.split(",") if x.strip()]
+        prof = new_stage_profiler(
+            parse_budgets(args.budget), profile_stages, cache_dir / "profiles",
+            float(CONFIG["profile"]["sample_interval_s"]),
+        )
 
-    df_b_ias = read_sheet_raw(path_b, sh_b_ias)
-    df_b_sap = read_sheet_raw(path_b, sh_b_sap)
+    # --- sheets / load
+    with stage(prof, "load_excel_a") as st:
+        sheets_a = load_workbook_sheets(path_a, {
+            k: CONFIG["sheets_a"][k]
+            for k in ["sap_users", "ias_users", "mro_users", "srm_users", "eaccount_users", "sap_role_tcode", "role_menu"]
+        }, cache_dir, manifest)
+        st["rows_out"] = sum(len(df) for _, df in sheets_a.values())
+    with stage(prof, "load_excel_b") as st:
+        sheets_b = load_workbook_sheets(path_b, {
+            "ias_sales": CONFIG["sheets_b"]["ias_sales"],
+            "sap": CONFIG["sheets_b"]["sap"],
+        }, cache_dir, manifest)
+        st["rows_out"] = sum(len(df) for _, df in sheets_b.values())
+
+    sh_sap, df_sap_raw = sheets_a["sap_users"]
+    sh_ias, df_ias_raw = sheets_a["ias_users"]
+    sh_mro, df_mro_raw = sheets_a["mro_users"]
+    sh_srm, df_srm_raw = sheets_a["srm_users"]
+    sh_eac, df_eac_raw = sheets_a["eaccount_users"]
+
+    sh_sap_tcode, df_sap_tcode = sheets_a["sap_role_tcode"]
+    sh_role_menu, df_role_menu = sheets_a["role_menu"]
+
+    sh_b_ias, df_b_ias = sheets_b["ias_sales"]
+    sh_b_sap, df_b_sap = sheets_b["sap"]
 
     # --- resolve columns (A user sheets)
     c = CONFIG["cols_a_user"]
@@ -712,157 +1732,258 @@ def main():
             "dept_code": ensure_any_col(df, c["dept_code"], "부서코드", sheet),
         }
 
-    cols_sap = resolve_cols(df_sap_raw, sh_sap)
-    cols_ias = resolve_cols(df_ias_raw, sh_ias)
-    cols_mro = resolve_cols(df_mro_raw, sh_mro)
-    cols_srm = resolve_cols(df_srm_raw, sh_srm)
-    cols_eac = resolve_cols(df_eac_raw, sh_eac)
-
-    # --- dedup
-    df_sap_dedup, _, _ = dedup_drop_name_emp(df_sap_raw, sh_sap, cols_sap["name"], cols_sap["empno"])
-    df_ias_dedup, _, _ = dedup_drop_name_emp(df_ias_raw, sh_ias, cols_ias["name"], cols_ias["empno"])
-    df_mro_dedup, _, _ = dedup_drop_name_emp(df_mro_raw, sh_mro, cols_mro["name"], cols_mro["empno"])
-    df_srm_dedup, _, _ = dedup_drop_name_emp(df_srm_raw, sh_srm, cols_srm["name"], cols_srm["empno"])
-    df_eac_dedup, _, _ = dedup_drop_name_emp(df_eac_raw, sh_eac, cols_eac["name"], cols_eac["empno"])
+    raw_rows = sum(len(df) for df in (df_sap_raw, df_ias_raw, df_mro_raw, df_srm_raw, df_eac_raw))
+    with stage(prof, "dedup", rows_in=raw_rows) as st:
+        cols_sap = resolve_cols(df_sap_raw, sh_sap)
+        cols_ias = resolve_cols(df_ias_raw, sh_ias)
+        cols_mro = resolve_cols(df_mro_raw, sh_mro)
+        cols_srm = resolve_cols(df_srm_raw, sh_srm)
+        cols_eac = resolve_cols(df_eac_raw, sh_eac)
+
+        # --- dedup
+        df_sap_dedup, _, _ = dedup_drop_name_emp(df_sap_raw, sh_sap, cols_sap["name"], cols_sap["empno"])
+        df_ias_dedup, _, _ = dedup_drop_name_emp(df_ias_raw, sh_ias, cols_ias["name"], cols_ias["empno"])
+        df_mro_dedup, _, _ = dedup_drop_name_emp(df_mro_raw, sh_mro, cols_mro["name"], cols_mro["empno"])
+        df_srm_dedup, _, _ = dedup_drop_name_emp(df_srm_raw, sh_srm, cols_srm["name"], cols_srm["empno"])
+        df_eac_dedup, _, _ = dedup_drop_name_emp(df_eac_raw, sh_eac, cols_eac["name"], cols_eac["empno"])
+        dedup_rows = sum(len(df) for df in (df_sap_dedup, df_ias_dedup, df_mro_dedup, df_srm_dedup, df_eac_dedup))
+        st["rows_out"] = dedup_rows
 
     # --- convert
-    sys_sap = first_non_empty(df_sap_raw[cols_sap["sys_name"]])
-    sys_ias = first_non_empty(df_ias_raw[cols_ias["sys_name"]])
-    sys_mro = first_non_empty(df_mro_raw[cols_mro["sys_name"]])
-    sys_srm = first_non_empty(df_srm_raw[cols_srm["sys_name"]])
-    sys_eac = first_non_empty(df_eac_raw[cols_eac["sys_name"]])
-
-    df_team_sap = to_team_priv_format(
-        df_sap_dedup, sh_sap, sys_sap,
-        cols_sap["dept_name"], cols_sap["dept_code"],
-        cols_sap["role_code"], cols_sap["role_name"],
-        None,  # SAP desc는 생성
-        cols_sap["start"], cols_sap["end"],
-    )
-    df_team_ias = to_team_priv_format(
-        df_ias_dedup, sh_ias, sys_ias,
-        cols_ias["dept_name"], cols_ias["dept_code"],
-        cols_ias["role_code"], cols_ias["role_name"],
-        cols_ias["desc"],
-        cols_ias["start"], cols_ias["end"],
-    )
-    df_team_mro = to_team_priv_format(
-        df_mro_dedup, sh_mro, sys_mro,
-        cols_mro["dept_name"], cols_mro["dept_code"],
-        cols_mro["role_code"], cols_mro["role_name"],
-        cols_mro["desc"],
-        cols_mro["start"], cols_mro["end"],
-    )
-    df_team_srm = to_team_priv_format(
-        df_srm_dedup, sh_srm, sys_srm,
-        cols_srm["dept_name"], cols_srm["dept_code"],
-        cols_srm["role_code"], cols_srm["role_name"],
-        cols_srm["desc"],
-        cols_srm["start"], cols_srm["end"],
-    )
-    df_team_eac = to_team_priv_format(
-        df_eac_dedup, sh_eac, sys_eac,
-        cols_eac["dept_name"], cols_eac["dept_code"],
-        cols_eac["role_code"], cols_eac["role_name"],
-        cols_eac["desc"],
-        cols_eac["start"], cols_eac["end"],
-    )
+    with stage(prof, "convert", rows_in=dedup_rows) as st:
+        sys_sap = first_non_empty(df_sap_raw[cols_sap["sys_name"]])
+        sys_ias = first_non_empty(df_ias_raw[cols_ias["sys_name"]])
+        sys_mro = first_non_empty(df_mro_raw[cols_mro["sys_name"]])
+        sys_srm = first_non_empty(df_srm_raw[cols_srm["sys_name"]])
+        sys_eac = first_non_empty(df_eac_raw[cols_eac["sys_name"]])
+
+        df_team_sap = to_team_priv_format(
+            df_sap_dedup, sh_sap, sys_sap,
+            cols_sap["dept_name"], cols_sap["dept_code"],
+            cols_sap["role_code"], cols_sap["role_name"],
+            None,  # SAP desc는 생성
+            cols_sap["start"], cols_sap["end"],
+        )
+        df_team_ias = to_team_priv_format(
+            df_ias_dedup, sh_ias, sys_ias,
+            cols_ias["dept_name"], cols_ias["dept_code"],
+            cols_ias["role_code"], cols_ias["role_name"],
+            cols_ias["desc"],
+            cols_ias["start"], cols_ias["end"],
+        )
+        df_team_mro = to_team_priv_format(
+            df_mro_dedup, sh_mro, sys_mro,
+            cols_mro["dept_name"], cols_mro["dept_code"],
+            cols_mro["role_code"], cols_mro["role_name"],
+            cols_mro["desc"],
+            cols_mro["start"], cols_mro["end"],
+        )
+        df_team_srm = to_team_priv_format(
+            df_srm_dedup, sh_srm, sys_srm,
+            cols_srm["dept_name"], cols_srm["dept_code"],
+            cols_srm["role_code"], cols_srm["role_name"],
+            cols_srm["desc"],
+            cols_srm["start"], cols_srm["end"],
+        )
+        df_team_eac = to_team_priv_format(
+            df_eac_dedup, sh_eac, sys_eac,
+            cols_eac["dept_name"], cols_eac["dept_code"],
+            cols_eac["role_code"], cols_eac["role_name"],
+            cols_eac["desc"],
+            cols_eac["start"], cols_eac["end"],
+        )
+        st["rows_out"] = sum(len(df) for df in (df_team_sap, df_team_ias, df_team_mro, df_team_srm, df_team_eac))
 
     # --- SAP desc
-    tc = CONFIG["cols_a_sap_tcode"]
-    c_tc_role_code = ensure_any_col(df_sap_tcode, tc["role_code"], "역할코드", sh_sap_tcode)
-    c_tc_role_name = ensure_any_col(df_sap_tcode, tc["role_name"], "역할명", sh_sap_tcode)
-    c_tc_menu_name = ensure_any_col(df_sap_tcode, tc["menu_name"], "메뉴명", sh_sap_tcode)
-
-    df_team_sap, _df_sap_desc_map = fill_sap_auth_desc_from_tcode(
-        df_team_sap, df_sap_tcode,
-        role_code_col=c_tc_role_code,
-        role_name_col=c_tc_role_name,
-        menu_name_col=c_tc_menu_name,
-        topn=int(CONFIG["constants"]["sap_desc_topn"]),
-    )
+    with stage(prof, "sap_desc", rows_in=len(df_team_sap)) as st:
+        tc = CONFIG["cols_a_sap_tcode"]
+        c_tc_role_code = ensure_any_col(df_sap_tcode, tc["role_code"], "역할코드", sh_sap_tcode)
+        c_tc_role_name = ensure_any_col(df_sap_tcode, tc["role_name"], "역할명", sh_sap_tcode)
+        c_tc_menu_name = ensure_any_col(df_sap_tcode, tc["menu_name"], "메뉴명", sh_sap_tcode)
+
+        df_team_sap, _df_sap_desc_map = fill_sap_auth_desc_from_tcode(
+            df_team_sap, df_sap_tcode,
+            role_code_col=c_tc_role_code,
+            role_name_col=c_tc_role_name,
+            menu_name_col=c_tc_menu_name,
+            topn=int(CONFIG["constants"]["sap_desc_topn"]),
+        )
+        st["rows_out"] = len(df_team_sap)
 
     # --- union all systems
-    df_team_all = pd.concat([df_team_sap, df_team_ias, df_team_mro, df_team_srm, df_team_eac], ignore_index=True)
+    team_frames = [df_team_sap, df_team_ias, df_team_mro, df_team_srm, df_team_eac]
+    with stage(prof, "union", rows_in=sum(len(df) for df in team_frames)) as st:
+        df_team_all = concat_canonical(team_frames, ignore_index=True)
+        if use_category:
+            # 시트별로 바꾸면 카테고리가 달라 concat에서 object로 돌아감 -> union 후 1회
+            to_category(df_team_all, ROLE_KEY_COLS)
+        st["rows_out"] = len(df_team_all)
     print(f"[UNION] team_all rows={len(df_team_all)}")
 
-    # --- role_menu expand (1:N)
-    df_menu_mapped, log_fail_role_menu = expand_role_menu_mapping(df_team_all, df_role_menu)
-
-    # --- level mapping
-    df_level_mapped, log_fail_level = apply_level_mapping(df_menu_mapped, df_b_ias, df_b_sap)
+    # --- role_menu expand (1:N): 고유 권한 행 + 역할->메뉴 조회표
+    with stage(prof, "role_menu_expand", rows_in=len(df_team_all)) as st:
+        df_roles, df_role_lookup, user_role_refs, log_fail_role_menu = expand_role_menu_mapping(df_team_all, df_role_menu)
+        st["rows_out"] = len(df_roles)
+
+    # --- level mapping (조회표에 1회) -> 고유 권한 행 기준으로 메뉴 행 생성
+    with stage(prof, "level_mapping", rows_in=len(df_role_lookup)) as st:
+        df_role_lookup, _ = apply_level_mapping(df_role_lookup, df_b_ias, df_b_sap)
+        if use_category:
+            to_category(df_role_lookup, MENU_CATEGORY_COLS)
+        df_level_mapped = materialize_role_menus(df_roles, df_role_lookup)
+        log_fail_level = user_level_fail(df_team_all, user_role_refs, df_role_lookup)
+        st["rows_out"] = len(df_level_mapped)
+    print(f"[EXPAND] role x menu rows={len(df_level_mapped)} (lookup rows={len(df_role_lookup)})")
 
     # --- logs
     df_log = pd.concat([log_fail_role_menu, log_fail_level], ignore_index=True)
     if len(df_log) == 0:
         df_log = pd.DataFrame([{"issue": "no issues"}])
 
-    # --- Excel 저장
-    out_sheets = {
-        CONFIG["constants"]["out_sheet1"]: df_team_all,
-        CONFIG["constants"]["out_sheet2"]: df_level_mapped,
-        CONFIG["constants"]["out_sheet_log"]: df_log,
-    }
-    write_output_xlsx(out_xlsx, out_sheets)
+    # --- Excel 저장 (메뉴매핑 시트는 사용자 행 기준: 조회표를 사용자 행에 다시 붙여 기존 시트와 동일)
+    if not args.no_excel:
+        with stage(prof, "write_xlsx", rows_in=len(df_team_all) + len(df_log)) as st:
+            out_sheets = {
+                CONFIG["constants"]["out_sheet1"]: df_team_all,
+                CONFIG["constants"]["out_sheet2"]: user_role_menus(df_team_all, user_role_refs, df_role_lookup),
+                CONFIG["constants"]["out_sheet_log"]: df_log,
+            }
+            st["rows_out"] = sum(len(df) for df in out_sheets.values())
+            write_output_xlsx(out_xlsx, out_sheets)
+            del out_sheets
 
     # --- 산출물 생성 (이번 데이터 기준)
-    ias_like = ["IAS", "LEGO", CONFIG["constants"]["IAS_SYS_NAME_FORCED"]]
-    df_ias_like = df_level_mapped[df_level_mapped["sys_code"].isin(ias_like)].copy()
-    df_sap_like = df_level_mapped[df_level_mapped["sys_code"] == "SAP"].copy()
-    df_other = df_level_mapped[~df_level_mapped["sys_code"].isin(ias_like + ["SAP"])].copy()
-
-    out_ias = to_outputs(df_ias_like, is_sap=False)
-    out_sap = to_outputs(df_sap_like, is_sap=True)
-
-    merged_new = {
-        "teams_records": out_ias["teams_records"],
-        "systems_by_team": out_ias["systems_by_team"],
-        "roles_by_team_sys": out_ias["roles_by_team_sys"],
-        "bundles_by_team": out_ias["bundles_by_team"],
-    }
-    merged_new = merge_outputs_append_only(merged_new, out_sap)
-
-    if len(df_other) > 0:
-        out_o = to_outputs(df_other, is_sap=False)
-        merged_new = merge_outputs_append_only(merged_new, out_o)
-
-    # ✅ 기존 산출물 로드 + append-only merge
-    old = load_old_outputs(out_base)
-    if old is not None:
-        merged_all = merge_outputs_append_only(old, merged_new)
-    else:
-        merged_all = merged_new
+    with stage(prof, "to_outputs", rows_in=len(df_level_mapped)) as st:
+        ias_like = ["IAS", "LEGO", CONFIG["constants"]["IAS_SYS_NAME_FORCED"]]
+        df_ias_like = df_level_mapped[df_level_mapped["sys_code"].isin(ias_like)].copy()
+        df_sap_like = df_level_mapped[df_level_mapped["sys_code"] == "SAP"].copy()
+        df_other = df_level_mapped[~df_level_mapped["sys_code"].isin(ias_like + ["SAP"])].copy()
+
+        out_ias = to_outputs(df_ias_like, is_sap=False)
+        out_sap = to_outputs(df_sap_like, is_sap=True)
+
+        merged_new = {
+            "teams_records": out_ias["teams_records"],
+            "systems_by_team": out_ias["systems_by_team"],
+            "roles_by_team_sys": out_ias["roles_by_team_sys"],
+            "bundles_by_team": out_ias["bundles_by_team"],
+        }
+        merged_new = merge_outputs_append_only(merged_new, out_sap)
+
+        if len(df_other) > 0:
+            out_o = to_outputs(df_other, is_sap=False)
+            merged_new = merge_outputs_append_only(merged_new, out_o)
+        st["rows_out"] = sum(len(v) for v in merged_new["bundles_by_team"].values())
+
+    # ✅ 기존 산출물 로드(index만) + append-only merge. 번들은 아래에서 팀 단위로 스트리밍 merge
+    with stage(prof, "merge_old") as st:
+        menu_catalog = load_menu_catalog(out_base)
+        old = load_old_outputs(out_base, menu_catalog, with_bundles=False)
+        new_bundles_by_team = merged_new.pop("bundles_by_team")
+        if old is not None:
+            merged_all = merge_outputs_append_only(old, merged_new)
+        else:
+            merged_all = merged_new
+        n_roles = sum(len(v) for v in merged_all["roles_by_team_sys"].values())
+        st["rows_out"] = n_roles
 
     # --- index json 저장
-    (out_base / "index_teams.json").write_text(
-        json.dumps({"teams": merged_all["teams_records"]}, ensure_ascii=False, indent=2),
-        encoding="utf-8",
-    )
-    (out_base / "index_systems_by_team.json").write_text(
-        json.dumps(merged_all["systems_by_team"], ensure_ascii=False, indent=2),
-        encoding="utf-8",
-    )
-    (out_base / "index_roles_by_team_sys.json").write_text(
-        json.dumps(merged_all["roles_by_team_sys"], ensure_ascii=False, indent=2),
-        encoding="utf-8",
+    with stage(prof, "write_index", rows_in=n_roles):
+        # 임시 파일 + os.replace (서빙 중 읽는 쪽이 반쯤 쓴 파일을 보지 않음), 내용이 같으면 건너뜀
+        index_docs = {
+            "index_teams.json": {"teams": merged_all["teams_records"]},
+            "index_systems_by_team.json": merged_all["systems_by_team"],
+            "index_roles_by_team_sys.json": merged_all["roles_by_team_sys"],
+        }
+        n_idx = sum(
+            int(write_bytes_if_changed(out_base / name, dump_index_json(obj).encode("utf-8"), manifest, name))
+            for name, obj in index_docs.items()
+        )
+        print(f"[WRITE] index: {n_idx}/{len(index_docs)} files rewritten")
+        if CONFIG["output"]["role_shards"]:
+            n_rs, n_rt = write_role_shards(out_base, merged_all["systems_by_team"], merged_all["roles_by_team_sys"], manifest)
+            print(f"[WRITE] roles: {n_rs}/{n_rt + 1} files rewritten (team shards + manifest)")
+
+    # --- bundles jsonl 저장(by_team): 팀 하나씩 기존 jsonl 읽기 -> merge -> 임시 파일 -> 원자적 교체
+    use_catalog = CONFIG["output"]["bundle_menus"] == "catalog"
+    use_shared = CONFIG["output"]["bundle_store"] == "shared"
+    out_by_role = out_base / BY_ROLE_DIR
+    t_write = time.perf_counter()
+    with stage(prof, "write_bundles", rows_in=sum(len(v) for v in new_bundles_by_team.values())) as st:
+        stats = write_team_bundles_streaming(out_base, new_bundles_by_team, old is not None, menu_catalog, manifest, workers=workers)
+        if use_catalog:
+            write_menu_catalog(out_base, menu_catalog)
+        st["rows_out"] = stats["bundles"]
+    print(
+        f"[WRITE] by_team: {stats['written']}/{stats['teams']} files rewritten "
+        f"(max bundles per team={stats['max_team_bundles']}, workers={workers}, {time.perf_counter() - t_write:.2f}s)"
     )
+    if CONFIG["output"]["menu_index"]:
+        print(f"[WRITE] menu_index: {stats['index_written']}/{stats['teams']} files rewritten")
+
+    if CONFIG["output"]["fuzzy_index"]:
+        print(f"[WRITE] fuzzy index: {stats['fuzzy_written']}/1 files rewritten (terms={stats['fuzzy_terms']})")
+    if CONFIG["output"]["binary_bundle"]:
+        print(f"[WRITE] binary bundle: {stats['binary_written']}/1 files rewritten ({stats['binary_bytes'] / 1024:.1f}KB)")
+
+    # --- 마무리: .gz / .br 사이드카 + 크기 보고 (모든 산출물을 쓴 뒤)
+    use_gzip = bool(CONFIG["finalize"]["gzip"])
+    use_brotli = bool(CONFIG["finalize"]["brotli"])
+    if use_gzip or use_brotli:
+        if use_brotli and brotli is None:
+            print("[FINAL] brotli 모듈 없음 -> .br 생략 (pip install brotli)")
+        t_final = time.perf_counter()
+        with stage(prof, "finalize") as st:
+            final_rows = finalize_artifacts(out_base, manifest, use_gzip, use_brotli)
+            st["rows_out"] = len(final_rows)
+        report = size_report(final_rows)
+        print(
+            f"[FINAL] sidecars: {sum(r['written'] for r in final_rows)} written for {len(final_rows)} files "
+            f"({time.perf_counter() - t_final:.2f}s)"
+        )
+        print_size_report(report)
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        (cache_dir / SIZE_REPORT_FILE).write_text(
+            json.dumps({"artifacts": report, "files": final_rows}, ensure_ascii=False, indent=2),
+            encoding="utf-8",
+        )
 
-    # --- bundles jsonl 저장(by_team)
-    for team_code, bundle_map in merged_all["bundles_by_team"].items():
-        out_path = out_by_team / f"role_bundle_team_{team_code}.jsonl"
-        rows = list(bundle_map.values())
-        rows.sort(key=lambda b: (norm_text(b.get("sys_name","")), norm_text(b.get("auth_name","")), norm_code(b.get("auth_code",""))))
-        with out_path.open("w", encoding="utf-8") as f:
-            for row in rows:
-                f.write(json.dumps(row, ensure_ascii=False) + "\n")
+    if manifest is not None:
+        save_build_manifest(cache_dir, manifest)
 
     print("✅ 완료 (append-only, no delete)")
-    print(f"- Excel Output: {out_xlsx}")
+    print(f"- Excel Output: {out_xlsx}" if not args.no_excel else "- Excel Output: (--no-excel)")
     print(f"- JSON index: {out_base / 'index_teams.json'}")
     print(f"- JSON index: {out_base / 'index_systems_by_team.json'}")
     print(f"- JSON index: {out_base / 'index_roles_by_team_sys.json'}")
     print(f"- JSONL bundles: {out_by_team} / role_bundle_team_<team_code>.jsonl")
+    if CONFIG["output"]["role_shards"]:
+        print(f"- Role shards: {out_base / ROLES_DIR} / <team_code>.json + manifest.json")
+    if CONFIG["output"]["menu_index"]:
+        print(f"- Menu index: {out_base / MENU_INDEX_DIR} / menu_index_team_<team_code>.json")
+    if CONFIG["output"]["fuzzy_index"]:
+        print(f"- Fuzzy index: {out_base / FUZZY_DIR / FUZZY_INDEX_FILE}")
+    if CONFIG["output"]["binary_bundle"]:
+        print(f"- Binary bundle: {out_base / BINARY_BUNDLE_FILE} (server-side mmap lookups)")
+    if use_shared:
+        print(f"- Shared roles: {out_by_role} / <hash>.json (files={sum(1 for _ in out_by_role.glob('*.json'))})")
+    if use_catalog:
+        print(f"- Menu catalog: {out_base / MENU_CATALOG_FILE} (menus={len(menu_catalog['menus'])})")
+    if use_gzip or use_brotli:
+        print(f"- Size report: {cache_dir / SIZE_REPORT_FILE}")
     print(f"- Log rows: {len(df_log)}")
+    peak = peak_rss_mb()
+    print(f"- Peak RSS: {peak:.1f} MB" if peak is not None else "- Peak RSS: (측정 불가: resource/psutil 없음)")
+
+    if prof is not None:
+        report = build_report(prof)
+        report_path = Path(args.report) if args.report else cache_dir / BUILD_REPORT_FILE
+        write_build_report(report_path, report)
+        print_stage_table(report)
+        print(f"- Build report: {report_path}")
+        if report["budget_failures"]:
+            print(f"❌ 단계 예산 초과 {len(report['budget_failures'])}건")
+            sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""
+검색어 정규화 / n-gram 규칙 (공유)
+
+- 정규화: 프런트 normalize()와 같은 규칙(소문자 + 공백 제거) + NFC
+  (맥에서 만든 엑셀 등 자모 분리(NFD) 한글도 같은 음절로 맞춤)
+- permission_query / intent_engine / fuzzy_index / batch_intent 가 같은 규칙을 쓰도록 한 곳에 둠
+
+질의 규칙 (query_grams, permission_query.py 토큰 후보 좁히기)
+- 키워드 2글자: 그 2-gram
+- 키워드 3글자 이상: 모든 3-gram (posting 교집합 = 부분일치의 후보, 드물게 false positive 가능)
+- 1글자 키워드는 gram 없음 (호출 측에서 전체 확인)
+"""
+
+import re
+import unicodedata
+from typing import List, Set
+
+GRAM_SIZES = (2, 3)
+
+_RE_SPACE = re.compile(r"\s+")
+
+
+def search_normalize(text) -> str:
+    """프런트 normalize(text) = text.toLowerCase().replace(/\\s+/g, '') 에 NFC만 추가"""
+    if text is None:
+        return ""
+    s = unicodedata.normalize("NFC", str(text))
+    return _RE_SPACE.sub("", s.lower())
+
+
+def text_grams(text) -> Set[str]:
+    s = search_normalize(text)
+    out: Set[str] = set()
+    for n in GRAM_SIZES:
+        for i in range(len(s) - n + 1):
+            out.add(s[i:i + n])
+    return out
+
+
+def query_grams(keyword: str) -> List[str]:
+    s = search_normalize(keyword)
+    if len(s) < 2:
+        return []
+    if len(s) == 2:
+        return [s]
+    return sorted({s[i:i + 3] for i in range(len(s) - 2)})
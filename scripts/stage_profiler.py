@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+"""
+전처리 단계별 계측 (preprocess_permissions_v2.main 에서 사용)
+
+단계마다 기록하는 값
+- wall_s      : 경과 시간
+- cpu_s       : 이 프로세스 CPU 시간 + 그 단계에서 끝난 자식 프로세스(--workers) CPU 시간
+- rows_in / rows_out : 호출 측이 넘긴 행 수 (없으면 null)
+- rss_start_mb / rss_end_mb : 단계 시작 / 끝의 현재 RSS
+- rss_peak_mb : 단계 중 현재 RSS 최댓값 (백그라운드 스레드가 sample_interval_s 마다 측정, 자식 프로세스 제외)
+- max_rss_mb  : 단계 끝 시점의 프로세스 최대 RSS (ru_maxrss, 누적)
+
+산출물
+- build_report.json : {"version","started_at","total_wall_s","total_cpu_s","max_rss_mb","stages":[...],"budget_failures":[...]}
+- (선택) 단계별 cProfile: <profile_dir>/<순번>_<단계>.prof  (python -m pstats 파일 로 확인)
+
+예산(budgets): {"단계": {"wall_s": 초, "cpu_s": 초, "rss_peak_mb": MB}} 중 넘은 항목은 budget_failures 에 기록
+"""
+
+import cProfile
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+try:  # 선택: peak RSS 보고용. resource는 POSIX 전용 -> Windows는 psutil이 있으면 사용
+    import resource
+except ImportError:
+    resource = None
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+BUILD_REPORT_FILE = "build_report.json"
+BUILD_REPORT_VERSION = 1
+BUDGET_KEYS = ("wall_s", "cpu_s", "rss_peak_mb")
+
+
+def peak_rss_mb() -> Optional[float]:
+    """프로세스 최대 메모리(MB). 측정 수단이 없으면 None"""
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024  # macOS는 bytes, Linux는 KB
+    if psutil is not None:
+        mi = psutil.Process().memory_info()
+        return getattr(mi, "peak_wset", mi.rss) / (1024 * 1024)
+    return None
+
+
+def current_rss_mb() -> Optional[float]:
+    """현재 RSS(MB). psutil -> /proc/self/statm(Linux) 순, 둘 다 없으면 None"""
+    if psutil is not None:
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, AttributeError, IndexError):
+        return None
+
+
+def cpu_seconds() -> float:
+    """자기 프로세스 + 종료된 자식 프로세스 CPU 시간"""
+    t = time.process_time()
+    if resource is not None:
+        ru = resource.getrusage(resource.RUSAGE_CHILDREN)
+        t += ru.ru_utime + ru.ru_stime
+    return t
+
+
+def _round(v: Optional[float], nd: int = 3) -> Optional[float]:
+    return None if v is None else round(v, nd)
+
+
+# =========================
+# 프로파일러 상태 (dict) + 단계 컨텍스트
+# =========================
+def new_stage_profiler(budgets: Optional[Dict[str, Dict]] = None, profile_stages: Iterable[str] = (),
+                       profile_dir: Optional[Path] = None, sample_interval_s: float = 0.02) -> Dict:
+    """
+    profile_stages: cProfile을 켤 단계 이름들 ("all" 이면 전부). 비어 있으면 cProfile 없음
+    """
+    for name, limits in (budgets or {}).items():
+        unknown = set(limits or {}) - set(BUDGET_KEYS)
+        if unknown:
+            raise ValueError(f"알 수 없는 예산 항목: {name}.{sorted(unknown)} (가능: {', '.join(BUDGET_KEYS)})")
+    profile_stages = set(profile_stages)
+    return {
+        "budgets": dict(budgets or {}),
+        "profile_all": "all" in profile_stages,
+        "profile_stages": profile_stages - {"all"},
+        "profile_dir": Path(profile_dir) if profile_dir else None,
+        "sample_interval_s": sample_interval_s,
+        "started_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "t0": time.perf_counter(),
+        "cpu0": cpu_seconds(),
+        "stages": [],
+    }
+
+
+class _RssSampler(threading.Thread):
+    """단계 중 현재 RSS 최댓값 (측정 불가면 peak=None)"""
+
+    def __init__(self, interval: float):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.peak = current_rss_mb()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            v = current_rss_mb()
+            if v is not None and (self.peak is None or v > self.peak):
+                self.peak = v
+
+    def stop(self) -> Optional[float]:
+        self._stop_event.set()
+        self.join()
+        v = current_rss_mb()
+        if v is not None and (self.peak is None or v > self.peak):
+            self.peak = v
+        return self.peak
+
+
+@contextmanager
+def stage(prof: Optional[Dict], name: str, rows_in: Optional[int] = None):
+    """
+    with stage(prof, "level_mapping", rows_in=len(df)) as st:
+        ...
+        st["rows_out"] = len(out)
+    prof가 None이면 계측 없이 빈 dict만 넘김 (호출 측 코드는 그대로)
+    """
+    rec: Dict = {"name": name, "rows_in": rows_in, "rows_out": None}
+    if prof is None:
+        yield rec
+        return
+
+    profiler = None
+    if prof["profile_dir"] is not None and (prof["profile_all"] or name in prof["profile_stages"]):
+        profiler = cProfile.Profile()
+    sampler = None
+    if prof["sample_interval_s"] > 0 and current_rss_mb() is not None:
+        sampler = _RssSampler(prof["sample_interval_s"])
+        sampler.start()
+    rss_start = current_rss_mb()
+    cpu0 = cpu_seconds()
+    t0 = time.perf_counter()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield rec
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        wall = time.perf_counter() - t0
+        cpu = cpu_seconds() - cpu0
+        rss_peak = sampler.stop() if sampler is not None else None
+        rec.update(
+            wall_s=_round(wall),
+            cpu_s=_round(cpu),
+            rss_start_mb=_round(rss_start, 1),
+            rss_end_mb=_round(current_rss_mb(), 1),
+            rss_peak_mb=_round(rss_peak, 1),
+            max_rss_mb=_round(peak_rss_mb(), 1),
+        )
+        if profiler is not None:
+            prof["profile_dir"].mkdir(parents=True, exist_ok=True)
+            path = prof["profile_dir"] / f"{len(prof['stages']) + 1:02d}_{name}.prof"
+            profiler.dump_stats(str(path))
+            rec["profile"] = str(path)
+        prof["stages"].append(rec)
+
+
+# =========================
+# 예산 확인 / 보고
+# =========================
+def budget_failures(prof: Dict) -> List[Dict]:
+    """설정된 예산을 넘은 (단계, 항목) 목록. 예산에 있지만 실행되지 않은 단계는 무시"""
+    out = []
+    for rec in prof["stages"]:
+        for key, limit in (prof["budgets"].get(rec["name"]) or {}).items():
+            actual = rec.get(key)
+            if actual is not None and limit is not None and actual > float(limit):
+                out.append({"stage": rec["name"], "metric": key, "limit": float(limit), "actual": actual})
+    return out
+
+
+def build_report(prof: Dict) -> Dict:
+    return {
+        "version": BUILD_REPORT_VERSION,
+        "started_at": prof["started_at"],
+        "total_wall_s": _round(time.perf_counter() - prof["t0"]),
+        "total_cpu_s": _round(cpu_seconds() - prof["cpu0"]),
+        "max_rss_mb": _round(peak_rss_mb(), 1),
+        "stages": prof["stages"],
+        "budgets": prof["budgets"],
+        "budget_failures": budget_failures(prof),
+    }
+
+
+def write_build_report(path: Path, report: Dict):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+def print_stage_table(report: Dict):
+    def fmt(v, spec: str) -> str:
+        return "-" if v is None else format(v, spec)
+
+    print(f"[STAGE] {'stage':<16} {'wall_s':>8} {'cpu_s':>8} {'rows_in':>10} {'rows_out':>10} {'rss_peak':>9} {'max_rss':>9}")
+    for r in report["stages"]:
+        print(
+            f"[STAGE] {r['name']:<16} {fmt(r['wall_s'], '8.2f')} {fmt(r['cpu_s'], '8.2f')} "
+            f"{fmt(r['rows_in'], '10d')} {fmt(r['rows_out'], '10d')} "
+            f"{fmt(r['rss_peak_mb'], '9.1f')} {fmt(r['max_rss_mb'], '9.1f')}"
+        )
+    print(f"[STAGE] {'total':<16} {fmt(report['total_wall_s'], '8.2f')} {fmt(report['total_cpu_s'], '8.2f')}")
+    for f in report["budget_failures"]:
+        print(f"[BUDGET] ❌ {f['stage']}.{f['metric']} = {f['actual']} > {f['limit']}")
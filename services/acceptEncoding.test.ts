@@ -0,0 +1,37 @@
+import { test } from "node:test";
+import assert from "node:assert/strict";
+import { acceptsEncoding, preferredEncoding } from "./acceptEncoding";
+
+test("explicit coding wins over *", () => {
+  assert.equal(acceptsEncoding("gzip;q=0, *;q=1", "gzip"), false);
+  assert.equal(acceptsEncoding("gzip;q=0, *;q=1", "br"), true);
+  assert.equal(acceptsEncoding("br;q=0, *", "br"), false);
+  assert.equal(acceptsEncoding("br;q=0, *", "gzip"), true);
+});
+
+test("* applies only to unlisted codings", () => {
+  assert.equal(acceptsEncoding("*", "br"), true);
+  assert.equal(acceptsEncoding("*;q=0", "gzip"), false);
+  assert.equal(acceptsEncoding("*;q=0, gzip", "gzip"), true);
+});
+
+test("plain lists and q values", () => {
+  assert.equal(acceptsEncoding("gzip, deflate, br", "br"), true);
+  assert.equal(acceptsEncoding("gzip, deflate", "br"), false);
+  assert.equal(acceptsEncoding("GZIP; Q=0.5", "gzip"), true);
+  assert.equal(acceptsEncoding("gzip;q=0.000", "gzip"), false);
+  assert.equal(acceptsEncoding("gzip;q=abc", "gzip"), false);
+  assert.equal(acceptsEncoding("", "gzip"), false);
+});
+
+test("preferredEncoding picks the highest q, br > gzip only on ties", () => {
+  const both = ["br", "gzip"];
+  assert.equal(preferredEncoding("gzip, deflate, br", both), "br");
+  assert.equal(preferredEncoding("br;q=0.5, gzip;q=1", both), "gzip");
+  assert.equal(preferredEncoding("gzip;q=0.8, br;q=0.9", both), "br");
+  assert.equal(preferredEncoding("gzip, *;q=0.1", both), "gzip");
+  assert.equal(preferredEncoding("br;q=0, *", both), "gzip");
+  assert.equal(preferredEncoding("br;q=0.5, gzip;q=1", ["br"]), "br"); // gzip 사이드카 없음
+  assert.equal(preferredEncoding("identity", both), undefined);
+  assert.equal(preferredEncoding("", both), undefined);
+});
@@ -0,0 +1,40 @@
+// ✅ Accept-Encoding 해석 (사전 압축 사이드카 선택용)
+// - 헤더를 {coding: q} 로 파싱. q 없으면 1, 숫자가 아니면 0
+// - 해당 coding이 명시돼 있으면 그 q가 결정 ("br;q=0, *" -> br 불가)
+// - 명시돼 있지 않을 때만 "*" 의 q 적용. 둘 다 없으면 불가
+// - 여러 후보 중에서는 q가 가장 높은 coding, q가 같으면 후보 목록 순서(서버 선호: br > gzip)
+
+export function parseAcceptEncoding(header: string): Map<string, number> {
+  const out = new Map<string, number>();
+  for (const part of String(header || "").split(",")) {
+    const [rawName, ...params] = part.trim().toLowerCase().split(";");
+    const name = rawName.trim();
+    if (!name || out.has(name)) continue; // 같은 coding이 여러 번이면 첫 값
+    const qParam = params.map((p) => p.trim()).find((p) => p.startsWith("q="));
+    const q = qParam ? Number(qParam.slice(2)) : 1;
+    out.set(name, Number.isFinite(q) ? q : 0);
+  }
+  return out;
+}
+
+function encodingQ(codings: Map<string, number>, encoding: string): number {
+  return codings.get(encoding.toLowerCase()) ?? codings.get("*") ?? 0;
+}
+
+export function acceptsEncoding(header: string, encoding: string): boolean {
+  return encodingQ(parseAcceptEncoding(header), encoding) > 0;
+}
+
+export function preferredEncoding(header: string, candidates: string[]): string | undefined {
+  const codings = parseAcceptEncoding(header);
+  let best: string | undefined;
+  let bestQ = 0;
+  for (const encoding of candidates) {
+    const q = encodingQ(codings, encoding);
+    if (q > bestQ) {
+      best = encoding;
+      bestQ = q;
+    }
+  }
+  return best;
+}
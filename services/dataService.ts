@@ -1,4 +1,4 @@
-import { Team, System, Role, RoleBundle } from "../types";
+import { Team, System, Role, RoleBundle, Menu, TeamRoleShard } from "../types";
 
 const BASE_PATH = import.meta.env.BASE_URL || "/";
 
@@ -19,21 +19,147 @@ export async function fetchTeams(): Promise<Team[]> {
   return [];
 }
 
+// roles/manifest.json + roles/<team_code>.json: 팀 선택 시 그 팀 샤드 하나만 받음 (해시를 ?v= 로 붙여 캐시 무효화)
+// 샤드가 없으면(이전 산출물) 전체 index json으로 대체 -> 이것도 1회만 받아 재사용
+let rolesManifestPromise: Promise<Record<string, string> | null> | null = null;
+const teamRoleShardCache = new Map<string, Promise<TeamRoleShard | null>>();
+let systemsIndexPromise: Promise<Record<string, System[]>> | null = null;
+let rolesIndexPromise: Promise<Record<string, Role[]>> | null = null;
+
+function fetchRolesManifest(): Promise<Record<string, string> | null> {
+  if (!rolesManifestPromise) {
+    rolesManifestPromise = fetch(getAssetPath("data/roles/manifest.json"))
+      .then(res => (res.ok ? res.json() : null))
+      .then(data => (data?.teams ? (data.teams as Record<string, string>) : null))
+      .catch(() => {
+        rolesManifestPromise = null;
+        return null;
+      });
+  }
+  return rolesManifestPromise;
+}
+
+async function fetchTeamRoleShard(teamCode: string): Promise<TeamRoleShard | null> {
+  const manifest = await fetchRolesManifest();
+  const version = manifest?.[teamCode];
+  if (!version) return null;
+
+  const cacheKey = `${teamCode}@${version}`;
+  let p = teamRoleShardCache.get(cacheKey);
+  if (!p) {
+    const safeTeamCode = encodeURIComponent(String(teamCode || "").trim());
+    p = fetch(getAssetPath(`data/roles/${safeTeamCode}.json?v=${version}`))
+      .then(res => (res.ok ? (res.json() as Promise<TeamRoleShard>) : null))
+      .catch(() => {
+        teamRoleShardCache.delete(cacheKey);
+        return null;
+      });
+    teamRoleShardCache.set(cacheKey, p);
+  }
+  return p;
+}
+
+function fetchJsonOrThrow<T>(path: string, errorMessage: string): Promise<T> {
+  return fetch(getAssetPath(path)).then(res => {
+    if (!res.ok) throw new Error(errorMessage);
+    return res.json() as Promise<T>;
+  });
+}
+
 export async function fetchSystemsByTeam(teamCode: string): Promise<System[]> {
-  const response = await fetch(getAssetPath("data/index_systems_by_team.json"));
-  if (!response.ok) throw new Error("시스템 목록을 불러오지 못했습니다.");
-  const data = await response.json();
+  const shard = await fetchTeamRoleShard(teamCode);
+  if (shard) return (shard.systems || []) as System[];
+
+  if (!systemsIndexPromise) {
+    systemsIndexPromise = fetchJsonOrThrow<Record<string, System[]>>("data/index_systems_by_team.json", "시스템 목록을 불러오지 못했습니다.")
+      .catch(err => {
+        systemsIndexPromise = null;
+        throw err;
+      });
+  }
+  const data = await systemsIndexPromise;
   return (data?.[teamCode] || []) as System[];
 }
 
 export async function fetchRolesByTeamSys(teamCode: string, sysCode: string): Promise<Role[]> {
-  const response = await fetch(getAssetPath("data/index_roles_by_team_sys.json"));
-  if (!response.ok) throw new Error("권한 목록을 불러오지 못했습니다.");
-  const data = await response.json();
+  const shard = await fetchTeamRoleShard(teamCode);
+  if (shard) return (shard.roles?.[sysCode] || []) as Role[];
+
+  if (!rolesIndexPromise) {
+    rolesIndexPromise = fetchJsonOrThrow<Record<string, Role[]>>("data/index_roles_by_team_sys.json", "권한 목록을 불러오지 못했습니다.")
+      .catch(err => {
+        rolesIndexPromise = null;
+        throw err;
+      });
+  }
+  const data = await rolesIndexPromise;
   const key = `${teamCode}|${sysCode}`;
   return (data?.[key] || []) as Role[];
 }
 
+// menu_catalog.json: 번들이 menu_refs(정수 id)로 기록된 경우에만 1회 로드 후 재사용
+let menuCatalogPromise: Promise<Menu[]> | null = null;
+
+export function fetchMenuCatalog(): Promise<Menu[]> {
+  if (!menuCatalogPromise) {
+    menuCatalogPromise = fetch(getAssetPath("data/menu_catalog.json"))
+      .then(res => {
+        if (!res.ok) throw new Error("메뉴 카탈로그를 불러오지 못했습니다.");
+        return res.json();
+      })
+      .then(data => (Array.isArray(data?.menus) ? data.menus : []) as Menu[])
+      .catch(err => {
+        menuCatalogPromise = null; // 실패는 캐시하지 않음
+        throw err;
+      });
+  }
+  return menuCatalogPromise;
+}
+
+// by_role/<hash>.json: 여러 팀이 공유하는 권한 payload (해시가 같으면 내용도 같으므로 영구 캐시)
+const sharedRoleCache = new Map<string, Promise<Partial<RoleBundle>>>();
+
+function fetchSharedRole(ref: string): Promise<Partial<RoleBundle>> {
+  let p = sharedRoleCache.get(ref);
+  if (!p) {
+    p = fetch(getAssetPath(`data/by_role/${encodeURIComponent(ref)}.json`))
+      .then(res => {
+        if (!res.ok) throw new Error("공유 권한 데이터를 불러오지 못했습니다.");
+        return res.json();
+      })
+      .catch(err => {
+        sharedRoleCache.delete(ref);
+        throw err;
+      });
+    sharedRoleCache.set(ref, p);
+  }
+  return p;
+}
+
+async function resolveRoleRefs(items: RoleBundle[]): Promise<RoleBundle[]> {
+  if (!items.some(b => b.role_ref)) return items;
+  return Promise.all(
+    items.map(async b => {
+      if (!b.role_ref) return b;
+      const payload = await fetchSharedRole(b.role_ref);
+      return { team_code: b.team_code, team_name: b.team_name, ...payload } as RoleBundle;
+    })
+  );
+}
+
+async function expandMenuRefs(items: RoleBundle[]): Promise<RoleBundle[]> {
+  if (!items.some(b => Array.isArray(b.menu_refs))) return items;
+  const catalog = await fetchMenuCatalog();
+  return items.map(b => {
+    if (!Array.isArray(b.menu_refs)) return b;
+    const menus = b.menu_refs
+      .map(i => catalog[i])
+      .filter(Boolean)
+      .map(m => ({ path: m.path, menu_id: m.menu_id }));
+    return { ...b, menus };
+  });
+}
+
 export async function fetchRoleBundle(teamCode: string): Promise<RoleBundle[]> {
   // 파일명 규칙: public/data/by_team/role_bundle_team_${teamCode}.jsonl
   // teamCode에 공백/특수문자가 섞일 가능성 방어
@@ -60,7 +186,7 @@ export async function fetchRoleBundle(teamCode: string): Promise<RoleBundle[]> {
       // 깨진 줄은 스킵
     }
   }
-  return items;
+  return expandMenuRefs(await resolveRoleRefs(items));
 }
 
 
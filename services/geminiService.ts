@@ -30,7 +30,9 @@ export async function analyzeIntent(
     const candidates = Array.isArray(data?.candidates) ? data.candidates : [];
     const confidence = typeof data?.confidence === "number" ? data.confidence : 0.6;
 
-    return { type, keyword, message, candidates, confidence } as SearchResult;
+    const result = { type, keyword, message, candidates, confidence } as SearchResult;
+    if (Array.isArray(data?.suggestions)) result.suggestions = data.suggestions;
+    return result;
   } catch (e) {
     console.error("❌ intent api 실패 → fallback 동작", e);
     return fallbackAnalysis(safeQuery);
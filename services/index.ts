@@ -1,7 +1,18 @@
 import express from "express";
 import dotenv from "dotenv";
+import fs from "fs";
 import path from "path";
 import { GoogleGenAI, Type } from "@google/genai";
+import {
+  getCachedIntent,
+  intentCacheKey,
+  intentCacheStats,
+  intentCacheVersion,
+  recordLatency,
+  setCachedIntent,
+  sweepExpiredIntents,
+} from "./intentCache";
+import { preferredEncoding } from "./acceptEncoding";
 
 dotenv.config();
 
@@ -22,11 +33,86 @@ app.get("/api/health", (_req, res) => res.json({ ok: true }));
 
 type IntentType = "ROLE_TO_MENU" | "MENU_TO_ROLE" | "ROLE_LIST" | "UNKNOWN";
 
-app.post("/api/analyze-intent", async (req, res) => {
+// ✅ 규칙 기반 의도 분류기(scripts/permission_query.py 의 /api/intent)를 Gemini 앞에서 먼저 시도
+//    - INTENT_ENGINE_URL 미설정 / 실패 / 타임아웃 / escalate=true(신뢰도 미달) 이면 기존대로 Gemini 호출
+const INTENT_ENGINE_URL = (process.env.INTENT_ENGINE_URL || "").replace(/\/+$/, "");
+const INTENT_ENGINE_TIMEOUT_MS = Number(process.env.INTENT_ENGINE_TIMEOUT_MS || 300);
+
+// ✅ 후보 선해석: 규칙 엔진 서버가 keyword/candidates를 권한/메뉴 인덱스에 미리 대조한 결과
+//    hits 순서 = 점수순, menu_id ""이면 권한 단위 hit. hit_roles: "team_code|sys_code|auth_code" -> 권한 행
+type CandidateHit = {
+  team_code: string;
+  sys_code: string;
+  auth_code: string;
+  menu_id: string;
+  path: string;
+  score: number;
+};
+
+type ResolvedCandidates = {
+  hits: CandidateHit[];
+  hit_roles: Record<string, Record<string, string>>;
+  hit_count: number;
+  // hit가 없을 때만: 검색어별 오타 교정 후보 (fuzzy_index)
+  suggestions?: Array<{ text: string; kinds: string[]; count: number; distance: number; keyword: string }>;
+};
+
+type RuleIntent = {
+  type: IntentType;
+  keyword: string;
+  candidates: string[];
+  message: string;
+  confidence: number;
+  escalate: boolean;
+} & Partial<ResolvedCandidates>;
+
+async function classifyWithRules(query: string, team: string, system: string, resolve = true): Promise<RuleIntent | null> {
+  if (!INTENT_ENGINE_URL) return null;
+  try {
+    const params = new URLSearchParams({ query, team, system });
+    if (!resolve) params.set("resolve", "0");
+    const r = await fetch(`${INTENT_ENGINE_URL}/api/intent?${params}`, {
+      signal: AbortSignal.timeout(INTENT_ENGINE_TIMEOUT_MS),
+    });
+    if (!r.ok) return null;
+    return (await r.json()) as RuleIntent;
+  } catch {
+    return null;
+  }
+}
+
+async function resolveWithIndex(
+  intent: { type: string; keyword: string; candidates: string[] },
+  query: string,
+  team: string,
+  system: string
+): Promise<ResolvedCandidates | null> {
+  if (!INTENT_ENGINE_URL) return null;
   try {
-    const { query, currentTeam, currentSystem } = req.body ?? {};
+    const params = new URLSearchParams({ type: intent.type, keyword: intent.keyword, query, team, system });
+    for (const c of intent.candidates || []) params.append("candidate", c);
+    const r = await fetch(`${INTENT_ENGINE_URL}/api/resolve?${params}`, {
+      signal: AbortSignal.timeout(INTENT_ENGINE_TIMEOUT_MS),
+    });
+    if (!r.ok) return null;
+    const { hits, hit_roles, hit_count, suggestions } = (await r.json()) as ResolvedCandidates;
+    return suggestions ? { hits, hit_roles, hit_count, suggestions } : { hits, hit_roles, hit_count };
+  } catch {
+    return null;
+  }
+}
+
+function ruleIntentResponse(r: RuleIntent): IntentResult {
+  const { type, keyword, candidates, message, confidence, hits, hit_roles, hit_count, suggestions } = r;
+  const base = { type, keyword, candidates, message, confidence };
+  if (!hits) return base;
+  return suggestions ? { ...base, hits, hit_roles, hit_count, suggestions } : { ...base, hits, hit_roles, hit_count };
+}
 
-    const systemInstruction = `
+// ✅ 의도 분석 캐시 상태 (hit rate / 경로별 지연)
+app.get("/api/intent-cache/stats", (_req, res) => res.json(intentCacheStats()));
+
+const INTENT_SYSTEM_INSTRUCTION = `
     당신은 "사내 권한/메뉴 안내" 챗봇의 의도 분류기입니다.
     사용자의 한 문장을 보고, 아래 4가지 중 하나로 의도를 분류하고 "항상 JSON만" 반환하세요.
 
@@ -64,99 +150,341 @@ app.post("/api/analyze-intent", async (req, res) => {
     [출력 강제]
     - 반드시 responseSchema에 맞춘 JSON만 출력
     - 설명/마크다운/코드블록 금지
-    `.trim();
-
-    const safeQuery = typeof query === "string" ? query.trim() : "";
-    if (!safeQuery) {
-      return res.json({
-        type: "UNKNOWN",
-        keyword: "",
-        candidates: [],
-        message: "질문을 입력해 주세요.",
-        confidence: 0.2,
-      });
+`.trim();
+
+const INTENT_MODEL = "gemini-2.5-flash";
+const INTENT_RESPONSE_SCHEMA = {
+  type: Type.OBJECT,
+  properties: {
+    type: { type: Type.STRING },
+    keyword: { type: Type.STRING },
+    candidates: { type: Type.ARRAY, items: { type: Type.STRING } },
+    message: { type: Type.STRING },
+    confidence: { type: Type.NUMBER },
+  },
+  required: ["type", "keyword", "message", "candidates", "confidence"],
+};
+// ✅ 캐시 키에 포함: 프롬프트/스키마/모델이 바뀌면 이전 배포의 캐시 결과를 쓰지 않음
+const INTENT_CACHE_VERSION = intentCacheVersion(INTENT_MODEL, INTENT_SYSTEM_INSTRUCTION, INTENT_RESPONSE_SCHEMA);
+
+type IntentResult = {
+  type: IntentType;
+  keyword: string;
+  candidates: string[];
+  message: string;
+  confidence: number;
+} & Partial<ResolvedCandidates>;
+
+function unknownIntent(message: string, confidence: number): IntentResult {
+  return { type: "UNKNOWN", keyword: "", candidates: [], message, confidence };
+}
+
+// ✅ GoogleGenAI 클라이언트는 프로세스당 1개만 만들어 재사용 (요청마다 new 하지 않음)
+let genAI: GoogleGenAI | null = null;
+function getGenAI(): GoogleGenAI | null {
+  const apiKey = process.env.GEMINI_API_KEY;
+  if (!apiKey) return null;
+  if (!genAI) genAI = new GoogleGenAI({ apiKey });
+  return genAI;
+}
+
+// parsed: 응답이 JSON 객체로 파싱됐는지 (false면 기본값으로 채운 결과 -> 캐시하지 않음)
+async function classifyWithGemini(
+  ai: GoogleGenAI,
+  safeQuery: string,
+  currentTeam: string,
+  currentSystem: string
+): Promise<{ result: IntentResult; parsed: boolean }> {
+  const userContext = {
+    query: safeQuery,
+    selected_team: currentTeam || "",
+    selected_system: currentSystem || "",
+    hints: [
+      "팀 선택/시스템 선택이 비어있으면, 사용자가 팀/시스템을 말했는지 먼저 본다.",
+      "권한(auth/role)은 ROLE_ADMIN, ZC_*, ROLE_* 같은 코드/이름일 수 있다.",
+      "메뉴(menu)는 '견적', '정산', '비즈니스파트너목록'처럼 사람 단어일 수도 있고, menu_id(pjt.xxx) 같은 ID일 수도 있다.",
+    ],
+  };
+
+  const response = await ai.models.generateContent({
+    model: INTENT_MODEL,
+    contents: [{ role: "user", parts: [{ text: JSON.stringify(userContext, null, 2) }] }],
+    config: {
+      systemInstruction: INTENT_SYSTEM_INSTRUCTION,
+      responseMimeType: "application/json",
+      responseSchema: INTENT_RESPONSE_SCHEMA,
+    },
+  });
+
+  let parsed: any = null;
+  try {
+    parsed = JSON.parse(response.text || "");
+  } catch {
+    parsed = null;
+  }
+  const ok = parsed !== null && typeof parsed === "object" && !Array.isArray(parsed);
+  if (!ok) parsed = {};
+
+  const allowedTypes: IntentType[] = ["ROLE_TO_MENU", "MENU_TO_ROLE", "ROLE_LIST", "UNKNOWN"];
+  const type: IntentType = allowedTypes.includes(parsed.type) ? parsed.type : "UNKNOWN";
+
+  const keyword = typeof parsed.keyword === "string" ? parsed.keyword.trim() : "";
+  const finalKeyword =
+    (type === "MENU_TO_ROLE" || type === "ROLE_TO_MENU") && keyword.length === 0 ? safeQuery : keyword;
+
+  const result: IntentResult = {
+    type,
+    keyword: finalKeyword,
+    candidates: Array.isArray(parsed.candidates) ? parsed.candidates : [],
+    message: typeof parsed.message === "string" ? parsed.message : "질문 의도를 파악해볼게요.",
+    confidence: typeof parsed.confidence === "number" ? parsed.confidence : 0.6,
+  };
+  return { result, parsed: ok };
+}
+
+// classifier
+// - "gemini": 캐시 -> 규칙 엔진 -> Gemini (기본, /api/analyze-intent와 같은 경로)
+// - "rules" : 규칙 엔진만 (LLM 없이 오프라인 회귀 비교용). INTENT_ENGINE_URL 필요
+type IntentClassifier = "gemini" | "rules";
+
+// 결과를 만든 단계: cache / rules(규칙 엔진) / gemini / none(빈 질의, 분류기 없음)
+type IntentTier = "cache" | "rules" | "gemini" | "none";
+
+type AnalyzeOptions = {
+  classifier?: IntentClassifier;
+  // 결과에 후보 선해석(hits) 붙이기 (캐시에는 hits 없이 저장 -> 데이터 갱신 후에도 새로 대조)
+  resolve?: boolean;
+  // 캐시를 읽지도 쓰지도 않음 (프롬프트 회귀 테스트: 항상 새로 분류)
+  nocache?: boolean;
+  // 규칙 엔진 지름길을 건너뛰고 Gemini로 분류 (classifier="gemini"일 때만 의미 있음)
+  forceLlm?: boolean;
+};
+
+async function analyzeIntent(
+  query: unknown,
+  currentTeam: unknown,
+  currentSystem: unknown,
+  { classifier = "gemini", resolve = true, nocache = false, forceLlm = false }: AnalyzeOptions = {}
+): Promise<{ result: IntentResult; tier: IntentTier }> {
+  const safeQuery = typeof query === "string" ? query.trim() : "";
+  if (!safeQuery) return { result: unknownIntent("질문을 입력해 주세요.", 0.2), tier: "none" };
+  const team = String(currentTeam || "");
+  const system = String(currentSystem || "");
+
+  async function withHits(result: IntentResult): Promise<IntentResult> {
+    if (!resolve) return result;
+    const resolved = await resolveWithIndex(result, safeQuery, team, system);
+    return resolved ? { ...result, ...resolved } : result;
+  }
+
+  // ✅ 같은 질의(정규화) + 같은 팀/시스템이면 캐시 응답 (Gemini 결과만 저장)
+  const useCache = classifier === "gemini" && !nocache;
+  const cacheKey = intentCacheKey(safeQuery, team, system, INTENT_CACHE_VERSION);
+  let t0 = performance.now();
+  if (useCache) {
+    const cached = await getCachedIntent(cacheKey);
+    if (cached) {
+      recordLatency("cache_hit", performance.now() - t0);
+      return { result: await withHits(cached as IntentResult), tier: "cache" };
     }
+  }
 
-    const apiKey = process.env.GEMINI_API_KEY;
-    if (!apiKey) {
-      return res.json({
-        type: "UNKNOWN",
-        keyword: "",
-        candidates: [],
-        message: "서버 설정 오류로 의도 분석을 수행할 수 없습니다. 관리자에게 문의해 주세요.",
-        confidence: 0.1,
-      });
+  let ruled: RuleIntent | null = null;
+  if (classifier === "rules" || !forceLlm) {
+    t0 = performance.now();
+    ruled = await classifyWithRules(safeQuery, team, system, resolve);
+    if (ruled) recordLatency("rules", performance.now() - t0);
+    if (ruled && (!ruled.escalate || classifier === "rules")) {
+      return { result: ruleIntentResponse(ruled), tier: "rules" };
     }
+  }
+  if (classifier === "rules") {
+    return { result: unknownIntent("규칙 기반 분류기(INTENT_ENGINE_URL)에 연결할 수 없습니다.", 0.1), tier: "none" };
+  }
 
-    const ai = new GoogleGenAI({ apiKey });
-
-    const userContext = {
-      query: safeQuery,
-      selected_team: currentTeam || "",
-      selected_system: currentSystem || "",
-      hints: [
-        "팀 선택/시스템 선택이 비어있으면, 사용자가 팀/시스템을 말했는지 먼저 본다.",
-        "권한(auth/role)은 ROLE_ADMIN, ZC_*, ROLE_* 같은 코드/이름일 수 있다.",
-        "메뉴(menu)는 '견적', '정산', '비즈니스파트너목록'처럼 사람 단어일 수도 있고, menu_id(pjt.xxx) 같은 ID일 수도 있다.",
-      ],
+  const ai = getGenAI();
+  if (!ai) {
+    // 신뢰도는 낮아도 LLM이 없으면 규칙 결과라도
+    if (ruled) return { result: ruleIntentResponse(ruled), tier: "rules" };
+    return {
+      result: unknownIntent("서버 설정 오류로 의도 분석을 수행할 수 없습니다. 관리자에게 문의해 주세요.", 0.1),
+      tier: "none",
     };
+  }
+
+  t0 = performance.now();
+  const { result, parsed } = await classifyWithGemini(ai, safeQuery, team, system);
+  recordLatency("gemini", performance.now() - t0);
+  // 파싱 실패/UNKNOWN은 저장하지 않음 (일시적 오류가 TTL 동안 굳지 않게, 다음 요청에서 다시 분류)
+  if (useCache && parsed && result.type !== "UNKNOWN") {
+    void setCachedIntent(cacheKey, result); // 디스크 쓰기는 응답을 기다리게 하지 않음
+  }
+  return { result: await withHits(result), tier: "gemini" };
+}
 
-    const response = await ai.models.generateContent({
-      model: "gemini-2.5-flash",
-      contents: [{ role: "user", parts: [{ text: JSON.stringify(userContext, null, 2) }] }],
-      config: {
-        systemInstruction,
-        responseMimeType: "application/json",
-        responseSchema: {
-          type: Type.OBJECT,
-          properties: {
-            type: { type: Type.STRING },
-            keyword: { type: Type.STRING },
-            candidates: { type: Type.ARRAY, items: { type: Type.STRING } },
-            message: { type: Type.STRING },
-            confidence: { type: Type.NUMBER },
-          },
-          required: ["type", "keyword", "message", "candidates", "confidence"],
-        },
-      },
+// 쿼리스트링/본문 불리언 옵션: 1/true/yes/on, 0/false/no/off, 없으면 기본값
+function flagOption(v: unknown, fallback: boolean): boolean {
+  if (typeof v === "boolean") return v;
+  if (typeof v === "number") return v !== 0;
+  if (typeof v !== "string" || v.trim() === "") return fallback;
+  const s = v.trim().toLowerCase();
+  if (["1", "true", "yes", "on"].includes(s)) return true;
+  if (["0", "false", "no", "off"].includes(s)) return false;
+  return fallback;
+}
+
+const INTENT_ERROR_MESSAGE = "의도 분석 중 오류가 발생했습니다. 다른 표현으로 다시 질문해 주세요.";
+
+// 본문 옵션(선택, 기본 off): nocache, force_llm -> 결과를 만든 단계는 X-Intent-Tier 헤더로
+app.post("/api/analyze-intent", async (req, res) => {
+  try {
+    const { query, currentTeam, currentSystem, nocache, force_llm } = req.body ?? {};
+    const { result, tier } = await analyzeIntent(query, currentTeam, currentSystem, {
+      nocache: flagOption(nocache, false),
+      forceLlm: flagOption(force_llm, false),
     });
+    res.setHeader("X-Intent-Tier", tier);
+    return res.json(result);
+  } catch (e: any) {
+    console.error("[/api/analyze-intent] Gemini failed:", e?.message || e);
+    return res.json(unknownIntent(INTENT_ERROR_MESSAGE, 0.3));
+  }
+});
 
-    let parsed: any = {};
+// ✅ 일괄 의도 분석 (분석/프롬프트 회귀 테스트용)
+// - 요청 본문: JSONL, 한 줄에 {"id"?, "query", "team"?, "system"?} (currentTeam/currentSystem 도 허용)
+// - 같은 (정규화 질의 + 팀 + 시스템)은 한 번만 분류하고 결과를 공유
+// - 동시 실행 수 제한(INTENT_BATCH_CONCURRENCY, ?concurrency=) + 클라이언트 재사용(getGenAI)
+// - 응답: 끝난 순서대로 JSONL 스트리밍, 한 줄에 {"line", "id", "query", "team", "system", "result", "tier" | "error"}
+//   tier: 결과를 만든 단계 (cache / rules / gemini / none)
+// - ?classifier=rules 이면 Gemini 없이 규칙 엔진만 사용
+// - 회귀 테스트용 기본값: ?nocache=1 (캐시 읽기/쓰기 안 함), ?force_llm=1 (규칙 엔진 지름길 건너뜀)
+//   서비스 경로(/api/analyze-intent)와 같은 결과를 보려면 ?nocache=0&force_llm=0
+const INTENT_BATCH_CONCURRENCY = Number(process.env.INTENT_BATCH_CONCURRENCY || 4);
+const INTENT_BATCH_MAX_LINES = Number(process.env.INTENT_BATCH_MAX_LINES || 20000);
+
+type BatchItem = { line: number; id: unknown; query: string; team: string; system: string };
+
+function parseBatchLines(body: string): { items: BatchItem[]; errors: Array<{ line: number; error: string }> } {
+  const items: BatchItem[] = [];
+  const errors: Array<{ line: number; error: string }> = [];
+  body.split(/\r?\n/).forEach((raw, i) => {
+    if (!raw.trim()) return;
     try {
-      parsed = JSON.parse(response.text || "{}");
+      const o = JSON.parse(raw);
+      items.push({
+        line: i + 1,
+        id: o.id ?? null,
+        query: typeof o.query === "string" ? o.query : "",
+        team: String(o.team ?? o.currentTeam ?? ""),
+        system: String(o.system ?? o.currentSystem ?? ""),
+      });
     } catch {
-      parsed = {};
+      errors.push({ line: i + 1, error: "invalid JSON" });
+    }
+  });
+  return { items, errors };
+}
+
+app.post(
+  "/api/analyze-intent/batch",
+  express.text({ type: ["application/x-ndjson", "application/jsonl", "text/plain"], limit: "20mb" }),
+  async (req, res) => {
+    const classifier: IntentClassifier = req.query.classifier === "rules" ? "rules" : "gemini";
+    const nocache = flagOption(req.query.nocache, true);
+    const forceLlm = flagOption(req.query.force_llm, true);
+    const concurrency = Math.max(1, Math.min(32, Number(req.query.concurrency) || INTENT_BATCH_CONCURRENCY));
+    const { items, errors } = parseBatchLines(typeof req.body === "string" ? req.body : "");
+    if (items.length > INTENT_BATCH_MAX_LINES) {
+      return res.status(413).json({ error: `too many lines (max ${INTENT_BATCH_MAX_LINES})` });
     }
 
-    const allowedTypes: IntentType[] = ["ROLE_TO_MENU", "MENU_TO_ROLE", "ROLE_LIST", "UNKNOWN"];
-    const type: IntentType = allowedTypes.includes(parsed.type) ? parsed.type : "UNKNOWN";
+    // 중복 제거: 키별로 첫 줄만 분류, 나머지 줄은 같은 결과를 받음
+    const groups = new Map<string, BatchItem[]>();
+    for (const it of items) {
+      const key = intentCacheKey(it.query, it.team, it.system, INTENT_CACHE_VERSION);
+      const g = groups.get(key);
+      if (g) g.push(it);
+      else groups.set(key, [it]);
+    }
 
-    const keyword = typeof parsed.keyword === "string" ? parsed.keyword.trim() : "";
-    const finalKeyword =
-      (type === "MENU_TO_ROLE" || type === "ROLE_TO_MENU") && keyword.length === 0 ? safeQuery : keyword;
+    res.setHeader("Content-Type", "application/x-ndjson; charset=utf-8");
+    res.setHeader("X-Batch-Lines", String(items.length));
+    res.setHeader("X-Batch-Unique", String(groups.size));
+    res.setHeader("X-Batch-Options", `classifier=${classifier};nocache=${nocache ? 1 : 0};force_llm=${forceLlm ? 1 : 0}`);
+    for (const e of errors) res.write(JSON.stringify(e) + "\n");
 
-    return res.json({
-      type,
-      keyword: finalKeyword,
-      candidates: Array.isArray(parsed.candidates) ? parsed.candidates : [],
-      message: typeof parsed.message === "string" ? parsed.message : "질문 의도를 파악해볼게요.",
-      confidence: typeof parsed.confidence === "number" ? parsed.confidence : 0.6,
-    });
-  } catch (e: any) {
-    console.error("[/api/analyze-intent] Gemini failed:", e?.message || e);
-    return res.json({
-      type: "UNKNOWN",
-      keyword: "",
-      candidates: [],
-      message: "의도 분석 중 오류가 발생했습니다. 다른 표현으로 다시 질문해 주세요.",
-      confidence: 0.3,
+    let aborted = false;
+    req.on("close", () => {
+      if (!res.writableEnded) aborted = true;
     });
+
+    const queue = [...groups.values()];
+    const worker = async () => {
+      while (!aborted && queue.length) {
+        const group = queue.shift()!;
+        const first = group[0];
+        let payload: { result: IntentResult; tier: IntentTier } | { error: string };
+        try {
+          payload = await analyzeIntent(first.query, first.team, first.system, {
+            classifier,
+            resolve: false,
+            nocache,
+            forceLlm,
+          });
+        } catch (e: any) {
+          payload = { error: String(e?.message || e) };
+        }
+        for (const it of group) {
+          res.write(JSON.stringify({ ...it, ...payload }) + "\n");
+        }
+      }
+    };
+    await Promise.all(Array.from({ length: Math.min(concurrency, queue.length) }, worker));
+    res.end();
   }
-});
+);
 
 
 // ✅ Serve Vite production build (dist/) from the same origin
 const distPath = path.join(process.cwd(), "dist");
+
+// ✅ 전처리(--precompress)가 만든 .br / .gz 사이드카가 있으면 그대로 응답 (요청마다 압축하지 않음)
+//    있는 사이드카 중 Accept-Encoding q가 가장 높은 것, q가 같으면 br > gzip.
+//    사이드카가 없거나 클라이언트가 못 받으면 express.static으로 넘김
+const PRECOMPRESSED: Array<[encoding: string, suffix: string]> = [
+  ["br", ".br"],
+  ["gzip", ".gz"],
+];
+const PRECOMPRESSED_TYPES: Record<string, string> = {
+  ".json": "application/json; charset=utf-8",
+  ".jsonl": "application/x-ndjson; charset=utf-8",
+};
+
+app.use((req, res, next) => {
+  if (req.method !== "GET" && req.method !== "HEAD") return next();
+  const contentType = PRECOMPRESSED_TYPES[path.extname(req.path).toLowerCase()];
+  if (!contentType) return next();
+
+  let filePath: string;
+  try {
+    filePath = path.join(distPath, decodeURIComponent(req.path));
+  } catch {
+    return next();
+  }
+  if (!filePath.startsWith(distPath + path.sep)) return next();
+
+  res.setHeader("Vary", "Accept-Encoding");
+  const accept = String(req.headers["accept-encoding"] || "");
+  const available = PRECOMPRESSED.filter(([, suffix]) => fs.existsSync(filePath + suffix));
+  const encoding = preferredEncoding(accept, available.map(([enc]) => enc));
+  if (!encoding) return next();
+  const suffix = available.find(([enc]) => enc === encoding)![1];
+  res.setHeader("Content-Encoding", encoding);
+  res.setHeader("Content-Type", contentType);
+  return res.sendFile(filePath + suffix, (err) => err && next(err));
+});
+
 app.use(express.static(distPath));
 
 // ✅ SPA fallback (prevents refresh 404). Keep /api/* as API-only.
@@ -169,4 +497,5 @@ app.get("*", (req, res) => {
 const port = Number(process.env.PORT || process.env.API_PORT || 3001);
 app.listen(port, "0.0.0.0", () => {
   console.log(`API listening on http://0.0.0.0:${port}`);
+  sweepExpiredIntents().then((n) => n && console.log(`[intent-cache] expired entries removed: ${n}`));
 });
@@ -0,0 +1,19 @@
+import { test } from "node:test";
+import assert from "node:assert/strict";
+import { intentCacheKey, intentCacheVersion } from "./intentCache";
+
+test("key normalizes query and keeps team/system", () => {
+  assert.equal(intentCacheKey(" 견적 메뉴  권한? ", "T1", "SAP"), intentCacheKey("견적메뉴권한", "T1", "SAP"));
+  assert.notEqual(intentCacheKey("견적", "T1", "SAP"), intentCacheKey("견적", "T2", "SAP"));
+  assert.notEqual(intentCacheKey("견적", "T1", "SAP"), intentCacheKey("견적", "T1", "IAS"));
+});
+
+test("prompt/schema/model change gives a different key", () => {
+  const schema = { type: "OBJECT", required: ["type"] };
+  const v1 = intentCacheVersion("gemini-2.5-flash", "prompt A", schema);
+  assert.equal(v1, intentCacheVersion("gemini-2.5-flash", "prompt A", { ...schema }));
+  assert.notEqual(v1, intentCacheVersion("gemini-2.5-flash", "prompt B", schema));
+  assert.notEqual(v1, intentCacheVersion("gemini-2.5-pro", "prompt A", schema));
+  assert.notEqual(v1, intentCacheVersion("gemini-2.5-flash", "prompt A", { ...schema, required: [] }));
+  assert.notEqual(intentCacheKey("견적", "T1", "SAP", v1), intentCacheKey("견적", "T1", "SAP", "other"));
+});
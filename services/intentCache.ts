@@ -0,0 +1,179 @@
+import crypto from "crypto";
+import fs from "fs";
+import path from "path";
+
+// ✅ /api/analyze-intent 결과 캐시
+// - 키: 분류기 버전(프롬프트/스키마/모델 해시) + 정규화 질의(NFC + 소문자 + 공백/끝 문장부호 제거) + 선택된 팀 + 선택된 시스템
+//   -> 프롬프트/모델을 바꿔 배포하면 키가 달라져 이전 결과는 쓰이지 않고 TTL 후 정리됨
+// - 1단: 메모리 LRU (Map 삽입 순서 = 최근 사용 순서) + TTL
+// - 2단: 디스크 (키 해시별 JSON 파일 1개) -> 재시작해도 유지. 읽을 때 TTL 확인, 시작 시 만료 파일 정리
+// - 카운터: 메모리/디스크 hit, miss, 저장, 만료, LRU 축출 + 경로별 지연(p50/p99, 최근 LATENCY_WINDOW건)
+
+export type CachedIntent = {
+  type: string;
+  keyword: string;
+  candidates: string[];
+  message: string;
+  confidence: number;
+};
+
+type Entry = { value: CachedIntent; expiresAt: number };
+
+const MAX_ENTRIES = Number(process.env.INTENT_CACHE_MAX || 5000);
+const TTL_MS = Number(process.env.INTENT_CACHE_TTL_MS || 24 * 60 * 60 * 1000);
+// 빈 문자열이면 디스크 단 사용 안 함
+const CACHE_DIR = process.env.INTENT_CACHE_DIR ?? path.join(process.cwd(), ".intent_cache");
+const LATENCY_WINDOW = 1000;
+
+const memory = new Map<string, Entry>();
+const counters = { memoryHits: 0, diskHits: 0, misses: 0, sets: 0, expired: 0, evicted: 0 };
+const latencies: Record<string, number[]> = {};
+
+// 분류 결과에 영향을 주는 설정(시스템 프롬프트, 응답 스키마, 모델명 등)의 짧은 해시
+export function intentCacheVersion(...parts: unknown[]): string {
+  const h = crypto.createHash("sha1");
+  for (const p of parts) h.update(typeof p === "string" ? p : JSON.stringify(p)).update("\0");
+  return h.digest("hex").slice(0, 12);
+}
+
+export function intentCacheKey(query: string, team: string, system: string, version = ""): string {
+  const q = String(query || "")
+    .normalize("NFC")
+    .toLowerCase()
+    .replace(/\s+/g, "")
+    .replace(/[?？!.。~]+$/, "");
+  return `${version}|${q}|${String(team || "").trim()}|${String(system || "").trim()}`;
+}
+
+function diskPath(key: string): string {
+  const h = crypto.createHash("sha1").update(key).digest("hex");
+  return path.join(CACHE_DIR, h.slice(0, 2), `${h}.json`);
+}
+
+function remember(key: string, entry: Entry) {
+  memory.delete(key);
+  memory.set(key, entry);
+  while (memory.size > MAX_ENTRIES) {
+    const oldest = memory.keys().next().value as string;
+    memory.delete(oldest);
+    counters.evicted++;
+  }
+}
+
+export function recordLatency(kind: string, ms: number) {
+  const arr = (latencies[kind] ||= []);
+  arr.push(ms);
+  if (arr.length > LATENCY_WINDOW) arr.shift();
+}
+
+export async function getCachedIntent(key: string): Promise<CachedIntent | null> {
+  const now = Date.now();
+  const hit = memory.get(key);
+  if (hit) {
+    if (hit.expiresAt > now) {
+      remember(key, hit); // 최근 사용으로 이동
+      counters.memoryHits++;
+      return hit.value;
+    }
+    memory.delete(key);
+    counters.expired++;
+  }
+
+  if (CACHE_DIR) {
+    const p = diskPath(key);
+    try {
+      const stored = JSON.parse(await fs.promises.readFile(p, "utf-8")) as Entry & { key: string };
+      if (stored.key === key && stored.expiresAt > now) {
+        remember(key, { value: stored.value, expiresAt: stored.expiresAt });
+        counters.diskHits++;
+        return stored.value;
+      }
+      if (stored.expiresAt <= now) {
+        counters.expired++;
+        fs.promises.unlink(p).catch(() => undefined);
+      }
+    } catch {
+      // 파일 없음/깨짐 -> miss
+    }
+  }
+  counters.misses++;
+  return null;
+}
+
+export async function setCachedIntent(key: string, value: CachedIntent): Promise<void> {
+  const entry: Entry = { value, expiresAt: Date.now() + TTL_MS };
+  remember(key, entry);
+  counters.sets++;
+  if (!CACHE_DIR) return;
+  const p = diskPath(key);
+  try {
+    await fs.promises.mkdir(path.dirname(p), { recursive: true });
+    const tmp = `${p}.${process.pid}.tmp`;
+    await fs.promises.writeFile(tmp, JSON.stringify({ key, ...entry }), "utf-8");
+    await fs.promises.rename(tmp, p);
+  } catch (e: any) {
+    console.error("[intent-cache] disk write failed:", e?.message || e);
+  }
+}
+
+// 시작 시 1회: 만료된 디스크 항목 정리 (요청 처리와 무관하게 백그라운드)
+export async function sweepExpiredIntents(): Promise<number> {
+  if (!CACHE_DIR) return 0;
+  let removed = 0;
+  const now = Date.now();
+  let buckets: string[] = [];
+  try {
+    buckets = await fs.promises.readdir(CACHE_DIR);
+  } catch {
+    return 0;
+  }
+  for (const b of buckets) {
+    const dir = path.join(CACHE_DIR, b);
+    let files: string[] = [];
+    try {
+      files = await fs.promises.readdir(dir);
+    } catch {
+      continue;
+    }
+    for (const f of files) {
+      const p = path.join(dir, f);
+      try {
+        const stored = JSON.parse(await fs.promises.readFile(p, "utf-8")) as Entry;
+        if (stored.expiresAt > now) continue;
+      } catch {
+        // 깨진 파일도 정리
+      }
+      await fs.promises.unlink(p).catch(() => undefined);
+      removed++;
+    }
+  }
+  return removed;
+}
+
+function percentile(sorted: number[], q: number): number {
+  if (sorted.length === 0) return 0;
+  return sorted[Math.min(sorted.length - 1, Math.floor(sorted.length * q))];
+}
+
+export function intentCacheStats() {
+  const lookups = counters.memoryHits + counters.diskHits + counters.misses;
+  const latency: Record<string, { n: number; p50_ms: number; p99_ms: number }> = {};
+  for (const [kind, arr] of Object.entries(latencies)) {
+    const sorted = [...arr].sort((a, b) => a - b);
+    latency[kind] = {
+      n: sorted.length,
+      p50_ms: Number(percentile(sorted, 0.5).toFixed(3)),
+      p99_ms: Number(percentile(sorted, 0.99).toFixed(3)),
+    };
+  }
+  return {
+    ...counters,
+    lookups,
+    hitRate: lookups ? Number(((counters.memoryHits + counters.diskHits) / lookups).toFixed(4)) : 0,
+    memoryEntries: memory.size,
+    maxEntries: MAX_ENTRIES,
+    ttlMs: TTL_MS,
+    disk: CACHE_DIR || null,
+    latency,
+  };
+}
@@ -0,0 +1,53 @@
+import { test } from "node:test";
+import assert from "node:assert/strict";
+import fs from "node:fs";
+import type { Menu, MenuTreeL1 } from "../types";
+import { cleanValue, compareTreeItems, compareTreeLabels, menuOrderInOrder, menuTreeInOrder, sortMenusKoreanFirst } from "./menuTree";
+
+// scripts/check_menu_tree_order.py 가 scripts/menu_tree.py 규칙으로 만든 순서
+const fixture = JSON.parse(fs.readFileSync(new URL("./menuTree.fixture.json", import.meta.url), "utf-8")) as {
+  labels: string[];
+  items: string[];
+  menus: [string, string][];
+  label_order: string[];
+  item_order: string[];
+  menu_order: string[];
+};
+
+test("menu_tree L1/L2 order matches compareTreeLabels", () => {
+  assert.deepEqual([...fixture.labels].sort(compareTreeLabels), fixture.label_order);
+});
+
+test("menu_tree L3 order matches compareTreeItems", () => {
+  assert.deepEqual([...fixture.items].sort(compareTreeItems), fixture.item_order);
+});
+
+test("menuTreeInOrder accepts the precomputed order and rejects others", () => {
+  const menus: Menu[] = fixture.item_order.map((l3, i) => ({ menu_id: `m${i}`, path: `공통 > 공통 > ${l3}` }));
+  const positions = menus.map((_, i) => i);
+  const tree = (l1s: string[], pos: number[]): MenuTreeL1[] => l1s.map(l1 => [l1, [["공통", pos]]]);
+
+  assert.equal(menuTreeInOrder(tree(["가", "나", "A"], positions), menus), true);
+  assert.equal(menuTreeInOrder(tree(["A", "가"], positions), menus), false);
+  assert.equal(menuTreeInOrder(tree(["가"], [...positions].reverse()), menus), false);
+  assert.equal(menuTreeInOrder(tree(["가"], [0, menus.length]), menus), false); // 범위 밖 위치
+});
+
+test("menu_order matches sortMenusKoreanFirst", () => {
+  const menus: Menu[] = fixture.menus.map(([path, menu_id]) => ({ path, menu_id }));
+  assert.deepEqual(sortMenusKoreanFirst(menus).map(m => cleanValue(m.menu_id)), fixture.menu_order);
+});
+
+test("menuOrderInOrder accepts the precomputed order and rejects others", () => {
+  const menus: Menu[] = fixture.menus.map(([path, menu_id]) => ({ path, menu_id }));
+  const first = new Map<string, number>();
+  menus.forEach((m, i) => { if (!first.has(cleanValue(m.menu_id))) first.set(cleanValue(m.menu_id), i); });
+  const order = fixture.menu_order.map(id => first.get(id)!);
+
+  assert.equal(menuOrderInOrder(order, menus), true);
+  assert.equal(menuOrderInOrder([...order].reverse(), menus), false);
+  assert.equal(menuOrderInOrder(order.slice(1), menus), false); // 빠진 메뉴
+  assert.equal(menuOrderInOrder([...order.slice(0, -1), menus.length], menus), false); // 범위 밖 위치
+  const s01 = first.get("S01")!, s07 = first.get("S07")!; // 같은 path -> 원래 위치 순서
+  assert.equal(menuOrderInOrder(order.map(i => (i === s01 ? s07 : i === s07 ? s01 : i)), menus), false);
+});
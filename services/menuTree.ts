@@ -0,0 +1,147 @@
+import type { Menu, MenuTreeL1 } from "../types";
+
+// 메뉴 트리 정렬 규칙 (scripts/menu_tree.py 와 같은 규칙, 같은 fixture로 양쪽을 검증)
+
+export const hasKorean = (text: string) => /[ㄱ-ㅎ|ㅏ-ㅣ|가-힣]/.test(text || '');
+
+export const cleanValue = (val: any): string => {
+  if (val === null || val === undefined) return '기타';
+  const str = String(val).trim();
+  const lower = str.toLowerCase();
+  if (lower === 'nan' || lower === 'null' || str === '') return '기타';
+  return str;
+};
+
+const sortLabelWithKoreanEtcEnglish = (label: string) => {
+  const v = cleanValue(label);
+  const isEtc = v === '기타';
+
+  // 기타는 최후순위
+  const etcRank = isEtc ? 2 : 0;
+
+  // 한글 우선(0), 영어/기타 외(1)
+  const langRank = hasKorean(v) ? 0 : 1;
+
+  // etcRank가 최우선: 기타는 무조건 맨 뒤
+  return { etcRank, langRank, text: v };
+};
+
+// 메뉴 트리 L1/L2 정렬: 기타 맨 뒤 → 한글 먼저 → 가나다/ABC (scripts/menu_tree.py label_sort_key와 같은 규칙)
+export const compareTreeLabels = (a: string, b: string) => {
+  const A = sortLabelWithKoreanEtcEnglish(a);
+  const B = sortLabelWithKoreanEtcEnglish(b);
+  if (A.etcRank !== B.etcRank) return A.etcRank - B.etcRank; // 기타 맨 뒤
+  if (A.langRank !== B.langRank) return A.langRank - B.langRank; // 한글 먼저
+  const locale = A.langRank === 0 ? 'ko' : 'en';
+  return A.text.localeCompare(B.text, locale);
+};
+
+// L2 카드 안의 메뉴(L3) 정렬
+export const compareTreeItems = (a: string, b: string) => cleanValue(a).localeCompare(cleanValue(b), 'ko');
+
+// path -> 화면 트리용 L1/L2/L3 (빈 레벨은 '기타')
+export const menuTreeLevels = (m: Menu) => {
+  const parts = m.path.split('>').map(p => cleanValue(p));
+  const l1 = parts[0] || '기타';
+  const l2 = parts[1] || '기타';
+  const l3 = parts[2] || parts[parts.length - 1] || '기타';
+  return { l1, l2, l3 };
+};
+
+function inOrder<T>(items: T[], compare: (a: T, b: T) => number): boolean {
+  return items.every((x, i) => i === 0 || compare(items[i - 1], x) <= 0);
+}
+
+/**
+ * 전처리 menu_tree가 이 브라우저의 정렬 결과와 같은 순서인지 (인접한 쌍만 비교, O(n)).
+ * 파이썬 쪽 localeCompare 근사가 어긋나거나 위치가 menus 범위를 벗어나면 false -> 화면에서 다시 정렬
+ */
+export function menuTreeInOrder(tree: MenuTreeL1[], menus: Menu[]): boolean {
+  if (!inOrder(tree.map(([l1]) => l1), compareTreeLabels)) return false;
+  return tree.every(([, l2Nodes]) =>
+    inOrder(l2Nodes.map(([l2]) => l2), compareTreeLabels) &&
+    l2Nodes.every(([, positions]) =>
+      positions.every(i => menus[i]) &&
+      inOrder(positions.map(i => menuTreeLevels(menus[i]).l3), compareTreeItems)
+    )
+  );
+}
+
+// ===== 메뉴 목록 정렬 ("접근 가능 메뉴" 20개씩 페이징, scripts/menu_tree.py menu_sort_key 와 같은 규칙) =====
+const splitPathParts = (path: string) =>
+  String(path || '')
+    .split('>')
+    .map(p => cleanValue(p))
+    .map(p => (p === '기타' ? '' : p)); // '기타'는 빈 값 취급
+
+const isNullishPart = (p: string) => !p || /^null$/i.test(p);
+
+const menuSortKey = (m: Menu) => {
+  const parts = splitPathParts(m.path);
+
+  // 채워진 레벨 수(많을수록 우선)
+  const filledCount = parts.filter(p => !isNullishPart(p)).length;
+
+  // 앞에서부터 연속으로 채워진 레벨 수(“마감 > 금융리스 > ...” 같은 정합한 경로 우선)
+  let prefixFilled = 0;
+  for (let i = 0; i < parts.length; i++) {
+    if (isNullishPart(parts[i])) break;
+    prefixFilled++;
+  }
+
+  // 완전 빈/깨진(> > ...) 여부: 앞부분부터 비어 있으면 뒤로
+  const leadingNull = isNullishPart(parts[0]) ? 1 : 0;
+
+  // 언어 우선
+  const keyText = `${cleanValue(m.path)} ${cleanValue(m.menu_id)}`;
+  const isKor = hasKorean(keyText) ? 0 : 1; // 0=한글, 1=영문
+
+  const pathForCompare = cleanValue(m.path);
+
+  return { isKor, leadingNull, prefixFilled, filledCount, pathForCompare };
+};
+
+// ✅ 요구 정렬: 한글 → (선두 null 아님) → prefixFilled desc → filledCount desc → localeCompare
+export const compareMenusKoreanFirst = (a: Menu, b: Menu) => {
+  const A = menuSortKey(a);
+  const B = menuSortKey(b);
+
+  if (A.isKor !== B.isKor) return A.isKor - B.isKor;
+  if (A.leadingNull !== B.leadingNull) return A.leadingNull - B.leadingNull; // null 앞은 뒤로
+  if (A.prefixFilled !== B.prefixFilled) return B.prefixFilled - A.prefixFilled;
+  if (A.filledCount !== B.filledCount) return B.filledCount - A.filledCount;
+
+  // 같은 그룹 내 정렬
+  const locale = A.isKor === 0 ? 'ko' : 'en';
+  return A.pathForCompare.localeCompare(B.pathForCompare, locale);
+};
+
+// menu_id 기준 첫 항목만 남긴 위치 목록 (menu_id -> menus 위치)
+const firstMenuPositions = (menus: Menu[]) => {
+  const first = new Map<string, number>();
+  menus.forEach((m, i) => {
+    const id = cleanValue(m.menu_id);
+    if (!first.has(id)) first.set(id, i);
+  });
+  return first;
+};
+
+export const sortMenusKoreanFirst = (menus: Menu[]) =>
+  Array.from(firstMenuPositions(menus).values())
+    .map(i => menus[i])
+    .sort(compareMenusKoreanFirst);
+
+/**
+ * 전처리 menu_order가 sortMenusKoreanFirst(menus)와 같은 결과인지 (인접한 쌍만 비교, O(n)).
+ * menu_id별 첫 위치를 한 번씩만 담아야 하고, 같은 순위끼리는 원래 위치 순서(안정 정렬)여야 함
+ */
+export function menuOrderInOrder(order: number[], menus: Menu[]): boolean {
+  const first = firstMenuPositions(menus);
+  if (order.length !== first.size) return false;
+  if (!order.every(i => menus[i] && first.get(cleanValue(menus[i].menu_id)) === i)) return false;
+  return order.every((x, k) => {
+    if (k === 0) return true;
+    const c = compareMenusKoreanFirst(menus[order[k - 1]], menus[x]);
+    return c < 0 || (c === 0 && order[k - 1] < x);
+  });
+}
@@ -31,9 +31,16 @@ export interface Menu {
 
   // 메뉴 정렬/표기를 위해 path에서 파생한 한글 메뉴명
   menu_name?: string;
+
+  // menu_catalog.json 항목에만 존재 (path를 레벨별로 분리한 값)
+  levels?: string[];
 }
 
 
+// menu_tree 한 항목: [L1 표시명, [[L2 표시명, [menus 위치, ...]], ...]] (L1/L2/메뉴 모두 정렬된 순서)
+export type MenuTreeL1 = [string, [string, number[]][]];
+
+
 export interface RoleBundle {
   team_code: string;
   team_name: string;
@@ -44,6 +51,16 @@ export interface RoleBundle {
   auth_desc: string;
   menus: Menu[];
 
+  // menu_catalog.json 모드: menus 대신 카탈로그 id만 기록됨 (dataService에서 menus로 복원)
+  menu_refs?: number[];
+
+  // by_role 공유 저장소 모드: 팀 파일에는 role_ref(해시)만 기록됨 (dataService에서 복원)
+  role_ref?: string;
+
+  // 전처리에서 미리 정렬한 메뉴 트리 / 한글 우선 정렬 순서 (값은 menus 위치, 없으면 화면에서 정렬)
+  menu_tree?: MenuTreeL1[];
+  menu_order?: number[];
+
   // === IAS_Sales 권한 표기용 파생 필드 (Role과 동일 개념) ===
   display_auth_name?: string;
   auth_code_label?: string;
@@ -51,12 +68,33 @@ export interface RoleBundle {
 }
 
 
+// roles/<team_code>.json: 팀 하나의 시스템/권한 목록 (roles/manifest.json에 팀별 해시)
+export interface TeamRoleShard {
+  team_code: string;
+  systems?: System[];
+  // sys_code -> 권한 목록
+  roles?: Record<string, Role[]>;
+}
+
+
+// 후보 선해석 결과가 비었을 때 서버가 주는 오타 교정 후보 (fuzzy_index, 자모 편집 거리)
+export interface NameSuggestion {
+  text: string;
+  kinds: string[];   // "auth" | "menu" | "menu_id"
+  count: number;     // 이 이름을 가진 권한 수
+  distance: number;
+  keyword: string;   // 교정 대상 검색어(정규화)
+}
+
 export interface SearchResult {
   type: IntentType;
   keyword: string;
   candidates?: string[];
   message?: string;
   confidence?: number;   // 추가
+
+  // 오타 교정 후보 (서버에 규칙 엔진이 연결된 경우에만)
+  suggestions?: NameSuggestion[];
 }
 
 